@@ -164,7 +164,7 @@ def demo_financial_pipeline() -> None:
         print("✅ Financial pipeline created successfully!")
         
         # Test financial data
-        test_input = "My credit card number is 1234-5678-9012-3456 and my account number is 1234567890"
+        test_input = "My credit card number is 4111-1111-1111-1111 and my account number is 1234567890"
         result = pipeline.check_input(test_input)
         print_result(result, "input")
         
@@ -25,7 +25,7 @@ def main():
     print("\n2. Testing your first guardrail check:")
     print("-" * 35)
     
-    test_content = "My credit card is 1234-5678-9012-3456"
+    test_content = "My credit card is 4111-1111-1111-1111"
     print(f"📝 Testing: {test_content}")
     
     result = pipeline.check_input(test_content)
@@ -178,6 +178,46 @@ async def get_system_stats() -> SystemStats:
     )
 
 
+def get_guardrail_stats_from_audit() -> Dict[str, Dict[str, Any]]:
+    """Aggregate guardrail decisions and measured run times from the audit log."""
+    stats = defaultdict(lambda: {"checks": 0, "blocks": 0, "warnings": 0, "errors": 0, "timed": 0, "total_ms": 0.0})
+    audit_file = console_state.get("audit_file")
+    if not audit_file or not audit_file.exists():
+        return {}
+
+    try:
+        with open(audit_file, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line.strip())
+                except json.JSONDecodeError:
+                    continue
+                if record.get("event_type") != "guardrail_decision":
+                    continue
+
+                entry = stats[record.get("guardrail_name")]
+                decision = record.get("decision")
+                if decision == "skip":
+                    continue
+                entry["checks"] += 1
+                if decision == "block":
+                    entry["blocks"] += 1
+                elif decision == "warn":
+                    entry["warnings"] += 1
+                elif decision == "error":
+                    entry["errors"] += 1
+
+                # Wall time measured by the pipeline (absent for cache hits)
+                duration = record.get("processing_time_ms")
+                if duration is not None:
+                    entry["timed"] += 1
+                    entry["total_ms"] += duration
+    except Exception as e:
+        print(f"Error reading audit logs: {e}")
+
+    return dict(stats)
+
+
 @app.get("/api/guardrails/metrics")
 async def get_guardrail_metrics() -> List[GuardrailMetric]:
     """Get performance metrics for each guardrail."""
@@ -187,26 +227,30 @@ async def get_guardrail_metrics() -> List[GuardrailMetric]:
     if pipeline:
         # Get real guardrails from pipeline
         all_guardrails = []
-        for g in pipeline.input_guardrails:
+        for g in pipeline.input_pipeline:
             all_guardrails.append(("input", g))
-        for g in pipeline.output_guardrails:
+        for g in pipeline.output_pipeline:
             all_guardrails.append(("output", g))
-        
+
+        audit_stats = get_guardrail_stats_from_audit()
+
         # Create metrics for each guardrail
         for stage, guardrail in all_guardrails:
             # Determine type
-            guardrail_type = "ai" if hasattr(guardrail, 'ai_powered') and guardrail.ai_powered else "local"
+            guardrail_type = "ai" if guardrail.uses_ai else "local"
             
-            # Get real metrics if available (would need to track these)
+            stats = audit_stats.get(guardrail.name, {})
+            checks = stats.get("checks", 0)
+            timed = stats.get("timed", 0)
             metric = GuardrailMetric(
                 name=f"{guardrail.name} ({stage})",
                 type=guardrail_type,
                 enabled=guardrail.enabled,
-                total_checks=0,  # TODO: Track real metrics
-                blocks=0,
-                warnings=0,
-                avg_response_ms=0.0,
-                error_rate=0.0
+                total_checks=checks,
+                blocks=stats.get("blocks", 0),
+                warnings=stats.get("warnings", 0),
+                avg_response_ms=round(stats["total_ms"] / timed, 2) if timed else 0.0,
+                error_rate=round(stats["errors"] / checks * 100, 2) if checks else 0.0
             )
             metrics.append(metric)
     
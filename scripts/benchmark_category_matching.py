@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Category Matching Benchmark
+
+Times the compiled category matchers of the toxicity and code generation
+guardrails against running each of their patterns separately, on texts of
+1, 10 and 50 KB. Exits with status 1 if a compiled matcher is more than 20%
+slower than the per-pattern scans.
+
+Usage: python scripts/benchmark_category_matching.py
+"""
+
+import re
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, "src")
+
+from stinger.guardrails.simple_code_generation_guardrail import SimpleCodeGenerationGuardrail
+from stinger.guardrails.simple_toxicity_detection_guardrail import (
+    SimpleToxicityDetectionGuardrail,
+)
+
+PARAGRAPH = (
+    "The quarterly report covers revenue, hiring and the roadmap for next year. "
+    "Please write a summary and create a short slide deck, then fight me on it. "
+)
+SIZES_KB = (1, 10, 50)
+# Loose margin: the compiled scan must not be slower than per-pattern scans
+MARGIN = 1.2
+
+
+def per_pattern_counts(patterns, text, flags):
+    return {
+        category: sum(len(re.findall(pattern, text, flags)) for pattern in category_patterns)
+        for category, category_patterns in patterns.items()
+    }
+
+
+def best_of_ms(func, runs=5):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> int:
+    guardrails = [
+        (SimpleToxicityDetectionGuardrail("tox", {}), "toxicity_patterns", re.IGNORECASE),
+        (SimpleCodeGenerationGuardrail("code", {}), "code_patterns", re.IGNORECASE | re.DOTALL),
+    ]
+    slower = 0
+    for size_kb in SIZES_KB:
+        text = (PARAGRAPH * (size_kb * 1024 // len(PARAGRAPH) + 1))[: size_kb * 1024]
+        for guardrail, attribute, flags in guardrails:
+            patterns = getattr(guardrail, attribute)
+            per_pattern_ms = best_of_ms(lambda: per_pattern_counts(patterns, text, flags))
+            compiled_ms = best_of_ms(lambda: guardrail.matcher.count(text, list(patterns)))
+            verdict = "ok" if compiled_ms <= per_pattern_ms * MARGIN else "SLOWER"
+            slower += verdict != "ok"
+            print(
+                f"{guardrail.name:>4} {size_kb:>2}KB: per-pattern {per_pattern_ms:8.2f}ms, "
+                f"compiled {compiled_ms:8.2f}ms  {verdict}"
+            )
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,11 @@ model communication without any guardrail-specific logic.
 import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+from ..core.micro_batch import batch_moderation
+from ..core.model_clients import get_model_client
+from ..core.single_flight import coalesce, request_key
 
 # Optional OpenAI import
 try:
@@ -61,13 +65,26 @@ class OpenAIAdapter:
 
         self.api_key = api_key
         self.base_url = base_url
-        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+    @property
+    def client(self) -> "AsyncOpenAI":
+        """The shared client for this key on the running event loop (see model_clients)."""
+        return get_model_client("openai", self.api_key, self.base_url)
 
     async def moderate_content(self, content: str) -> ModerationResult:
         """Moderate content using OpenAI Moderation API."""
         try:
-            response = await self.client.moderations.create(input=content)
-            result = response.results[0]
+            # Identical concurrent requests share one input (see single_flight), and
+            # concurrent inputs share one API call (see micro_batch)
+            key = request_key("moderation", self.base_url, self.api_key, content)
+            result = await coalesce(
+                key,
+                lambda: batch_moderation(
+                    request_key("moderation_batch", self.base_url, self.api_key),
+                    content,
+                    self._moderate_batch,
+                ),
+            )
 
             # Convert category scores to floats, replacing None with 0.0
             raw_scores = result.category_scores.model_dump()
@@ -85,6 +102,11 @@ class OpenAIAdapter:
             logger.error(f"OpenAI moderation failed: {e}")
             raise
 
+    async def _moderate_batch(self, inputs: List[str]) -> List[Any]:
+        """Moderate several inputs in one API call; returns one result per input."""
+        response = await self.client.moderations.create(input=inputs)
+        return response.results
+
     async def complete(
         self,
         messages: List[Dict[str, str]],
@@ -95,12 +117,25 @@ class OpenAIAdapter:
     ) -> CompletionResult:
         """Generate a chat completion using OpenAI API."""
         try:
-            response = await self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                **kwargs,
+            key = request_key(
+                "completion",
+                self.base_url,
+                self.api_key,
+                model,
+                messages,
+                temperature,
+                max_tokens,
+                kwargs,
+            )
+            response = await coalesce(
+                key,
+                lambda: self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    **kwargs,
+                ),
             )
 
             choice = response.choices[0]
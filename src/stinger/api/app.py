@@ -14,6 +14,7 @@ from stinger.api.endpoints import check, health
 from stinger.api.endpoints import metrics as metrics_endpoint
 from stinger.api.endpoints import rules
 from stinger.core import audit
+from stinger.core.model_clients import close_model_clients
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -129,3 +130,9 @@ async def startup_event():
 
     logger.info(f"Audit logging enabled: {audit_file}")
     logger.info("Stinger API started with conversation tracking enabled")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared model clients and their connection pools."""
+    await close_model_clients()
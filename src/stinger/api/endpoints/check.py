@@ -2,14 +2,22 @@
 Check endpoint for evaluating content against guardrails.
 """
 
+import codecs
+import json
 import logging
+import os
 import threading
+import time
+from typing import Any, AsyncIterator, Dict, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from stinger.api import metrics
-from stinger.api.models import CheckRequest, CheckResponse
+from stinger.api.models import BatchCheckRequest, BatchCheckResponse, CheckRequest, CheckResponse
 from stinger.core.conversation import Conversation
+from stinger.core.input_validation import ValidationLimits
+from stinger.core.offload import DEFAULT_OFFLOAD_MIN_LENGTH
 from stinger.core.pipeline import GuardrailPipeline
 
 logger = logging.getLogger(__name__)
@@ -31,7 +39,23 @@ def get_pipeline(preset: str) -> GuardrailPipeline:
         # Check again in case another thread created it
         if preset not in _pipeline_cache:
             try:
-                _pipeline_cache[preset] = GuardrailPipeline.from_preset(preset)
+                pipeline = GuardrailPipeline.from_preset(preset)
+                if os.getenv("STINGER_DECISION_CACHE", "").lower() in ("1", "true", "yes"):
+                    pipeline.enable_decision_cache(
+                        max_size=int(os.getenv("STINGER_DECISION_CACHE_SIZE", "10000")),
+                        ttl_seconds=float(os.getenv("STINGER_DECISION_CACHE_TTL", "300")),
+                    )
+                offload_backend = os.getenv("STINGER_OFFLOAD")
+                if offload_backend:
+                    workers = os.getenv("STINGER_OFFLOAD_WORKERS")
+                    pipeline.enable_offload(
+                        backend=offload_backend,
+                        max_workers=int(workers) if workers else None,
+                        min_length=int(
+                            os.getenv("STINGER_OFFLOAD_MIN_LENGTH", str(DEFAULT_OFFLOAD_MIN_LENGTH))
+                        ),
+                    )
+                _pipeline_cache[preset] = pipeline
                 logger.info(f"Created pipeline for preset: {preset}")
             except Exception as e:
                 logger.error(f"Failed to create pipeline for preset {preset}: {e}")
@@ -39,6 +63,61 @@ def get_pipeline(preset: str) -> GuardrailPipeline:
         return _pipeline_cache[preset]
 
 
+def build_check_response(result: Dict[str, Any], kind: str) -> CheckResponse:
+    """Record guardrail metrics for a pipeline result and convert it to a CheckResponse."""
+    # Record guardrail metrics
+    details = result.get("details", {})
+    for guardrail_name, guardrail_result in details.items():
+        # Skip non-guardrail entries (e.g. validation errors) and skipped guardrails
+        if not isinstance(guardrail_result, dict) or guardrail_result.get("skipped"):
+            continue
+        # Timing measured by the pipeline; cache hits did not run the guardrail
+        timing = guardrail_result.get("timing") or {}
+        measured = bool(timing) and not timing.get("cached")
+        metrics.record_guardrail_check(
+            guardrail=guardrail_name,
+            pipeline_type=kind,
+            blocked=guardrail_result.get("blocked", False),
+            duration_ms=timing.get("wall_ms") if measured else None,
+            cpu_ms=timing.get("cpu_ms") if measured else None,
+        )
+
+    # Convert to response format
+    action = "block" if result["blocked"] else "allow"
+    if result.get("warnings") and not result["blocked"]:
+        action = "warn"
+
+    # Extract names of the guardrails that actually ran from details
+    guardrails_triggered = [
+        name
+        for name, guardrail_result in details.items()
+        if isinstance(guardrail_result, dict) and not guardrail_result.get("skipped")
+    ]
+
+    return CheckResponse(
+        action=action,
+        reasons=result.get("reasons", []),
+        warnings=result.get("warnings", []),
+        metadata={
+            "guardrails_triggered": guardrails_triggered,
+            "processing_time_ms": result.get("processing_time_ms", 0),
+        },
+    )
+
+
+def _default_deadline_ms() -> Optional[int]:
+    """Server-wide time budget for /v1/check requests that do not set one."""
+    value = os.getenv("STINGER_CHECK_DEADLINE_MS")
+    return int(value) if value else None
+
+
+def record_cache_metrics(pipeline: GuardrailPipeline, preset: str) -> None:
+    """Export the pipeline's decision cache statistics, if caching is enabled."""
+    cache_stats = pipeline.get_cache_stats()
+    if cache_stats is not None:
+        metrics.record_decision_cache(preset, cache_stats)
+
+
 @router.post("/check", response_model=CheckResponse)
 async def check_content(request: CheckRequest):
     """
@@ -77,46 +156,120 @@ async def check_content(request: CheckRequest):
             )
 
         # Check the content based on type
+        deadline_ms = request.deadline_ms or _default_deadline_ms()
         if request.kind == "prompt":
-            result = await pipeline.check_input_async(request.text, conversation=conversation)
+            result = await pipeline.check_input_async(
+                request.text, conversation=conversation, deadline_ms=deadline_ms
+            )
         else:  # response
-            result = await pipeline.check_output_async(request.text, conversation=conversation)
-
-        # Record guardrail metrics
-        details = result.get("details", {})
-        if details:
-            # Calculate per-guardrail time (approximate)
-            total_time = result.get("processing_time_ms", 0)
-            per_guardrail_time = total_time / len(details) if details else 0
-
-            for guardrail_name, guardrail_result in details.items():
-                metrics.record_guardrail_check(
-                    guardrail=guardrail_name,
-                    pipeline_type=request.kind,
-                    blocked=guardrail_result.get("blocked", False),
-                    duration_ms=per_guardrail_time,
-                )
-
-        # Convert to response format
-        action = "block" if result["blocked"] else "allow"
-        if result.get("warnings") and not result["blocked"]:
-            action = "warn"
-
-        # Extract guardrail names from details
-        guardrails_triggered = list(details.keys()) if details else []
-
-        return CheckResponse(
-            action=action,
-            reasons=result.get("reasons", []),
-            warnings=result.get("warnings", []),
-            metadata={
-                "guardrails_triggered": guardrails_triggered,
-                "processing_time_ms": result.get("processing_time_ms", 0),
-            },
-        )
+            result = await pipeline.check_output_async(
+                request.text, conversation=conversation, deadline_ms=deadline_ms
+            )
+
+        record_cache_metrics(pipeline, request.preset)
+        return build_check_response(result, request.kind)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error checking content: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/check/batch", response_model=BatchCheckResponse)
+async def check_batch(request: BatchCheckRequest):
+    """
+    Check a batch of independent texts against guardrails.
+
+    Intended for ingestion jobs and re-scans. Each text is checked on its own,
+    without conversation context, and gets its own action decision.
+    """
+    try:
+        pipeline = get_pipeline(request.preset)
+
+        start = time.perf_counter()
+        if request.kind == "prompt":
+            results = await pipeline.check_input_batch_async(request.texts)
+        else:  # response
+            results = await pipeline.check_output_batch_async(request.texts)
+        processing_time_ms = (time.perf_counter() - start) * 1000
+        record_cache_metrics(pipeline, request.preset)
+
+        return BatchCheckResponse(
+            results=[build_check_response(result, request.kind) for result in results],
+            metadata={"count": len(results), "processing_time_ms": processing_time_ms},
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error checking batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while responding.
+
+    The default implementation may listen for client disconnects on ``receive``,
+    which would race with the endpoint for the request body. Here the endpoint's
+    own ``request.stream()`` notices disconnects instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/check/stream")
+async def check_stream(
+    request: Request,
+    preset: str = Query("customer_service", min_length=1, max_length=50),
+):
+    """
+    Check a streamed LLM response as it is generated.
+
+    The request body is the response text, streamed as it is produced (chunked
+    transfer encoding). The reply is a server-sent event stream: a ``chunk`` event
+    echoes each piece of text that passed the streaming guardrails, and a single
+    ``result`` event carries the final decision, either as soon as the stream is
+    blocked or after the full response has been checked.
+    """
+    pipeline = get_pipeline(preset)
+
+    async def events() -> AsyncIterator[str]:
+        stream = pipeline.stream_output()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            async for data in request.stream():
+                chunk = decoder.decode(data)
+                if not chunk:
+                    continue
+                result = await stream.feed_async(chunk)
+                if result["blocked"]:
+                    break
+                yield _sse_event("chunk", {"text": chunk, "action": "allow"})
+                if stream.chars_received > ValidationLimits.MAX_INPUT_LENGTH:
+                    # Stop reading; the final check rejects the oversized response
+                    break
+            else:
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    result = await stream.feed_async(tail)
+                    if not result["blocked"]:
+                        yield _sse_event("chunk", {"text": tail, "action": "allow"})
+
+            result = await stream.finish_async()
+            response = build_check_response(result, "response")
+            yield _sse_event("result", response.model_dump())
+        except Exception as e:
+            logger.error(f"Error checking stream: {e}")
+            yield _sse_event("error", {"detail": "Internal server error"})
+
+    return _DuplexStreamingResponse(events(), media_type="text/event-stream")
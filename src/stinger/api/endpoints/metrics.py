@@ -6,6 +6,13 @@ from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse, PlainTextResponse
 
 from stinger.api import metrics
+from stinger.core.artifacts import get_artifact_stats
+from stinger.core.micro_batch import get_batching_stats
+from stinger.core.model_clients import get_model_client_stats
+from stinger.core.regex_matcher import get_regex_search_stats
+from stinger.core.single_flight import get_coalescing_stats
+from stinger.core.verdict_cache import get_verdict_cache_stats
+from stinger.guardrails.fused_ai_analysis import get_fusion_stats
 
 router = APIRouter()
 
@@ -19,6 +26,13 @@ async def get_metrics(format: str = Query("json", enum=["json", "prometheus"])):
     - json: Detailed metrics in JSON format
     - prometheus: Prometheus text format for scraping
     """
+    metrics.record_regex_search(get_regex_search_stats())
+    metrics.record_artifact_cache(get_artifact_stats())
+    metrics.record_model_clients(get_model_client_stats())
+    metrics.record_coalescing(get_coalescing_stats())
+    metrics.record_batching(get_batching_stats())
+    metrics.record_fusion(get_fusion_stats())
+    metrics.record_verdict_cache(get_verdict_cache_stats())
     if format == "prometheus":
         return PlainTextResponse(
             content=metrics.export_metrics("prometheus"), media_type="text/plain; version=0.0.4"
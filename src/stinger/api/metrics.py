@@ -159,17 +159,80 @@ def record_request(endpoint: str, method: str, status_code: int, duration_ms: fl
     _metrics.record_rate_event("api_requests", labels={"endpoint": endpoint})
 
 
-def record_guardrail_check(guardrail: str, pipeline_type: str, blocked: bool, duration_ms: float):
-    """Record guardrail check metrics."""
+def record_guardrail_check(
+    guardrail: str,
+    pipeline_type: str,
+    blocked: bool,
+    duration_ms: Optional[float],
+    cpu_ms: Optional[float] = None,
+):
+    """Record guardrail check metrics. Durations are skipped when not measured (cache hits)."""
     labels = {"guardrail": guardrail, "pipeline": pipeline_type, "blocked": str(blocked).lower()}
 
     increment("guardrail_checks_total", labels=labels)
-    record_value("guardrail_check_duration_ms", duration_ms, labels=labels)
+    if duration_ms is not None:
+        record_value("guardrail_check_duration_ms", duration_ms, labels=labels)
+    if cpu_ms is not None:
+        record_value("guardrail_check_cpu_ms", cpu_ms, labels=labels)
 
     if blocked:
         increment("guardrail_blocks_total", labels={"guardrail": guardrail})
 
 
+def record_decision_cache(preset: str, stats: Dict[str, Any]):
+    """Record decision cache statistics for a pipeline."""
+    labels = {"preset": preset}
+    for name in ("hits", "misses", "evictions", "size"):
+        set_gauge(f"decision_cache_{name}", stats[name], labels=labels)
+    set_gauge("decision_cache_hit_rate", stats["hit_rate"], labels=labels)
+
+
+def record_regex_search(stats: Dict[str, Any]):
+    """Record timeout-protected regex search statistics."""
+    for name, value in stats.items():
+        set_gauge(f"regex_search_{name}", value)
+
+
+def record_artifact_cache(stats: Dict[str, Any]):
+    """Record statistics of the shared compiled artifact cache."""
+    for name, value in stats.items():
+        if name == "by_kind":
+            for kind, count in value.items():
+                set_gauge("artifact_cache_artifacts_by_kind", count, labels={"kind": kind})
+        else:
+            set_gauge(f"artifact_cache_{name}", value)
+
+
+def record_model_clients(stats: Dict[str, Any]):
+    """Record statistics of the shared model clients and their connection pools."""
+    for name, value in stats.items():
+        set_gauge(f"model_client_{name}", value)
+
+
+def record_coalescing(stats: Dict[str, Any]):
+    """Record statistics of coalesced identical model calls."""
+    for name, value in stats.items():
+        set_gauge(f"ai_coalescing_{name}", value)
+
+
+def record_batching(stats: Dict[str, Any]):
+    """Record statistics of micro-batched moderation calls."""
+    for name, value in stats.items():
+        set_gauge(f"ai_batching_{name}", value)
+
+
+def record_fusion(stats: Dict[str, Any]):
+    """Record statistics of fused AI guardrail calls."""
+    for name, value in stats.items():
+        set_gauge(f"ai_fusion_{name}", value)
+
+
+def record_verdict_cache(stats: Dict[str, Any]):
+    """Record statistics of the AI verdict cache."""
+    for name, value in stats.items():
+        set_gauge(f"verdict_cache_{name}", value)
+
+
 def export_metrics(format: str = "json") -> str:
     """Export metrics in various formats."""
     summary = _metrics.get_metrics_summary()
@@ -4,7 +4,7 @@ Pydantic models for API request/response validation.
 
 from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, constr, field_validator
 
 
 class CheckRequest(BaseModel):
@@ -25,6 +25,12 @@ class CheckRequest(BaseModel):
     preset: Optional[str] = Field(
         "customer_service", min_length=1, max_length=50, description="Guardrail preset to use"
     )
+    deadline_ms: Optional[int] = Field(
+        None,
+        ge=1,
+        le=60000,
+        description="Optional time budget for the check in milliseconds",
+    )
 
     @field_validator("context")
     def validate_context(cls, v):
@@ -55,6 +61,30 @@ class CheckResponse(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
 
+class BatchCheckRequest(BaseModel):
+    """Request model for checking a batch of independent texts."""
+
+    texts: List[constr(min_length=1, max_length=100000)] = Field(
+        ...,
+        min_length=1,
+        max_length=100,  # 100 texts per batch
+        description="Text contents to check, each up to 100KB",
+    )
+    kind: Literal["prompt", "response"] = Field(
+        "prompt", description="Type of content - user prompts or LLM responses"
+    )
+    preset: Optional[str] = Field(
+        "customer_service", min_length=1, max_length=50, description="Guardrail preset to use"
+    )
+
+
+class BatchCheckResponse(BaseModel):
+    """Response model for batch content checking."""
+
+    results: List[CheckResponse] = Field(..., description="One result per text, in request order")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+
+
 class RulesResponse(BaseModel):
     """Response model for rules configuration."""
 
@@ -19,7 +19,7 @@ def get_version():
 def run_demo():
     print("\n[Stinger Demo]\n")
     pipeline = GuardrailPipeline.from_preset("customer_service")
-    prompt = "My credit card number is 1234-5678-9012-3456."
+    prompt = "My credit card number is 4111-1111-1111-1111."
     print(f"User Prompt: {prompt}")
     result = pipeline.check_input(prompt)
     print(f"Result: {'BLOCKED' if result['blocked'] else 'ALLOWED'}")
@@ -1,10 +1,13 @@
 import argparse
+import os
 import sys
 from importlib.metadata import version
+from pathlib import Path
 
 from stinger.cli.first_run import check_first_run
 from stinger.cli.setup_wizard import run_setup
 from stinger.core.health_monitor import HealthMonitor, print_health_status
+from stinger.core.keyword_file import CompiledKeywords, compile_keyword_file
 from stinger.core.pipeline import GuardrailPipeline
 
 
@@ -19,7 +22,7 @@ def get_version():
 def run_demo():
     print("\n[Stinger Demo]\n")
     pipeline = GuardrailPipeline.from_preset("customer_service")
-    prompt = "My credit card number is 1234-5678-9012-3456."
+    prompt = "My credit card number is 4111-1111-1111-1111."
     print(f"User Prompt: {prompt}")
     result = pipeline.check_input(prompt)
     print(f"Result: {'BLOCKED' if result['blocked'] else 'ALLOWED'}")
@@ -71,6 +74,24 @@ def show_health(detailed: bool = False):
     return True
 
 
+def compile_keywords(files, case_sensitive: bool = False, output=None):
+    """Compile keyword files for memory-mapped loading."""
+    if output is not None and len(files) > 1:
+        print("❌ --output can only be used with a single keyword file")
+        return 1
+    for source in files:
+        try:
+            path = compile_keyword_file(Path(source), output, case_sensitive=case_sensitive)
+        except Exception as e:
+            print(f"❌ Error compiling {source}: {e}")
+            return 1
+        count = len(CompiledKeywords(path))
+        print(
+            f"✅ Compiled {count} keywords from {source} to {path} ({os.path.getsize(path)} bytes)"
+        )
+    return 0
+
+
 def main():
     # Check for first run experience
     if len(sys.argv) == 1:  # No command provided
@@ -99,6 +120,17 @@ def main():
 
     subparsers.add_parser("setup", help="Run interactive setup wizard")
 
+    compile_parser = subparsers.add_parser(
+        "compile-keywords", help="Compile keyword files for memory-mapped loading"
+    )
+    compile_parser.add_argument("files", nargs="+", help="Keyword files to compile")
+    compile_parser.add_argument(
+        "--case-sensitive", action="store_true", help="Compile for case-sensitive matching"
+    )
+    compile_parser.add_argument(
+        "--output", "-o", help="Compiled file path (default: <file>.kwc next to the file)"
+    )
+
     args = parser.parse_args()
     if args.command == "demo":
         run_demo()
@@ -110,6 +142,8 @@ def main():
         show_health(detailed=args.detailed)
     elif args.command == "setup":
         return run_setup()
+    elif args.command == "compile-keywords":
+        return compile_keywords(args.files, args.case_sensitive, args.output)
     else:
         parser.print_help()
 
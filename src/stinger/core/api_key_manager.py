@@ -62,6 +62,18 @@ class APIKeyManager:
         self._keys: Dict[str, str] = {}
         self._load_keys()
 
+    @classmethod
+    def shared(cls) -> "APIKeyManager":
+        """
+        Get the process-wide key manager.
+
+        Config files and secure storage are read once per process; environment
+        variables, which take precedence, are read again on every call.
+        """
+        manager = _get_api_key_manager()
+        manager._load_from_environment()
+        return manager
+
     def _generate_encryption_key(self) -> Optional[str]:
         """Generate a new encryption key with secure failure mode."""
         if not ENCRYPTION_AVAILABLE or Fernet is None:
@@ -0,0 +1,152 @@
+"""
+Compiled Artifact Sharing
+
+Guardrails compile their patterns and keyword lists into matchers when they are
+built. Pipelines built from the same preset, or from configurations that share
+guardrails, used to compile identical matchers again and again. The artifact
+cache interns them instead: a matcher is built once per process for each
+distinct content (pattern list, keyword list, flags...) and handed to every
+guardrail instance that asks for the same content.
+
+Shared artifacts are immutable (the matchers' internal memo caches aside), so
+guardrails never need their own copy. An entry is keyed by a hash of the
+content it was built from, and it lives only as long as some guardrail holds it;
+dropping the last pipeline that uses a matcher frees it.
+
+The cache also tracks the approximate memory held by its artifacts, reported by
+get_artifact_stats() and exported by the API's ``/metrics`` endpoint.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sys
+import weakref
+from threading import Lock
+from typing import Any, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def content_key(kind: str, content: Any) -> str:
+    """Hash the content an artifact is built from into its cache key."""
+    source = json.dumps(content, separators=(",", ":"), default=repr)
+    return f"{kind}:{hashlib.sha256(source.encode('utf-8', 'surrogatepass')).hexdigest()}"
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate the memory held by an object graph, in bytes."""
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, type):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, (str, bytes, int, float, bool, re.Pattern)) or item is None:
+            continue
+        else:
+            stack.extend(getattr(item, "__dict__", {}).values())
+    return size
+
+
+class ArtifactCache:
+    """Process-wide, weakly referenced cache of immutable compiled artifacts."""
+
+    def __init__(self):
+        self._artifacts: "weakref.WeakValueDictionary[str, Any]" = weakref.WeakValueDictionary()
+        self._sizes: Dict[str, int] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, kind: str, content: Any, build: Callable[[], T]) -> T:
+        """
+        Get the shared artifact built from content, building it on first use.
+
+        Args:
+            kind: Kind of artifact (e.g. 'keywords'); part of the key
+            content: JSON-serializable description of everything the artifact
+                depends on; equal content must build equal artifacts
+            build: Builds the artifact; it must support weak references
+
+        Returns:
+            The shared artifact
+        """
+        key = content_key(kind, content)
+        artifact = self._artifacts.get(key)
+        if artifact is not None:
+            self.hits += 1
+            return artifact
+
+        # Built outside the lock: compiling may be slow, and a race only builds twice
+        built = build()
+        with self._lock:
+            artifact = self._artifacts.get(key)
+            if artifact is not None:
+                self.hits += 1
+                return artifact
+            self.misses += 1
+            self._artifacts[key] = built
+            self._sizes[key] = estimate_size(built)
+            weakref.finalize(built, self._forget, key)
+        return built
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            if key not in self._artifacts:
+                self._sizes.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the number of shared artifacts, their size and hit statistics."""
+        with self._lock:
+            sizes = dict(self._sizes)
+        by_kind: Dict[str, int] = {}
+        for key in sizes:
+            kind = key.split(":", 1)[0]
+            by_kind[kind] = by_kind.get(kind, 0) + 1
+        lookups = self.hits + self.misses
+        return {
+            "artifacts": len(sizes),
+            "memory_bytes": sum(sizes.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "by_kind": by_kind,
+        }
+
+    def clear(self) -> None:
+        """Forget all artifacts; guardrails keep the ones they hold."""
+        with self._lock:
+            self._artifacts.clear()
+            self._sizes.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_artifact_cache = ArtifactCache()
+
+
+def intern_artifact(kind: str, content: Any, build: Callable[[], T]) -> T:
+    """Get a shared artifact from the process-wide cache (see ArtifactCache.intern)."""
+    return _artifact_cache.intern(kind, content, build)
+
+
+def get_artifact_stats() -> Dict[str, Any]:
+    """Get statistics of the process-wide artifact cache."""
+    return _artifact_cache.get_stats()
+
+
+def clear_artifacts() -> None:
+    """Empty the process-wide artifact cache."""
+    _artifact_cache.clear()
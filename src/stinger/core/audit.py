@@ -179,6 +179,7 @@ class AuditTrail:
         request_id: str = None,
         confidence: float = None,
         rule_triggered: str = None,
+        processing_time_ms: float = None,
     ):
         """Log guardrail security decision for audit trail."""
         if not self._enabled:
@@ -195,6 +196,7 @@ class AuditTrail:
             "reason": reason,
             "confidence": confidence,
             "rule_triggered": rule_triggered,
+            "processing_time_ms": processing_time_ms,
         }
 
         self._write_audit_record(record)
@@ -467,6 +469,7 @@ def log_guardrail_decision(
     request_id: str = None,
     confidence: float = None,
     rule_triggered: str = None,
+    processing_time_ms: float = None,
 ):
     """Log guardrail security decision for audit trail."""
     _audit_trail.log_guardrail_decision(
@@ -478,6 +481,7 @@ def log_guardrail_decision(
         request_id,
         confidence,
         rule_triggered,
+        processing_time_ms,
     )
 
 
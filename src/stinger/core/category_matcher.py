@@ -0,0 +1,92 @@
+"""
+Category Matching
+
+Counts matches of categorized regex patterns. The patterns are compiled once,
+when the guardrail is built, into one alternation per category and one for all
+checked categories together. Text that matches no category, the common case, is
+scanned once instead of once per pattern.
+
+Otherwise each category's alternation is searched from that first match, and in
+each category that matches, every pattern is counted separately from the
+category's first match, since no pattern can match earlier. Counts are therefore
+the same as running every pattern over the whole text, including patterns that
+match overlapping text (e.g. "fight" and "fight me").
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .artifacts import intern_artifact
+
+
+class CategoryMatcher:
+    """Immutable matcher for a set of pattern categories."""
+
+    def __init__(self, categories: Dict[str, List[str]], flags: int = 0):
+        """
+        Compile the patterns and one alternation per category.
+
+        Args:
+            categories: Pattern lists by category name
+            flags: Regex flags for all patterns
+
+        Raises:
+            re.error: If a pattern is invalid
+        """
+        self.categories = categories
+        self._compiled: Dict[str, Tuple[re.Pattern, List[re.Pattern]]] = {
+            category: (
+                re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags),
+                [re.compile(pattern, flags) for pattern in patterns],
+            )
+            for category, patterns in categories.items()
+            if patterns
+        }
+        self._flags = flags
+        # Alternations of all patterns of a set of categories, built on first use
+        self._combined: Dict[Tuple[str, ...], Optional[re.Pattern]] = {}
+
+    @classmethod
+    def shared(cls, categories: Dict[str, List[str]], flags: int = 0) -> "CategoryMatcher":
+        """Get the process-wide shared matcher for these categories (see artifacts)."""
+        return intern_artifact("categories", [categories, flags], lambda: cls(categories, flags))
+
+    def count(self, text: str, categories: Iterable[str]) -> Dict[str, int]:
+        """
+        Count the matches of each category in text.
+
+        Args:
+            text: Text to scan
+            categories: Categories to check, in reporting order
+
+        Returns:
+            Match counts of the categories that matched, in the given order
+        """
+        categories = tuple(category for category in categories if category in self._compiled)
+        combined = self._get_combined(categories)
+        first_any = combined.search(text) if combined is not None else None
+        if first_any is None:
+            return {}
+
+        counts = {}
+        for category in categories:
+            union, patterns = self._compiled[category]
+            first = union.search(text, first_any.start())
+            if first is None:
+                continue
+            start = first.start()
+            counts[category] = sum(
+                sum(1 for _ in pattern.finditer(text, start)) for pattern in patterns
+            )
+        return counts
+
+    def _get_combined(self, categories: Tuple[str, ...]) -> Optional[re.Pattern]:
+        """Get the alternation of all patterns of some categories."""
+        if categories not in self._combined:
+            patterns = [pattern for category in categories for pattern in self.categories[category]]
+            self._combined[categories] = (
+                re.compile("|".join(f"(?:{pattern})" for pattern in patterns), self._flags)
+                if patterns
+                else None
+            )
+        return self._combined[categories]
@@ -7,6 +7,21 @@ import yaml
 
 from ..utils.exceptions import ConfigurationError
 
+
+def _per_pipeline_setting(value_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema for a pipeline setting given once for both pipelines or per pipeline type."""
+    return {
+        "oneOf": [
+            value_schema,
+            {
+                "type": "object",
+                "properties": {"input": value_schema, "output": value_schema},
+                "additionalProperties": False,
+            },
+        ]
+    }
+
+
 CONFIG_SCHEMA = {
     "type": "object",
     "properties": {
@@ -44,6 +59,22 @@ CONFIG_SCHEMA = {
                                 "type": "string",
                                 "enum": ["block", "allow", "skip", "warn"],
                             },
+                            "timeout_ms": {"type": "number", "exclusiveMinimum": 0},
+                            "escalation": {
+                                "type": "object",
+                                "properties": {
+                                    "from": {"type": "string"},
+                                    "gray_zone": {
+                                        "type": "array",
+                                        "items": {"type": "number", "minimum": 0, "maximum": 1},
+                                        "minItems": 2,
+                                        "maxItems": 2,
+                                    },
+                                    "shadow_rate": {"type": "number", "minimum": 0, "maximum": 1},
+                                },
+                                "required": ["from"],
+                                "additionalProperties": False,
+                            },
                             "min_length": {"type": "integer"},
                             "max_length": {"type": "integer"},
                             "keyword": {"type": "string"},
@@ -56,6 +87,7 @@ CONFIG_SCHEMA = {
                             "keywords_file": {"type": "string"},
                             "keyword_files": {"type": "array", "items": {"type": "string"}},
                             "case_sensitive": {"type": "boolean"},
+                            "word_boundary": {"type": "boolean"},
                             "patterns": {"type": "array", "items": {"type": "string"}},
                             "action": {"type": "string"},
                             "thresholds": {
@@ -144,6 +176,22 @@ CONFIG_SCHEMA = {
                                 "type": "string",
                                 "enum": ["block", "allow", "skip", "warn"],
                             },
+                            "timeout_ms": {"type": "number", "exclusiveMinimum": 0},
+                            "escalation": {
+                                "type": "object",
+                                "properties": {
+                                    "from": {"type": "string"},
+                                    "gray_zone": {
+                                        "type": "array",
+                                        "items": {"type": "number", "minimum": 0, "maximum": 1},
+                                        "minItems": 2,
+                                        "maxItems": 2,
+                                    },
+                                    "shadow_rate": {"type": "number", "minimum": 0, "maximum": 1},
+                                },
+                                "required": ["from"],
+                                "additionalProperties": False,
+                            },
                             "min_length": {"type": "integer"},
                             "max_length": {"type": "integer"},
                             "keyword": {"type": "string"},
@@ -156,6 +204,7 @@ CONFIG_SCHEMA = {
                             "keywords_file": {"type": "string"},
                             "keyword_files": {"type": "array", "items": {"type": "string"}},
                             "case_sensitive": {"type": "boolean"},
+                            "word_boundary": {"type": "boolean"},
                             "patterns": {"type": "array", "items": {"type": "string"}},
                             "action": {"type": "string"},
                             "thresholds": {
@@ -214,6 +263,42 @@ CONFIG_SCHEMA = {
                         "required": ["name", "type", "enabled", "on_error"],
                     },
                 },
+                "execution": _per_pipeline_setting(
+                    {"type": "string", "enum": ["sequential", "parallel"]}
+                ),
+                "order": _per_pipeline_setting({"type": "string", "enum": ["config", "cost"]}),
+                "stop_on_first_block": _per_pipeline_setting({"type": "boolean"}),
+                "ai_fusion": _per_pipeline_setting({"type": "boolean"}),
+                "stream_overlap": {"type": "integer", "minimum": 0},
+                "offload": {
+                    "oneOf": [
+                        {"type": "boolean"},
+                        {"type": "string", "enum": ["thread", "process"]},
+                        {
+                            "type": "object",
+                            "properties": {
+                                "backend": {"type": "string", "enum": ["thread", "process"]},
+                                "max_workers": {"type": "integer", "minimum": 1},
+                                "min_length": {"type": "integer", "minimum": 0},
+                            },
+                            "additionalProperties": False,
+                        },
+                    ]
+                },
+                "cache": {
+                    "oneOf": [
+                        {"type": "boolean"},
+                        {
+                            "type": "object",
+                            "properties": {
+                                "enabled": {"type": "boolean"},
+                                "max_size": {"type": "integer", "minimum": 1},
+                                "ttl_seconds": {"type": "number", "exclusiveMinimum": 0},
+                            },
+                            "additionalProperties": False,
+                        },
+                    ]
+                },
             },
             "required": ["input"],
         },
@@ -140,6 +140,8 @@ class ConfigValidator:
 COMMON_GUARDRAIL_RULES = [
     ValidationRule(field="name", required=False, field_type=str),
     ValidationRule(field="enabled", required=False, field_type=bool),
+    ValidationRule(field="timeout_ms", required=False, field_type=(int, float), min_value=1),
+    ValidationRule(field="escalation", required=False, field_type=dict),
 ]
 
 # Rules for AI-based guardrails
@@ -177,6 +179,8 @@ KEYWORD_GUARDRAIL_RULES = COMMON_GUARDRAIL_RULES + [
     ),
     ValidationRule(field="keywords_file", required=False, field_type=str),
     ValidationRule(field="case_sensitive", required=False, field_type=bool),
+    ValidationRule(field="word_boundary", required=False, field_type=bool),
+    ValidationRule(field="reload_interval", required=False, field_type=(int, float), min_value=0),
 ]
 
 # Rules for length guardrails
@@ -192,6 +196,9 @@ LENGTH_GUARDRAIL_RULES = COMMON_GUARDRAIL_RULES + [
 URL_GUARDRAIL_RULES = COMMON_GUARDRAIL_RULES + [
     ValidationRule(field="blocked_domains", required=False, field_type=list),
     ValidationRule(field="allowed_domains", required=False, field_type=list),
+    ValidationRule(field="blocked_domains_file", required=False, field_type=str),
+    ValidationRule(field="allowed_domains_file", required=False, field_type=str),
+    ValidationRule(field="reload_interval", required=False, field_type=(int, float), min_value=0),
     ValidationRule(
         field="action", required=False, field_type=str, choices=["block", "allow", "warn"]
     ),
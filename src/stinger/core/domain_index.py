@@ -0,0 +1,129 @@
+"""
+Domain Indexing
+
+Matches domains against large domain lists, such as threat-intel blocklists with
+hundreds of thousands of entries. The list is loaded once into a hash set. A
+domain matches when it, or any of its parent domains, is in the set.
+"sub.evil.com" is checked as "sub.evil.com", "evil.com" and "com". A lookup
+therefore costs one set probe per label in the domain, however long the list is.
+
+Domain list files hold one domain per line. Blank lines and lines starting with
+"#" are skipped. Hosts-file lines ("0.0.0.0 evil.com") use their last field.
+Entries are lower-cased, and a leading "*." or "." and a trailing "." are
+dropped, since every entry already covers its subdomains.
+"""
+
+import os
+from pathlib import Path
+from typing import FrozenSet, Iterable, List, Optional
+
+from .artifacts import intern_artifact
+
+
+def normalize_domain(domain: str) -> str:
+    """Normalize a domain list entry for lookups."""
+    domain = domain.strip().lower().rstrip(".")
+    if domain.startswith("*."):
+        domain = domain[2:]
+    return domain.lstrip(".")
+
+
+class DomainIndex:
+    """Immutable set of domains that also matches their subdomains."""
+
+    def __init__(self, domains: Iterable[str]):
+        self._domains: FrozenSet[str] = frozenset(
+            normalized for normalized in map(normalize_domain, domains) if normalized
+        )
+
+    @classmethod
+    def shared(cls, domains: Iterable[str]) -> "DomainIndex":
+        """Get the process-wide shared index of these domains (see artifacts)."""
+        domains = list(domains)
+        return intern_artifact("domains", domains, lambda: cls(domains))
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+    def __bool__(self) -> bool:
+        return bool(self._domains)
+
+    def match(self, domain: str) -> Optional[str]:
+        """
+        Find the entry that covers a domain.
+
+        Args:
+            domain: Lower-case domain to look up
+
+        Returns:
+            The matching entry (the domain itself or a parent domain), or None
+        """
+        domains = self._domains
+        if domain in domains:
+            return domain
+        position = domain.find(".")
+        while position != -1:
+            suffix = domain[position + 1 :]
+            if suffix in domains:
+                return suffix
+            position = domain.find(".", position + 1)
+        return None
+
+    def __contains__(self, domain: str) -> bool:
+        return self.match(domain) is not None
+
+
+def load_domain_file(path: Path) -> List[str]:
+    """
+    Read the domains of a domain list file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        OSError: If the file cannot be read
+    """
+    domains = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                domains.append(line.split()[-1])
+    return domains
+
+
+class DomainListFile:
+    """
+    A domain list file watched for changes.
+
+    The file's modification time is checked at most once per ``reload_interval``
+    seconds, so checking for changes on every request stays cheap.
+    """
+
+    def __init__(self, path: Path, reload_interval: float = 0.0):
+        """
+        Args:
+            path: Path of the domain list file
+            reload_interval: Seconds between checks for changes; 0 disables reloading
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+
+    def load(self, now: float) -> List[str]:
+        """Read the file and remember its modification time."""
+        mtime = os.stat(self.path).st_mtime
+        domains = load_domain_file(self.path)
+        self._mtime = mtime
+        self._next_check = now + self.reload_interval
+        return domains
+
+    def changed(self, now: float) -> bool:
+        """Check whether the file changed since it was loaded, if a check is due."""
+        if self.reload_interval <= 0 or now < self._next_check:
+            return False
+        self._next_check = now + self.reload_interval
+        try:
+            return os.stat(self.path).st_mtime != self._mtime
+        except OSError:
+            # A file being replaced may briefly be missing; keep the loaded list
+            return False
@@ -0,0 +1,140 @@
+"""
+Tiered Escalation
+
+Lets an expensive guardrail (typically an AI guardrail) be consulted only when a
+cheap local guardrail is unsure. The local guardrail's confidence is used as a
+risk score: below the gray zone the content is clearly benign, above it the
+local guardrail decides on its own, and only scores inside the gray zone are
+escalated.
+
+A fraction of the requests that are not escalated can be shadow-checked: the
+expensive guardrail runs anyway, its result is discarded, and any disagreement
+with the local decision is counted, so the savings can be weighed against the
+decisions that would have changed.
+"""
+
+import random
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Optional
+
+# Default risk scores [low, high) that are escalated
+DEFAULT_GRAY_ZONE = (0.3, 0.7)
+
+# Outcomes of EscalationPolicy.decide()
+BELOW = "below"
+ESCALATE = "escalate"
+ABOVE = "above"
+
+
+@dataclass(frozen=True)
+class EscalationPolicy:
+    """When a guardrail is consulted, based on the score of another guardrail."""
+
+    source: str
+    low: float = DEFAULT_GRAY_ZONE[0]
+    high: float = DEFAULT_GRAY_ZONE[1]
+    shadow_rate: float = 0.0
+
+    def __post_init__(self):
+        if not 0.0 <= self.low <= self.high <= 1.0:
+            raise ValueError("gray_zone must be [low, high] with 0 <= low <= high <= 1")
+        if not 0.0 <= self.shadow_rate <= 1.0:
+            raise ValueError("shadow_rate must be between 0.0 and 1.0")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "EscalationPolicy":
+        """
+        Create a policy from a guardrail's ``escalation`` setting.
+
+        Args:
+            config: Mapping with ``from`` (name of the local guardrail), and optional
+                ``gray_zone`` ([low, high]) and ``shadow_rate`` keys
+
+        Raises:
+            ValueError: If the setting is invalid
+        """
+        if not isinstance(config, dict) or not config.get("from"):
+            raise ValueError("escalation requires 'from', the name of a local guardrail")
+
+        gray_zone = config.get("gray_zone", DEFAULT_GRAY_ZONE)
+        if not isinstance(gray_zone, (list, tuple)) or len(gray_zone) != 2:
+            raise ValueError("gray_zone must be a [low, high] pair")
+
+        return cls(
+            source=config["from"],
+            low=float(gray_zone[0]),
+            high=float(gray_zone[1]),
+            shadow_rate=float(config.get("shadow_rate", 0.0)),
+        )
+
+    def decide(self, score: float) -> str:
+        """Classify a risk score as BELOW, inside (ESCALATE) or ABOVE the gray zone."""
+        if score < self.low:
+            return BELOW
+        if score >= self.high:
+            return ABOVE
+        return ESCALATE
+
+    def sample_shadow(self) -> bool:
+        """Whether a request that is not escalated should be shadow-checked."""
+        return self.shadow_rate > 0 and random.random() < self.shadow_rate
+
+
+class EscalationStats:
+    """Thread-safe per-guardrail counters of escalations, skips and shadow divergences."""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = Lock()
+
+    def _entry(self, guardrail_name: str) -> Dict[str, int]:
+        return self._counts.setdefault(
+            guardrail_name,
+            {"evaluated": 0, "escalated": 0, "shadow_checks": 0, "divergences": 0},
+        )
+
+    def record_decision(self, guardrail_name: str, escalated: bool) -> None:
+        """Record whether a guardrail was escalated to for one check."""
+        with self._lock:
+            entry = self._entry(guardrail_name)
+            entry["evaluated"] += 1
+            if escalated:
+                entry["escalated"] += 1
+
+    def record_shadow(self, guardrail_name: str, diverged: bool) -> None:
+        """Record a shadow check and whether it disagreed with the local decision."""
+        with self._lock:
+            entry = self._entry(guardrail_name)
+            entry["shadow_checks"] += 1
+            if diverged:
+                entry["divergences"] += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get counters and rates for every guardrail that has been evaluated."""
+        with self._lock:
+            stats = {}
+            for name, entry in self._counts.items():
+                skipped = entry["evaluated"] - entry["escalated"]
+                stats[name] = {
+                    **entry,
+                    "skipped": skipped,
+                    "skip_rate": skipped / entry["evaluated"] if entry["evaluated"] else 0.0,
+                    "divergence_rate": (
+                        entry["divergences"] / entry["shadow_checks"]
+                        if entry["shadow_checks"]
+                        else 0.0
+                    ),
+                }
+            return stats
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self._counts.clear()
+
+
+def escalation_from_config(config: Dict[str, Any]) -> Optional[EscalationPolicy]:
+    """Get the escalation policy of a guardrail configuration, if it has one."""
+    setting = config.get("escalation")
+    return EscalationPolicy.from_config(setting) if setting is not None else None
@@ -0,0 +1,176 @@
+"""
+Sync Execution Backend
+
+Provides the machinery used by the synchronous pipeline API to run async code:
+a long-lived event loop on a dedicated thread, and a driver that runs coroutines
+which never suspend without any event loop at all.
+
+Keeping one loop alive avoids creating and tearing down an event loop (and any
+HTTP connection pools bound to it) on every synchronous check.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CoroutineSuspendedError(RuntimeError):
+    """Raised when a coroutine driven without an event loop tries to suspend."""
+
+
+def run_coroutine_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion without an event loop.
+
+    This only works for coroutines that never actually suspend, such as the
+    ``analyze`` methods of local guardrails, and is much cheaper than scheduling
+    them on a loop.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's return value
+
+    Raises:
+        CoroutineSuspendedError: If the coroutine suspends or needs a running loop
+    """
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    except RuntimeError as e:
+        if "no running event loop" in str(e):
+            raise CoroutineSuspendedError("Coroutine requires a running event loop") from e
+        raise
+    coro.close()
+    raise CoroutineSuspendedError("Coroutine suspended while running without an event loop")
+
+
+class BackgroundEventLoop:
+    """An asyncio event loop running forever on a dedicated daemon thread."""
+
+    def __init__(self, name: str = "StingerEventLoop"):
+        """
+        Initialize the background loop. The thread is started lazily on first use.
+
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the loop thread is alive in the current process."""
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if needed and return the loop."""
+        if self.is_running and self._loop is not None:
+            return self._loop
+
+        with self._lock:
+            # Threads do not survive fork, so a pre-fork loop is replaced in the child
+            if not self.is_running:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+                thread.start()
+                ready.wait()
+
+                self._loop = loop
+                self._thread = thread
+                self._pid = os.getpid()
+                logger.debug(f"Started background event loop thread {self.name}")
+
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the background loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Optional time to wait for the result, in seconds
+
+        Returns:
+            The coroutine's return value
+
+        Raises:
+            RuntimeError: If called from the loop thread itself
+            concurrent.futures.TimeoutError: If the timeout expires
+        """
+        loop = self.start()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Cannot block on the background event loop from its own thread")
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the loop and wait for its thread to finish."""
+        with self._lock:
+            if not self.is_running or self._loop is None:
+                return
+
+            loop = self._loop
+            thread = self._thread
+
+            async def shutdown():
+                tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await loop.shutdown_asyncgens()
+
+            try:
+                asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Background event loop shutdown incomplete: {e}")
+
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+            self._loop = None
+            self._thread = None
+            self._pid = None
+
+
+# Global background loop instance
+_background_loop: Optional[BackgroundEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Get or create the process-wide background event loop."""
+    global _background_loop
+    if _background_loop is None:
+        with _background_loop_lock:
+            if _background_loop is None:
+                _background_loop = BackgroundEventLoop()
+                atexit.register(_background_loop.stop)
+    return _background_loop
@@ -85,7 +85,7 @@ def create_url_filter(name: str, config: Dict[str, Any]) -> GuardrailInterface:
     """Create a URL filter."""
     try:
         # Import the direct implementation for new GuardrailInterface
-        from ..guardrails.url_filter import URLGuardrail
+        from ..guardrails.url_guardrail import URLGuardrail
 
         return URLGuardrail(config)
     except Exception as e:
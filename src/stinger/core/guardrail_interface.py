@@ -12,7 +12,8 @@ from enum import Enum
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 from .config_validator import ConfigValidator, ValidationRule
-from .input_validation import ValidationError, validate_input_content
+from .escalation import escalation_from_config
+from .input_validation import ValidationError, ValidationLimits, validate_input_content
 
 if TYPE_CHECKING:
     from .conversation import Conversation
@@ -77,6 +78,21 @@ class GuardrailResult:
 class GuardrailInterface(ABC):
     """Universal interface for all guardrails to ensure pluggability."""
 
+    # Whether analysis calls an external AI model (slow and paid) rather than running locally
+    uses_ai: bool = False
+
+    # Whether analysis only looks for local patterns, so a streamed output can be
+    # checked chunk by chunk (see GuardrailPipeline.stream_output)
+    supports_streaming: bool = False
+
+    # Whether the decision may depend on conversation context as well as content;
+    # such pipelines bypass the decision cache when a conversation is given
+    uses_conversation: bool = False
+
+    # Whether analysis is CPU-heavy local work that may be moved off the event
+    # loop thread (see the pipeline ``offload`` setting)
+    cpu_bound: bool = False
+
     def __init__(self, name: str, guardrail_type: GuardrailType, config: Dict[str, Any]):
         """Initialize guardrail with name, type, and configuration.
 
@@ -95,6 +111,11 @@ class GuardrailInterface(ABC):
         self.name = name
         self.guardrail_type = guardrail_type
         self.enabled = config.get("enabled", True)
+        self.on_error = config.get("on_error", "block")
+        # Maximum time the pipeline waits for analyze(); on timeout on_error decides
+        self.timeout_ms = config.get("timeout_ms", ValidationLimits.MAX_FILTER_PROCESSING_TIME_MS)
+        # Optional tiered escalation: only consulted when another guardrail is unsure
+        self.escalation = escalation_from_config(config)
 
     @abstractmethod
     async def analyze(
@@ -0,0 +1,614 @@
+"""
+Compiled Keyword Files
+
+Keyword list files are text, one keyword per line. Every guardrail instance
+parses its file into a list and builds an Aho-Corasick automaton from it (see
+keyword_matcher), in every worker process. With lists of hundreds of thousands
+of keywords, each worker then spends seconds at startup and holds its own copy
+of a large automaton.
+
+``stinger compile-keywords <file>`` compiles a keyword file once into
+``<file>.kwc``: the keywords and a ready-built automaton, stored as flat arrays
+of integers. A guardrail whose keyword file has a compiled sibling maps it with
+mmap instead of parsing the file. It builds no Python objects for the keywords
+or automaton states, so startup does not depend on the list's size, and all
+worker processes share one copy of the file's pages through the OS page cache.
+
+The compiled file records the sha256 of the source file it was built from, and
+is only mapped while the source still has that hash. A guardrail whose source
+changed since it was compiled, or whose compiled file cannot be read, parses
+the text file instead; guardrails never compile files themselves, so rebuilding
+is left to ``stinger compile-keywords`` or the deployment's build step.
+Guardrails watch their keyword file, so edits to the source are picked up while
+running too.
+
+File layout (little-endian; all counts and arrays are unsigned 32-bit integers):
+
+- header: magic, format version, flags (bit 0: case-sensitive), the source
+  sha256, and the counts of keywords, states, edges, outputs and text bytes
+- keyword offsets into the keyword text, and per keyword its pattern length in
+  bytes and whether it starts and ends with a word character
+- per state: the start of its edges, its failure link, the start of its outputs,
+  and the nearest state (itself or a failure-link ancestor) with outputs
+- edge targets and outputs (keyword indices), then edge labels (one byte each,
+  sorted per state) and the keywords as UTF-8 text
+
+The automaton matches UTF-8 bytes, which finds the same substrings as matching
+characters. Case-insensitive files hold canonicalized patterns (see
+normalization), so a compiled file matches exactly as a KeywordMatcher built
+from the same list would.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .artifacts import intern_artifact
+from .keyword_matcher import KeywordMatcher
+from .normalization import canonicalize, normalized
+
+logger = logging.getLogger(__name__)
+
+COMPILED_SUFFIX = ".kwc"
+
+_MAGIC = b"SKWC"
+_VERSION = 1
+_CASE_SENSITIVE = 1
+# magic, version, flags, source sha256, keywords, states, edges, outputs, text bytes
+_HEADER = struct.Struct("<4sHH32sIIIII")
+_STARTS_WORD = 1
+_ENDS_WORD = 2
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def compiled_path(source: Path) -> Path:
+    """Get the path of the compiled form of a keyword file."""
+    return source.with_name(source.name + COMPILED_SUFFIX)
+
+
+def file_digest(path: Path) -> bytes:
+    """Get the sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def read_keyword_file(path: Path) -> List[str]:
+    """Read the keywords of a keyword file, skipping blank lines and "#" comments."""
+    keywords = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                keywords.append(line)
+    return keywords
+
+
+def _build_trie(patterns: List[bytes]) -> Tuple[List[Dict[int, int]], List[List[int]]]:
+    """Build the trie of byte patterns: edges and own pattern indices per state."""
+    goto: List[Dict[int, int]] = [{}]
+    own: List[List[int]] = [[]]
+    for index, pattern in enumerate(patterns):
+        state = 0
+        for byte in pattern:
+            next_state = goto[state].get(byte)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][byte] = next_state
+                goto.append({})
+                own.append([])
+            state = next_state
+        own[state].append(index)
+    return goto, own
+
+
+def _breadth_first(goto: List[Dict[int, int]]) -> Tuple[List[int], List[int]]:
+    """Order trie states breadth-first; returns the order and each state's new number."""
+    order = [0]
+    for state in order:
+        order.extend(goto[state][byte] for byte in sorted(goto[state]))
+    number = [0] * len(goto)
+    for new, old in enumerate(order):
+        number[old] = new
+    return order, number
+
+
+def _failure_links(
+    goto: List[Dict[int, int]], own: List[List[int]], order: List[int], number: List[int]
+) -> Tuple[array, array]:
+    """
+    Compute the failure link of each renumbered state, and the nearest state on
+    its failure chain (itself included) that ends a pattern, or 0.
+    """
+    fail = array("I", bytes(4 * len(order)))
+    report = array("I", bytes(4 * len(order)))
+    queue = deque([0])
+    while queue:
+        old = queue.popleft()
+        state = number[old]
+        for byte, old_child in goto[old].items():
+            child = number[old_child]
+            fallback = fail[state]
+            if state:
+                while fallback and byte not in goto[order[fallback]]:
+                    fallback = fail[fallback]
+                target = goto[order[fallback]].get(byte)
+                fail[child] = number[target] if target is not None else 0
+            report[child] = child if own[old_child] else report[fail[child]]
+            queue.append(old_child)
+    return fail, report
+
+
+def _flatten(
+    goto: List[Dict[int, int]], own: List[List[int]], order: List[int], number: List[int]
+) -> Dict[str, array]:
+    """Flatten the edges and outputs of the renumbered states into arrays."""
+    edge_start = array("I", [0])
+    edge_label = array("B")
+    edge_target = array("I")
+    out_start = array("I", [0])
+    outputs = array("I")
+    for old in order:
+        for byte in sorted(goto[old]):
+            edge_label.append(byte)
+            edge_target.append(number[goto[old][byte]])
+        edge_start.append(len(edge_label))
+        outputs.extend(own[old])
+        out_start.append(len(outputs))
+    return {
+        "edge_start": edge_start,
+        "out_start": out_start,
+        "edge_target": edge_target,
+        "outputs": outputs,
+        "edge_label": edge_label,
+    }
+
+
+def _build_arrays(patterns: List[bytes]) -> Dict[str, array]:
+    """Build the automaton of byte patterns as flat arrays, states in breadth-first order."""
+    goto, own = _build_trie(patterns)
+    # Renumbered breadth-first, so failure links can be computed in order
+    order, number = _breadth_first(goto)
+    fail, report = _failure_links(goto, own, order, number)
+    flat = _flatten(goto, own, order, number)
+    return {
+        "edge_start": flat["edge_start"],
+        "fail": fail,
+        "out_start": flat["out_start"],
+        "report": report,
+        "edge_target": flat["edge_target"],
+        "outputs": flat["outputs"],
+        "edge_label": flat["edge_label"],
+    }
+
+
+def compile_keywords(
+    keywords: Sequence[str], output: Path, case_sensitive: bool = False, source_digest: bytes = b""
+) -> None:
+    """
+    Compile keywords into a compiled keyword file.
+
+    Args:
+        keywords: Keywords, as they should be reported
+        output: Path of the compiled file; replaced atomically if it exists
+        case_sensitive: Whether the file is for case-sensitive matching
+        source_digest: sha256 of the source keyword file
+    """
+    patterns = [
+        (kw if case_sensitive else canonicalize(kw)).encode("utf-8", "surrogatepass")
+        for kw in keywords
+    ]
+    arrays = _build_arrays(patterns)
+
+    offsets = array("I", [0])
+    info = array("I")
+    text = bytearray()
+    for keyword, pattern in zip(keywords, patterns):
+        text += keyword.encode("utf-8", "surrogatepass")
+        offsets.append(len(text))
+        flags = 0
+        if pattern:
+            decoded = pattern.decode("utf-8", "surrogatepass")
+            flags |= _STARTS_WORD if _is_word_char(decoded[0]) else 0
+            flags |= _ENDS_WORD if _is_word_char(decoded[-1]) else 0
+        info.append(len(pattern) << 2 | flags)
+
+    sections = [offsets, info] + list(arrays.values())
+    if sys.byteorder == "big":
+        for section in sections:
+            section.byteswap()
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        _CASE_SENSITIVE if case_sensitive else 0,
+        source_digest.ljust(32, b"\0"),
+        len(keywords),
+        len(arrays["fail"]),
+        len(arrays["edge_label"]),
+        len(arrays["outputs"]),
+        len(text),
+    )
+    # Written next to the target, then renamed over it, so readers never see a partial file
+    fd, temp_name = tempfile.mkstemp(prefix=output.name, suffix=".tmp", dir=output.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            for section in sections:
+                section.tofile(f)
+            f.write(text)
+        os.replace(temp_name, output)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def compile_keyword_file(
+    source: Path, output: Optional[Path] = None, case_sensitive: bool = False
+) -> Path:
+    """
+    Compile a keyword file.
+
+    Keywords are lower-cased for case-insensitive files, as KeywordListGuardrail
+    reports them.
+
+    Args:
+        source: Keyword file to compile
+        output: Path of the compiled file; defaults to compiled_path(source)
+        case_sensitive: Compile for case-sensitive matching
+
+    Returns:
+        The path of the compiled file
+    """
+    source = Path(source)
+    output = Path(output) if output is not None else compiled_path(source)
+    digest = file_digest(source)
+    keywords = read_keyword_file(source)
+    if not case_sensitive:
+        keywords = [kw.lower() for kw in keywords]
+    compile_keywords(keywords, output, case_sensitive=case_sensitive, source_digest=digest)
+    return output
+
+
+class CompiledKeywords:
+    """A memory-mapped compiled keyword file."""
+
+    def __init__(self, path: Path):
+        """
+        Map a compiled keyword file.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a compiled keyword file of this version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if len(view) < _HEADER.size:
+            raise ValueError(f"Not a compiled keyword file: {self.path.name}")
+        magic, version, flags, digest, n_keywords, n_states, n_edges, n_outputs, n_text = (
+            _HEADER.unpack_from(view)
+        )
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a compiled keyword file of version {_VERSION}: {self.path.name}")
+        if sys.byteorder == "big":
+            raise ValueError("Compiled keyword files can only be mapped on little-endian hosts")
+
+        self.case_sensitive = bool(flags & _CASE_SENSITIVE)
+        self.source_digest: bytes = digest
+
+        position = _HEADER.size
+
+        def section(count: int, fmt: str = "I") -> memoryview:
+            nonlocal position
+            size = count * (4 if fmt == "I" else 1)
+            if position + size > len(view):
+                raise ValueError(f"Truncated compiled keyword file: {self.path.name}")
+            part = view[position : position + size].cast(fmt)
+            position += size
+            return part
+
+        self._offsets = section(n_keywords + 1)
+        self._info = section(n_keywords)
+        self._edge_start = section(n_states + 1)
+        self._fail = section(n_states)
+        self._out_start = section(n_states + 1)
+        self._report = section(n_states)
+        self._edge_target = section(n_edges)
+        self._outputs = section(n_outputs)
+        self._edge_label = section(n_edges, "B")
+        self._text = section(n_text, "B")
+
+        # Transitions from the root, where most bytes are, as a plain table
+        self._root = [0] * 256
+        for i in range(self._edge_start[0], self._edge_start[1]):
+            self._root[self._edge_label[i]] = self._edge_target[i]
+        # Empty patterns end at the root and match any text
+        self._always = list(self._outputs[self._out_start[0] : self._out_start[1]])
+
+    def __len__(self) -> int:
+        return len(self._info)
+
+    def keyword(self, index: int) -> str:
+        """Get a keyword by index."""
+        return bytes(self._text[self._offsets[index] : self._offsets[index + 1]]).decode(
+            "utf-8", "surrogatepass"
+        )
+
+    def prepare(self, text: str) -> bytes:
+        """Get the bytes to scan for text, in the form the patterns were compiled in."""
+        if not self.case_sensitive:
+            text = normalized(text).canonical
+        return text.encode("utf-8", "surrogatepass")
+
+    def contains(self, keyword: str) -> bool:
+        """Whether the list has a keyword, as reported."""
+        pattern = keyword if self.case_sensitive else canonicalize(keyword)
+        state = 0
+        for byte in pattern.encode("utf-8", "surrogatepass"):
+            state = self._step(state, byte)
+            if state is None:
+                return False
+        return any(
+            self.keyword(self._outputs[i]) == keyword
+            for i in range(self._out_start[state], self._out_start[state + 1])
+        )
+
+    def _step(self, state: int, byte: int) -> Optional[int]:
+        """Follow the edge of a state for a byte, if it has one."""
+        labels = self._edge_label
+        low, high = self._edge_start[state], self._edge_start[state + 1]
+        i = bisect_left(labels, byte, low, high)
+        if i < high and labels[i] == byte:
+            return self._edge_target[i]
+        return None
+
+    def _on_boundary(self, data: bytes, index: int, end: int) -> bool:
+        """Whether a match of keyword index ending at data[end] is a whole word."""
+        info = self._info[index]
+        if info & _STARTS_WORD:
+            start = end - (info >> 2)
+            if start > 0:
+                before = start - 1
+                while before > 0 and 0x80 <= data[before] < 0xC0:
+                    before -= 1
+                if _is_word_char(data[before:start].decode("utf-8", "replace")):
+                    return False
+        if info & _ENDS_WORD and end < len(data):
+            after = end + 1
+            while after < len(data) and 0x80 <= data[after] < 0xC0:
+                after += 1
+            if _is_word_char(data[end:after].decode("utf-8", "replace")):
+                return False
+        return True
+
+    def scan(self, data: bytes, word_boundary: bool, stop_at_first: bool) -> List[int]:
+        """Get the indices of the keywords found in prepared text, in list order."""
+        found = set(self._always)
+        if found and stop_at_first:
+            return sorted(found)
+
+        root, fail, report = self._root, self._fail, self._report
+        edge_start, labels, targets = self._edge_start, self._edge_label, self._edge_target
+        wanted = len(self)
+        state = 0
+        for end, byte in enumerate(data, 1):
+            while state:
+                low, high = edge_start[state], edge_start[state + 1]
+                i = bisect_left(labels, byte, low, high)
+                if i < high and labels[i] == byte:
+                    state = targets[i]
+                    break
+                state = fail[state]
+            else:
+                state = root[byte]
+            match = report[state]
+            if match:
+                for index in self._new_matches(data, match, end, found, word_boundary):
+                    found.add(index)
+                    if stop_at_first:
+                        return [index]
+                if len(found) == wanted:
+                    break
+        return sorted(found)
+
+    def _new_matches(
+        self, data: bytes, match: int, end: int, found: Set[int], word_boundary: bool
+    ) -> Iterator[int]:
+        """Yield the keywords ending at data[end] along a report chain that are not in found."""
+        out_start, outputs, fail, report = self._out_start, self._outputs, self._fail, self._report
+        while match:
+            for i in range(out_start[match], out_start[match + 1]):
+                index = outputs[i]
+                if index in found:
+                    continue
+                if word_boundary and not self._on_boundary(data, index, end):
+                    continue
+                yield index
+            match = report[fail[match]]
+
+
+class KeywordTable(Sequence):
+    """Read-only list of the keywords of a compiled file, followed by extra keywords."""
+
+    def __init__(self, compiled: CompiledKeywords, extra: Sequence[str] = ()):
+        self._compiled = compiled
+        self._extra = list(extra)
+
+    def __len__(self) -> int:
+        return len(self._compiled) + len(self._extra)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("keyword index out of range")
+        if index < len(self._compiled):
+            return self._compiled.keyword(index)
+        return self._extra[index - len(self._compiled)]
+
+
+class CompiledKeywordMatcher:
+    """
+    Multi-keyword matcher over a compiled keyword file (see KeywordMatcher).
+
+    Extra keywords, such as a guardrail's inline keywords, are matched with a
+    small in-memory matcher and reported after those of the file.
+    """
+
+    def __init__(
+        self, compiled: CompiledKeywords, extra: Iterable[str] = (), word_boundary: bool = False
+    ):
+        self.compiled = compiled
+        self.case_sensitive = compiled.case_sensitive
+        self.word_boundary = word_boundary
+        extra = [kw for kw in extra if not compiled.contains(kw)]
+        self.keywords = KeywordTable(compiled, extra)
+        self._extra = KeywordMatcher(
+            extra, case_sensitive=self.case_sensitive, word_boundary=word_boundary
+        )
+
+    @classmethod
+    def shared(
+        cls, compiled: CompiledKeywords, extra: Iterable[str] = (), word_boundary: bool = False
+    ) -> "CompiledKeywordMatcher":
+        """Get the process-wide shared matcher for a compiled file (see artifacts)."""
+        extra = list(extra)
+        return intern_artifact(
+            "keyword_file",
+            [
+                str(compiled.path.resolve()),
+                compiled.source_digest.hex(),
+                compiled.case_sensitive,
+                extra,
+                word_boundary,
+            ],
+            lambda: cls(compiled, extra, word_boundary),
+        )
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def find_indices(self, text: str) -> List[int]:
+        """Find the keywords that occur in text, as indices in keyword list order."""
+        indices = self.compiled.scan(
+            self.compiled.prepare(text), self.word_boundary, stop_at_first=False
+        )
+        if len(self._extra):
+            offset = len(self.compiled)
+            indices.extend(offset + i for i in self._extra.find_indices(text))
+        return indices
+
+    def find_all(self, text: str) -> List[str]:
+        """Find the keywords that occur in text, in keyword list order."""
+        return [self.keywords[i] for i in self.find_indices(text)]
+
+    def search(self, text: str) -> bool:
+        """Whether any keyword occurs in text, stopping at the first match."""
+        found = self.compiled.scan(
+            self.compiled.prepare(text), self.word_boundary, stop_at_first=True
+        )
+        return bool(found) or self._extra.search(text)
+
+
+def load_compiled_keywords(
+    source: Path, case_sensitive: bool, source_digest: bytes
+) -> Optional[CompiledKeywords]:
+    """
+    Map the compiled form of a keyword file, if it has a current one.
+
+    Compiled files built from another version of the source, compiled for the
+    other case sensitivity, or unreadable (corrupt, or of another format version)
+    are not used; the caller then reads the text file.
+
+    Args:
+        source: Keyword file
+        case_sensitive: Case sensitivity the caller matches with
+        source_digest: Current sha256 of the source file
+
+    Returns:
+        The mapped file, or None if there is no usable compiled file
+    """
+    path = compiled_path(source)
+    if not path.exists():
+        return None
+    try:
+        compiled = CompiledKeywords(path)
+    except Exception as e:
+        logger.warning(f"Cannot map {path.name} ({e}); reading the keyword file instead")
+        return None
+    if compiled.case_sensitive != case_sensitive:
+        logger.warning(
+            f"{path.name} was compiled for case-{'' if compiled.case_sensitive else 'in'}sensitive"
+            " matching; reading the keyword file instead"
+        )
+        return None
+    if compiled.source_digest != source_digest:
+        logger.warning(
+            f"{source.name} changed since it was compiled; reading the keyword file instead."
+            f" Run 'stinger compile-keywords {source.name}' to compile it again"
+        )
+        return None
+    return compiled
+
+
+class KeywordListFile:
+    """
+    A keyword file watched for changes to its content.
+
+    The file's modification time is checked at most once per ``reload_interval``
+    seconds; the file is only hashed when that changes, and counts as changed
+    only if its sha256 differs from the one recorded when it was loaded.
+    """
+
+    def __init__(self, path: Path, reload_interval: float = 0.0):
+        """
+        Args:
+            path: Path of the keyword file
+            reload_interval: Seconds between checks for changes; 0 disables reloading
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self.digest: Optional[bytes] = None
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+
+    def mark_loaded(self, now: float) -> bytes:
+        """Record the file's current state before loading it; returns its sha256."""
+        self._mtime = os.stat(self.path).st_mtime
+        self.digest = file_digest(self.path)
+        self._next_check = now + self.reload_interval
+        return self.digest
+
+    def changed(self, now: float) -> bool:
+        """Check whether the file's content changed since it was loaded, if a check is due."""
+        if self.reload_interval <= 0 or now < self._next_check:
+            return False
+        self._next_check = now + self.reload_interval
+        try:
+            mtime = os.stat(self.path).st_mtime
+            if mtime == self._mtime:
+                return False
+            self._mtime = mtime
+            return file_digest(self.path) != self.digest
+        except OSError:
+            # A file being replaced may briefly be missing; keep the loaded keywords
+            return False
@@ -0,0 +1,195 @@
+"""
+Keyword Matching
+
+Finds every keyword of a list in a single pass over the text, using an
+Aho-Corasick automaton built once when the keywords are loaded. Checking a text
+costs O(text length + matches) however many keywords there are, instead of one
+substring search per keyword.
+
+Short lists are still checked with plain substring searches, which run in C and
+beat a Python scan loop until the list grows past a few dozen keywords.
+
+Case-insensitive matching compares the canonical forms of keywords and text (see
+normalization), so look-alike letters and zero-width characters do not hide a
+keyword, and the request's canonical text is shared with other guardrails.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .artifacts import intern_artifact
+from .normalization import canonicalize, normalized
+
+# Lists with fewer keywords than this are matched with substring searches
+AUTOMATON_MIN_KEYWORDS = 32
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """
+    Immutable multi-keyword matcher.
+
+    Keywords are reported in the order they were given (duplicates included), so
+    callers get the same ``matched_keywords`` a loop over the list would produce.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        case_sensitive: bool = False,
+        word_boundary: bool = False,
+    ):
+        """
+        Build the matcher.
+
+        Args:
+            keywords: Keywords to find
+            case_sensitive: Whether matching is case-sensitive
+            word_boundary: Only match whole words. A boundary is required only where
+                the keyword itself starts or ends with a word character, so
+                keywords like "c++" still match before punctuation.
+        """
+        self.keywords: List[str] = list(keywords)
+        self.case_sensitive = case_sensitive
+        self.word_boundary = word_boundary
+
+        self._patterns = [kw if case_sensitive else canonicalize(kw) for kw in self.keywords]
+        self._use_automaton = word_boundary or len(self._patterns) >= AUTOMATON_MIN_KEYWORDS
+        # Empty keywords match any text, as `"" in text` does
+        self._always = [i for i, pattern in enumerate(self._patterns) if not pattern]
+
+        self._goto: List[Dict[str, int]] = []
+        self._fail: List[int] = []
+        self._output: List[Tuple[int, ...]] = []
+        if self._use_automaton:
+            self._build()
+
+    @classmethod
+    def shared(
+        cls, keywords: Iterable[str], case_sensitive: bool = False, word_boundary: bool = False
+    ) -> "KeywordMatcher":
+        """Get the process-wide shared matcher for these keywords (see artifacts)."""
+        keywords = list(keywords)
+        return intern_artifact(
+            "keywords",
+            [keywords, case_sensitive, word_boundary],
+            lambda: cls(keywords, case_sensitive=case_sensitive, word_boundary=word_boundary),
+        )
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _build(self) -> None:
+        """Build the trie, then the failure links and merged outputs breadth-first."""
+        goto: List[Dict[str, int]] = [{}]
+        own: List[List[int]] = [[]]
+        for index, pattern in enumerate(self._patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    own.append([])
+                state = next_state
+            own[state].append(index)
+
+        fail = [0] * len(goto)
+        output: List[Tuple[int, ...]] = [()] * len(goto)
+        queue = deque(goto[0].values())
+        for state in queue:
+            output[state] = tuple(own[state])
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(char, 0)
+                output[child] = tuple(own[child]) + output[fail[child]]
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    def _prepare(self, text: str) -> str:
+        return text if self.case_sensitive else normalized(text).canonical
+
+    def _on_boundary(self, text: str, start: int, end: int, pattern: str) -> bool:
+        """Whether a match of pattern at text[start:end] is a whole word."""
+        if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if _is_word_char(pattern[-1]) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+
+    def _scan(self, text: str, stop_at_first: bool) -> List[int]:
+        """Get the indices of the keywords found in (prepared) text."""
+        found = set(self._always)
+        if found and stop_at_first:
+            return sorted(found)
+
+        goto, fail, output = self._goto, self._fail, self._output
+        wanted = len(self._patterns)
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            for index in self._new_matches(text, output[state], position + 1, found):
+                found.add(index)
+                if stop_at_first:
+                    return [index]
+            if len(found) == wanted:
+                break
+        return sorted(found)
+
+    def _new_matches(
+        self, text: str, indices: Tuple[int, ...], end: int, found: Set[int]
+    ) -> Iterator[int]:
+        """Yield the keywords of a state's output ending at text[end] that are not in found."""
+        for index in indices:
+            if index in found:
+                continue
+            if self.word_boundary:
+                pattern = self._patterns[index]
+                if not self._on_boundary(text, end - len(pattern), end, pattern):
+                    continue
+            yield index
+
+    def find_indices(self, text: str) -> List[int]:
+        """
+        Find the keywords that occur in text.
+
+        Returns:
+            Indices of the matched keywords, in keyword list order
+        """
+        text = self._prepare(text)
+        if not self._use_automaton:
+            return [i for i, pattern in enumerate(self._patterns) if pattern in text]
+        return self._scan(text, stop_at_first=False)
+
+    def find_all(self, text: str) -> List[str]:
+        """
+        Find the keywords that occur in text.
+
+        Returns:
+            Matched keywords, in keyword list order
+        """
+        return [self.keywords[i] for i in self.find_indices(text)]
+
+    def search(self, text: str) -> bool:
+        """Whether any keyword occurs in text, stopping at the first match."""
+        text = self._prepare(text)
+        if not self._use_automaton:
+            return any(pattern in text for pattern in self._patterns)
+        return bool(self._scan(text, stop_at_first=True))
@@ -0,0 +1,207 @@
+"""
+Micro-Batching
+
+The OpenAI moderation endpoint accepts a list of inputs, but every check used
+to send its content in a request of its own. Under load, a worker then made one
+moderation request per check. The micro-batcher collects the requests that
+concurrent checks make within a few milliseconds, up to a maximum batch size,
+and sends them as one batched call. Each caller gets the result for its own
+input back.
+
+Requests are only batched with requests for the same client (provider, base URL,
+API key) on the same event loop. If the batched call fails, every caller in the
+batch gets its exception. A caller that is cancelled stops waiting without
+affecting the rest of the batch.
+
+A lone request waits at most the batch delay before it is sent. Batching is
+configured with MicroBatchConfig, which reads its defaults from the environment
+when the first request is batched (invalid values are logged and the defaults
+used instead):
+
+- ``STINGER_MODERATION_BATCH_SIZE``: most inputs per call (default 32; 1 disables
+  batching)
+- ``STINGER_MODERATION_BATCH_DELAY_MS``: longest wait for a batch to fill
+  (default 2)
+
+get_batching_stats() reports the batches sent and their size, and the API's
+``/metrics`` endpoint exports it.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BatchCall = Callable[[List[Any]], Awaitable[List[Any]]]
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_BATCH_DELAY_MS = 2.0
+
+
+@dataclass
+class MicroBatchConfig:
+    """Limits of micro-batched model calls."""
+
+    max_batch_size: int = field(
+        default_factory=lambda: int(
+            os.getenv("STINGER_MODERATION_BATCH_SIZE", str(DEFAULT_BATCH_SIZE))
+        )
+    )
+    max_delay_ms: float = field(
+        default_factory=lambda: float(
+            os.getenv("STINGER_MODERATION_BATCH_DELAY_MS", str(DEFAULT_BATCH_DELAY_MS))
+        )
+    )
+
+    def __post_init__(self):
+        if self.max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if self.max_delay_ms < 0:
+            raise ValueError("max_delay_ms cannot be negative")
+
+
+class _Batch:
+    """Items waiting to be sent in one call, and their callers' futures."""
+
+    def __init__(self, call: BatchCall):
+        self.call = call
+        self.items: List[Any] = []
+        self.futures: List["asyncio.Future[Any]"] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """Collects concurrent async calls with the same key into batched calls."""
+
+    def __init__(self, config: Optional[MicroBatchConfig] = None):
+        self.config = config or MicroBatchConfig()
+        # Filling batches by event loop and key; futures are only valid on their own loop
+        self._pending: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], _Batch] = {}
+        self._sending: Set["asyncio.Task[None]"] = set()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, key: Hashable, item: Any, call: BatchCall) -> Any:
+        """
+        Add an item to the batch of its key and wait for its result.
+
+        Args:
+            key: Key of the batch; items with equal keys may share a call
+            item: Input of this caller
+            call: Makes the batched call; returns one result per input, in order
+
+        Returns:
+            The result for item
+        """
+        if self.config.max_batch_size == 1:
+            self._count(1)
+            return (await call([item]))[0]
+
+        loop = asyncio.get_running_loop()
+        batch_key = (loop, key)
+        batch = self._pending.get(batch_key)
+        if batch is None:
+            batch = self._pending[batch_key] = _Batch(call)
+            batch.timer = loop.call_later(
+                self.config.max_delay_ms / 1000, self._flush, batch_key, batch
+            )
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self.config.max_batch_size:
+            batch.timer.cancel()
+            self._flush(batch_key, batch)
+        return await future
+
+    def _flush(self, batch_key: Tuple[asyncio.AbstractEventLoop, Hashable], batch: _Batch) -> None:
+        if self._pending.get(batch_key) is not batch:
+            return  # Already sent
+        del self._pending[batch_key]
+        self._count(len(batch.items))
+        task = batch_key[0].create_task(self._send(batch))
+        # Keep the task referenced until it completes
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: _Batch) -> None:
+        try:
+            results = await batch.call(batch.items)
+            if len(results) != len(batch.items):
+                raise ValueError(
+                    f"Batched call returned {len(results)} results for {len(batch.items)} inputs"
+                )
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _count(self, size: int) -> None:
+        self.batches += 1
+        self.items += size
+        self.largest_batch = max(self.largest_batch, size)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the number and size of the batches sent."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "requests_saved": self.items - self.batches,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.config.max_batch_size,
+            "pending": sum(len(batch.items) for batch in self._pending.values()),
+        }
+
+
+_moderation_batcher: Optional[MicroBatcher] = None
+_batcher_lock = Lock()
+
+
+def _get_moderation_batcher() -> MicroBatcher:
+    """Get the process-wide micro-batcher, configured from the environment on first use."""
+    global _moderation_batcher
+    if _moderation_batcher is None:
+        with _batcher_lock:
+            if _moderation_batcher is None:
+                try:
+                    config = MicroBatchConfig()
+                except ValueError as e:
+                    logger.warning(f"Invalid moderation batching settings ({e}); using defaults")
+                    config = MicroBatchConfig(
+                        max_batch_size=DEFAULT_BATCH_SIZE, max_delay_ms=DEFAULT_BATCH_DELAY_MS
+                    )
+                _moderation_batcher = MicroBatcher(config)
+    return _moderation_batcher
+
+
+def configure_batching(config: MicroBatchConfig) -> None:
+    """
+    Set the limits of batched moderation calls.
+
+    Batches already filling keep the delay they were started with.
+    """
+    global _moderation_batcher
+    with _batcher_lock:
+        if _moderation_batcher is None:
+            _moderation_batcher = MicroBatcher(config)
+        else:
+            _moderation_batcher.config = config
+
+
+async def batch_moderation(key: Hashable, item: Any, call: BatchCall) -> Any:
+    """Submit a moderation input to the process-wide micro-batcher."""
+    return await _get_moderation_batcher().submit(key, item, call)
+
+
+def get_batching_stats() -> Dict[str, Any]:
+    """Get statistics of the process-wide micro-batcher."""
+    return _get_moderation_batcher().get_stats()
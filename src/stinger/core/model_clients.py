@@ -0,0 +1,308 @@
+"""
+Model Client Registry
+
+AI guardrails used to build their own model client, and with it their own HTTP
+connection pool. A process running several pipelines then held dozens of mostly
+idle pools, and every one of them paid for its own TCP and TLS handshakes.
+
+The registry shares one client per (provider, base URL, API key) across all
+guardrails of the process, so they reuse each other's keep-alive connections.
+HTTP connection pools are bound to the event loop they are used on, so the
+registry keeps one client per key for each event loop that makes calls: in
+practice the API server's loop and the sync pipeline's background loop (see
+event_loop). Clients of a loop are dropped when the loop is garbage collected.
+
+Pool limits come from ConnectionPoolConfig, which reads its defaults from the
+environment:
+
+- ``STINGER_HTTP_MAX_CONNECTIONS``: open connections per client (default 100)
+- ``STINGER_HTTP_MAX_KEEPALIVE``: idle connections kept open (default 20)
+- ``STINGER_HTTP_KEEPALIVE_EXPIRY``: seconds an idle connection is kept (default 30)
+- ``STINGER_HTTP2``: "true" to use HTTP/2 (needs the ``h2`` package)
+
+get_model_client_stats() reports the clients and their pool utilization, and
+the API's ``/metrics`` endpoint exports it.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import logging
+import os
+import weakref
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Optional OpenAI import
+try:
+    from openai import AsyncOpenAI
+
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+    AsyncOpenAI = None
+
+# The HTTP library the OpenAI client is built on (httpx, or a compatible fork),
+# whose transport the shared pools are configured through
+try:
+    from openai import DEFAULT_CONNECTION_LIMITS, DefaultAsyncHttpxClient
+
+    http = importlib.import_module(type(DEFAULT_CONNECTION_LIMITS).__module__.split(".")[0])
+except ImportError:
+    DefaultAsyncHttpxClient = None
+    http = None
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConnectionPoolConfig:
+    """HTTP connection pool limits of shared model clients."""
+
+    max_connections: int = field(
+        default_factory=lambda: int(os.getenv("STINGER_HTTP_MAX_CONNECTIONS", "100"))
+    )
+    max_keepalive_connections: int = field(
+        default_factory=lambda: int(os.getenv("STINGER_HTTP_MAX_KEEPALIVE", "20"))
+    )
+    keepalive_expiry: float = field(
+        default_factory=lambda: float(os.getenv("STINGER_HTTP_KEEPALIVE_EXPIRY", "30"))
+    )
+    http2: bool = field(
+        default_factory=lambda: os.getenv("STINGER_HTTP2", "false").lower() == "true"
+    )
+
+    def __post_init__(self):
+        if self.max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+        if self.max_keepalive_connections < 0:
+            raise ValueError("max_keepalive_connections cannot be negative")
+        if self.keepalive_expiry < 0:
+            raise ValueError("keepalive_expiry cannot be negative")
+
+
+class _CountingTransport(http.AsyncBaseTransport if http is not None else object):
+    """Transport wrapper counting the requests sent through a pool."""
+
+    def __init__(self, transport: Any):
+        self.transport = transport
+        self.requests = 0
+        self.in_flight = 0
+
+    async def handle_async_request(self, request):
+        self.requests += 1
+        self.in_flight += 1
+        try:
+            return await self.transport.handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def connection_counts(self) -> Tuple[int, int]:
+        """Get the number of open and idle connections of the pool, if it tells."""
+        # httpx does not expose its pool; read httpcore's, where it is available
+        connections = getattr(getattr(self.transport, "_pool", None), "connections", None)
+        if connections is None:
+            return 0, 0
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return len(connections), idle
+
+
+@dataclass
+class _PooledClient:
+    """A shared client and the transport of its connection pool."""
+
+    client: Any
+    transport: Optional[_CountingTransport]
+
+
+def _create_openai_client(
+    api_key: str, base_url: Optional[str], pool: ConnectionPoolConfig
+) -> _PooledClient:
+    if not OPENAI_AVAILABLE or AsyncOpenAI is None:
+        raise ImportError("OpenAI library not available. Install with: pip install openai")
+    if http is None:
+        # Older OpenAI clients: shared, with the library's default pool
+        return _PooledClient(AsyncOpenAI(api_key=api_key, base_url=base_url), None)
+
+    http2 = pool.http2
+    if http2 and not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+        http2 = False
+    transport = _CountingTransport(
+        http.AsyncHTTPTransport(
+            limits=http.Limits(
+                max_connections=pool.max_connections,
+                max_keepalive_connections=pool.max_keepalive_connections,
+                keepalive_expiry=pool.keepalive_expiry,
+            ),
+            http2=http2,
+        )
+    )
+    # OpenAI's default client carries its timeouts and redirect settings
+    http_client = DefaultAsyncHttpxClient(transport=transport)
+    client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+    return _PooledClient(client, transport)
+
+
+_CLIENT_FACTORIES: Dict[
+    str, Callable[[str, Optional[str], ConnectionPoolConfig], _PooledClient]
+] = {
+    "openai": _create_openai_client,
+}
+
+ClientKey = Tuple[str, Optional[str], str]
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class ModelClientRegistry:
+    """Process-wide registry of shared, connection-pooled model clients."""
+
+    def __init__(self, pool_config: Optional[ConnectionPoolConfig] = None):
+        self.pool_config = pool_config or ConnectionPoolConfig()
+        # Clients for each event loop, plus those obtained outside of any loop
+        self._by_loop: "weakref.WeakKeyDictionary[Any, Dict[ClientKey, _PooledClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._unbound: Dict[ClientKey, _PooledClient] = {}
+        self._lock = Lock()
+        self.created = 0
+
+    @staticmethod
+    def _key(provider: str, api_key: str, base_url: Optional[str]) -> ClientKey:
+        # Keys are held as hashes, so the registry never holds or reports them
+        return (provider, base_url, hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+
+    def get_client(self, provider: str, api_key: str, base_url: Optional[str] = None) -> Any:
+        """
+        Get the shared client of a provider for the running event loop.
+
+        Args:
+            provider: Model provider (only 'openai' is supported)
+            api_key: API key the client authenticates with
+            base_url: API base URL; None for the provider's default
+
+        Returns:
+            The provider's async client (AsyncOpenAI for 'openai')
+
+        Raises:
+            ValueError: If the provider is not supported
+            ImportError: If the provider's client library is not installed
+        """
+        factory = _CLIENT_FACTORIES.get(provider)
+        if factory is None:
+            raise ValueError(f"Unsupported model provider: {provider}")
+        key = self._key(provider, api_key, base_url)
+        loop = _running_loop()
+        with self._lock:
+            if loop is None:
+                clients = self._unbound
+            else:
+                clients = self._by_loop.get(loop)
+                if clients is None:
+                    clients = self._by_loop[loop] = {}
+            pooled = clients.get(key)
+            if pooled is None:
+                pooled = clients[key] = factory(api_key, base_url, self.pool_config)
+                self.created += 1
+                logger.debug(f"Created shared {provider} client ({len(clients)} on this loop)")
+        return pooled.client
+
+    def _all_clients(self) -> List[Tuple[ClientKey, _PooledClient]]:
+        with self._lock:
+            groups = [self._unbound] + [
+                clients for loop, clients in self._by_loop.items() if not loop.is_closed()
+            ]
+            return [(key, pooled) for clients in groups for key, pooled in clients.items()]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the number of shared clients and the utilization of their pools."""
+        clients = self._all_clients()
+        stats = {
+            "clients": len({key for key, _ in clients}),
+            "pools": len(clients),
+            "pools_created": self.created,
+            "requests": 0,
+            "requests_in_flight": 0,
+            "connections_open": 0,
+            "connections_idle": 0,
+            "max_connections": self.pool_config.max_connections,
+        }
+        for _, pooled in clients:
+            if pooled.transport is None:
+                continue
+            stats["requests"] += pooled.transport.requests
+            stats["requests_in_flight"] += pooled.transport.in_flight
+            open_connections, idle = pooled.transport.connection_counts()
+            stats["connections_open"] += open_connections
+            stats["connections_idle"] += idle
+        capacity = stats["pools"] * self.pool_config.max_connections
+        in_use = stats["connections_open"] - stats["connections_idle"]
+        stats["pool_utilization"] = in_use / capacity if capacity else 0.0
+        return stats
+
+    async def aclose(self) -> None:
+        """Close the clients of the running event loop (e.g. on application shutdown)."""
+        loop = _running_loop()
+        with self._lock:
+            clients = self._by_loop.pop(loop, {}) if loop is not None else {}
+        for pooled in clients.values():
+            try:
+                await pooled.client.close()
+            except Exception as e:
+                logger.warning(f"Failed to close model client: {e}")
+
+
+_registry: Optional[ModelClientRegistry] = None
+_registry_lock = Lock()
+
+
+def get_model_client_registry() -> ModelClientRegistry:
+    """Get the process-wide model client registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelClientRegistry()
+    return _registry
+
+
+def configure_model_clients(pool_config: ConnectionPoolConfig) -> None:
+    """
+    Set the connection pool limits of shared model clients.
+
+    Only clients created afterwards use them, so call this before any guardrail
+    makes a model call.
+    """
+    get_model_client_registry().pool_config = pool_config
+
+
+def get_model_client(provider: str, api_key: str, base_url: Optional[str] = None) -> Any:
+    """Get a shared model client (see ModelClientRegistry.get_client)."""
+    return get_model_client_registry().get_client(provider, api_key, base_url)
+
+
+def get_model_client_stats() -> Dict[str, Any]:
+    """Get statistics of the shared model clients."""
+    return get_model_client_registry().get_stats()
+
+
+async def close_model_clients() -> None:
+    """Close the shared model clients of the running event loop."""
+    await get_model_client_registry().aclose()
@@ -11,7 +11,9 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 import yaml
-from openai import AsyncOpenAI
+
+from .model_clients import OPENAI_AVAILABLE, get_model_client
+from .single_flight import coalesce, request_key
 
 logger = logging.getLogger(__name__)
 
@@ -41,25 +43,42 @@ class OpenAIModelProvider(ModelProvider):
 
     def __init__(self, model_name: str, api_key: str, **kwargs):
         self.model_name = model_name
-        self.client = AsyncOpenAI(api_key=api_key)
+        if not OPENAI_AVAILABLE:
+            raise ImportError("OpenAI library not available. Install with: pip install openai")
+        self.api_key = api_key
         self.temperature = kwargs.get("temperature", 0.1)
         self.max_tokens = kwargs.get("max_tokens", 500)
         self.timeout = kwargs.get("timeout", 30)
 
+    @property
+    def client(self):
+        """The shared client for this key on the running event loop (see model_clients)."""
+        return get_model_client("openai", self.api_key)
+
     async def generate_response(self, prompt: str, **kwargs) -> str:
         """Generate a response using OpenAI API."""
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant. Respond only with valid JSON.",
+            },
+            {"role": "user", "content": prompt},
+        ]
+        temperature = kwargs.get("temperature", self.temperature)
+        max_tokens = kwargs.get("max_tokens", self.max_tokens)
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant. Respond only with valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=kwargs.get("temperature", self.temperature),
-                max_tokens=kwargs.get("max_tokens", self.max_tokens),
+            # Identical concurrent requests share one API call (see single_flight)
+            key = request_key(
+                "completion", None, self.api_key, self.model_name, messages, temperature, max_tokens
+            )
+            response = await coalesce(
+                key,
+                lambda: self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ),
             )
             return response.choices[0].message.content or ""
         except Exception as e:
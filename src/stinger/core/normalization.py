@@ -0,0 +1,155 @@
+"""
+Text Normalization
+
+Computes the normalized views of a request's content that local guardrails match
+against, once per request instead of once per guardrail (or per pattern).
+
+The pipeline wraps the content of each request in a NormalizedContent, a str
+that also carries the views, and passes it to every guardrail as usual. Each
+view is computed on first use and then shared by all guardrails of the request.
+Guardrails call normalized(content) to get the views. Called with plain text,
+as when a guardrail is used on its own, it computes the views for that call.
+
+The views, from least to most normalized:
+
+- ``lowered``: the content lower-cased
+- ``folded``: NFKC-normalized and case-folded, so fullwidth and stylized letters
+  ("ｆｒｅｅ", "𝐟𝐫𝐞𝐞") read as plain ones
+- ``collapsed``: ``folded`` with every run of whitespace replaced by one space
+- ``canonical``: ``collapsed`` after removing invisible format characters
+  (zero-width spaces and joiners, soft hyphens, bidi controls) and mapping
+  common Cyrillic and Greek look-alike letters to Latin ones
+
+Case-insensitive checks for evasion-prone content (keywords, topics, toxicity)
+match against ``canonical``. Their keywords and phrases are put through the
+same canonicalize(), so both sides are compared in the same form. The views of
+ASCII content skip the Unicode steps, which would not change it.
+"""
+
+import re
+import unicodedata
+from functools import cached_property
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Invisible characters used to split words without changing how they look
+_FORMAT_CHARS = dict.fromkeys(
+    [
+        0x00AD,  # soft hyphen
+        0x034F,  # combining grapheme joiner
+        0x061C,  # arabic letter mark
+        0x115F,
+        0x1160,
+        0x17B4,
+        0x17B5,
+        *range(0x180B, 0x180F),  # mongolian variation selectors and vowel separator
+        *range(0x200B, 0x2010),  # zero-width space, joiners, directional marks
+        *range(0x202A, 0x202F),  # bidi embeddings and overrides
+        *range(0x2060, 0x2065),  # word joiner, invisible operators
+        *range(0x2066, 0x2070),  # bidi isolates, deprecated format characters
+        0x3164,
+        *range(0xFE00, 0xFE10),  # variation selectors
+        0xFEFF,  # zero-width no-break space
+        0xFFA0,
+    ]
+)
+
+# Case-folded look-alikes of Latin letters
+_CONFUSABLES = str.maketrans(
+    {
+        # Cyrillic
+        "а": "a",
+        "в": "b",
+        "е": "e",
+        "ё": "e",
+        "һ": "h",
+        "н": "h",
+        "і": "i",
+        "ї": "i",
+        "ј": "j",
+        "к": "k",
+        "ӏ": "l",
+        "м": "m",
+        "о": "o",
+        "р": "p",
+        "ԛ": "q",
+        "с": "c",
+        "ѕ": "s",
+        "т": "t",
+        "у": "y",
+        "ԝ": "w",
+        "х": "x",
+        "ԁ": "d",
+        # Greek
+        "α": "a",
+        "β": "b",
+        "ε": "e",
+        "ι": "i",
+        "κ": "k",
+        "ν": "v",
+        "ο": "o",
+        "ρ": "p",
+        "τ": "t",
+        "υ": "u",
+        "χ": "x",
+        "ζ": "z",
+        # Latin
+        "ı": "i",
+        "ɑ": "a",
+        "ɡ": "g",
+        "ɩ": "i",
+    }
+)
+
+
+def _fold(text: str) -> str:
+    """NFKC-normalize and case-fold text."""
+    if text.isascii():
+        return text.lower()
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def _collapse(text: str) -> str:
+    return _WHITESPACE.sub(" ", text)
+
+
+def canonicalize(text: str) -> str:
+    """Get the ``canonical`` view of text (see the module documentation)."""
+    if text.isascii():
+        return _collapse(text.lower())
+    return _collapse(_fold(text.translate(_FORMAT_CHARS)).translate(_CONFUSABLES))
+
+
+class NormalizedContent(str):
+    """
+    Content of one request, with its normalized views computed once on first use.
+
+    View names do not shadow str methods, so guardrails can treat it as any str.
+    """
+
+    def __reduce__(self):
+        # Cross process boundaries as plain text; workers recompute the views they use
+        return (str, (str(self),))
+
+    @cached_property
+    def lowered(self) -> str:
+        return self.lower()
+
+    @cached_property
+    def folded(self) -> str:
+        return self.lowered if self.isascii() else _fold(self)
+
+    @cached_property
+    def collapsed(self) -> str:
+        return _collapse(self.folded)
+
+    @cached_property
+    def canonical(self) -> str:
+        return self.collapsed if self.isascii() else canonicalize(self)
+
+
+def normalized(content: str) -> NormalizedContent:
+    """Get the normalized views of content, reusing those of the current request."""
+    if isinstance(content, NormalizedContent):
+        return content
+    return NormalizedContent(content)
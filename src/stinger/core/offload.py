@@ -0,0 +1,214 @@
+"""
+Guardrail Offloading
+
+Runs CPU-heavy local guardrails (large keyword lists, many regexes) outside the
+event loop thread, so one long payload does not stall every other request
+served by the same loop.
+
+Two backends are available:
+
+- ``thread``: guardrails run on a thread pool, sharing the pipeline's guardrail
+  instances. This frees the event loop while a guardrail runs; CPU-bound pure
+  Python code still competes for the GIL.
+- ``process``: each worker process builds its own guardrail instances from the
+  pipeline configuration once, at start-up. Only the text and the result cross
+  the process boundary, and guardrails run truly in parallel.
+
+Short content is always checked inline, since handing it to a worker costs more
+than checking it.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from .event_loop import CoroutineSuspendedError, run_coroutine_sync
+from .guardrail_interface import GuardrailInterface, GuardrailResult
+
+logger = logging.getLogger(__name__)
+
+# Supported values for the ``backend`` offload setting
+OFFLOAD_BACKENDS = ("thread", "process")
+
+# Content shorter than this (in characters) is checked on the event loop thread
+DEFAULT_OFFLOAD_MIN_LENGTH = 2000
+
+# Guardrails built in a worker process, keyed like GuardrailOffloader specs
+_worker_guardrails: Dict[str, GuardrailInterface] = {}
+
+
+def _analyze_timed(guardrail: GuardrailInterface, content: str) -> Tuple[GuardrailResult, float]:
+    """Run a local guardrail to completion and measure the CPU time it used."""
+    start = time.thread_time()
+    try:
+        result = run_coroutine_sync(guardrail.analyze(content))
+    except CoroutineSuspendedError:
+        result = asyncio.run(guardrail.analyze(content))
+    return result, (time.thread_time() - start) * 1000
+
+
+def _init_worker(specs: Dict[str, Dict[str, Any]]) -> None:
+    """Build the guardrails of a worker process from their configurations."""
+    from .guardrail_factory import register_all_factories
+    from .guardrail_interface import GuardrailFactory, GuardrailRegistry
+
+    registry = GuardrailRegistry()
+    register_all_factories(registry)
+    factory = GuardrailFactory(registry)
+
+    _worker_guardrails.clear()
+    for key, config in specs.items():
+        guardrail = factory.create_from_config(config)
+        if guardrail is not None:
+            _worker_guardrails[key] = guardrail
+
+
+def _analyze_in_worker(key: str, content: str) -> Tuple[GuardrailResult, float]:
+    """Run one of the worker's guardrails."""
+    guardrail = _worker_guardrails.get(key)
+    if guardrail is None:
+        raise RuntimeError(f"Guardrail {key} is not available in the worker process")
+    return _analyze_timed(guardrail, content)
+
+
+class GuardrailOffloader:
+    """Runs ``cpu_bound`` guardrails on a thread or process pool."""
+
+    def __init__(
+        self,
+        backend: str = "thread",
+        max_workers: Optional[int] = None,
+        min_length: int = DEFAULT_OFFLOAD_MIN_LENGTH,
+    ):
+        """
+        Initialize the offloader. The pool is started on first use.
+
+        Args:
+            backend: 'thread' or 'process'
+            max_workers: Pool size (defaults to the number of CPUs)
+            min_length: Minimum content length, in characters, that is offloaded
+
+        Raises:
+            ValueError: If an argument is invalid
+        """
+        if backend not in OFFLOAD_BACKENDS:
+            raise ValueError(
+                f"Invalid offload backend: {backend}. Must be one of {list(OFFLOAD_BACKENDS)}"
+            )
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if min_length < 0:
+            raise ValueError("min_length must be non-negative")
+
+        self.backend = backend
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_length = min_length
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[GuardrailInterface, str] = {}
+        self._executor: Optional[Executor] = None
+        self._lock = Lock()
+
+    def register(
+        self,
+        pipeline_type: str,
+        guardrails: List[GuardrailInterface],
+        configs: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Register the configurations process workers build guardrails from.
+
+        Guardrails are matched to configurations by name; guardrails without a
+        configuration (e.g. added programmatically) are checked inline with the
+        process backend.
+        """
+        by_name = {}
+        for config in configs:
+            by_name.setdefault(config.get("name"), config)
+
+        with self._lock:
+            for guardrail in guardrails:
+                config = by_name.get(guardrail.name)
+                if config is not None and guardrail.cpu_bound:
+                    key = f"{pipeline_type}:{guardrail.name}"
+                    self._specs[key] = dict(config)
+                    self._keys[guardrail] = key
+            self._restart()
+
+    def update_spec(self, guardrail: GuardrailInterface, changes: Dict[str, Any]) -> None:
+        """Apply a runtime configuration change to the worker copies of a guardrail."""
+        with self._lock:
+            key = self._keys.get(guardrail)
+            if key is None:
+                return
+            self._specs[key].update(changes)
+            if self.backend == "process":
+                self._restart()
+
+    def should_offload(self, guardrail: GuardrailInterface, content: str) -> bool:
+        """Whether a guardrail check on this content should run in the pool."""
+        if not guardrail.cpu_bound or guardrail.uses_ai or len(content) < self.min_length:
+            return False
+        return self.backend == "thread" or guardrail in self._keys
+
+    async def run(
+        self, guardrail: GuardrailInterface, content: str
+    ) -> Tuple[GuardrailResult, float]:
+        """
+        Run a guardrail in the pool.
+
+        Returns:
+            The guardrail result and the CPU time it used, in milliseconds
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        if self.backend == "thread":
+            return await loop.run_in_executor(executor, _analyze_timed, guardrail, content)
+        return await loop.run_in_executor(
+            executor, _analyze_in_worker, self._keys[guardrail], content
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool. It is started again on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=wait, cancel_futures=True)
+            else:
+                # cancel_futures needs 3.9; queued work still runs before the pool stops
+                executor.shutdown(wait=wait)
+
+    def _get_executor(self) -> Executor:
+        """Get the pool, starting it if needed."""
+        executor = self._executor
+        if executor is not None:
+            return executor
+
+        with self._lock:
+            if self._executor is None:
+                if self.backend == "thread":
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="StingerOffload"
+                    )
+                else:
+                    # Spawned, not forked: the pipeline process runs an event loop thread
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(dict(self._specs),),
+                    )
+                logger.debug(f"Started {self.backend} offload pool with {self.max_workers} workers")
+            return self._executor
+
+    def _restart(self) -> None:
+        """Drop the process pool so workers are rebuilt from the current specs (lock held)."""
+        if self.backend == "process" and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
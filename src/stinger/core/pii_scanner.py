@@ -0,0 +1,175 @@
+"""
+PII Scanning
+
+Finds personally identifiable information in a single pass over the text. The
+shapes of all enabled PII types are compiled once into one alternation, so each
+check is one regex scan instead of one scan per type. Every candidate the scan
+finds is then confirmed with a cheap validator: the Luhn checksum for credit
+cards, the area/group/serial rules for SSNs, octet ranges for IPv4 addresses.
+Candidates that fail validation are discarded or reclassified, which removes most
+false positives of the loose number patterns.
+
+Each candidate is reported once, as the first type (in PII_TYPES order) whose
+shape and validator accept it. A 16-digit run that passes the Luhn check is a
+credit card; one that does not may still be a bank account number.
+
+Matches carry their span, so callers can redact without scanning again.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .artifacts import intern_artifact
+
+# Shapes of the supported PII types, in classification order
+PII_TYPES: Dict[str, str] = {
+    "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b",
+    "ip_address": r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b",
+    "credit_card": r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b",
+    "ssn": r"\b\d{3}-?\d{2}-?\d{4}\b",
+    "phone": r"\b(?:\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b",
+    "driver_license": r"\b[A-Z]{1,2}\d{6,8}\b",
+    "passport": r"\b[A-Z]{1,2}\d{6,9}\b",
+    "bank_account": r"\b\d{8,17}\b",
+}
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def luhn_valid(digits: str) -> bool:
+    """Check the Luhn checksum of a string of digits."""
+    total = 0
+    for position, char in enumerate(reversed(digits)):
+        digit = ord(char) - 48
+        if position % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def _valid_credit_card(text: str) -> bool:
+    return luhn_valid(_NON_DIGITS.sub("", text))
+
+
+def _valid_ssn(text: str) -> bool:
+    digits = _NON_DIGITS.sub("", text)
+    area, group, serial = digits[:3], digits[3:5], digits[5:]
+    return (
+        area not in ("000", "666")
+        and not area.startswith("9")
+        and group != "00"
+        and serial != "0000"
+    )
+
+
+def _valid_ipv4(text: str) -> bool:
+    return all(int(octet) <= 255 for octet in text.split("."))
+
+
+def _valid_bank_account(text: str) -> bool:
+    # Runs of a single repeated digit are placeholders, not account numbers
+    return len(set(text)) > 1
+
+
+_VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    "credit_card": _valid_credit_card,
+    "ssn": _valid_ssn,
+    "ip_address": _valid_ipv4,
+    "bank_account": _valid_bank_account,
+}
+
+
+@dataclass(frozen=True)
+class PIIMatch:
+    """A confirmed PII occurrence."""
+
+    pii_type: str
+    start: int
+    end: int
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"type": self.pii_type, "start": self.start, "end": self.end}
+
+
+class PIIScanner:
+    """Immutable single-pass scanner for a set of PII types."""
+
+    def __init__(self, pii_types: Iterable[str]):
+        """
+        Compile the scanner.
+
+        Args:
+            pii_types: Types to detect, as keys of PII_TYPES; order does not matter
+
+        Raises:
+            ValueError: If a type is unknown
+        """
+        enabled = set(pii_types)
+        unknown = enabled - set(PII_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown PII types: {sorted(unknown)}")
+
+        self.pii_types: List[str] = [pii_type for pii_type in PII_TYPES if pii_type in enabled]
+        # Case-insensitive, so lowercase license and passport numbers are found too
+        self._shapes = {
+            pii_type: re.compile(PII_TYPES[pii_type], re.IGNORECASE) for pii_type in self.pii_types
+        }
+        self._union: Optional[re.Pattern] = None
+        if self.pii_types:
+            self._union = re.compile(
+                "|".join(f"(?P<{pii_type}>{PII_TYPES[pii_type]})" for pii_type in self.pii_types),
+                re.IGNORECASE,
+            )
+
+    @classmethod
+    def shared(cls, pii_types: Iterable[str]) -> "PIIScanner":
+        """Get the process-wide shared scanner for these types (see artifacts)."""
+        enabled = sorted(set(pii_types))
+        return intern_artifact("pii", enabled, lambda: cls(enabled))
+
+    def scan(self, text: str) -> List[PIIMatch]:
+        """
+        Find all confirmed PII in text.
+
+        Returns:
+            Matches in text order
+        """
+        if self._union is None:
+            return []
+
+        matches = []
+        for candidate in self._union.finditer(text):
+            pii_type = self._classify(candidate.lastgroup, candidate.group())
+            if pii_type is not None:
+                matches.append(PIIMatch(pii_type, candidate.start(), candidate.end()))
+        return matches
+
+    def _classify(self, matched_type: str, value: str) -> Optional[str]:
+        """Confirm a candidate, falling back to later types that fit it whole."""
+        validator = _VALIDATORS.get(matched_type)
+        if validator is None or validator(value):
+            return matched_type
+
+        for pii_type in self.pii_types[self.pii_types.index(matched_type) + 1 :]:
+            if self._shapes[pii_type].fullmatch(value):
+                validator = _VALIDATORS.get(pii_type)
+                if validator is None or validator(value):
+                    return pii_type
+        return None
+
+    @staticmethod
+    def redact(text: str, matches: Iterable[PIIMatch], replacement: str = "[REDACTED]") -> str:
+        """Replace matched spans of text, as returned by scan(text)."""
+        parts = []
+        position = 0
+        for match in sorted(matches, key=lambda m: m.start):
+            if match.start < position:
+                continue
+            parts.append(text[position : match.start])
+            parts.append(replacement)
+            position = match.end
+        parts.append(text[position:])
+        return "".join(parts)
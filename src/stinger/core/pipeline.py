@@ -6,19 +6,25 @@ without dealing with async complexity or low-level configuration.
 """
 
 import asyncio
+import copy
 import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TypedDict, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, TypedDict, Union
 
-# Exceptions imported but kept for potential future use
 from . import audit
 from .config import ConfigLoader
 from .conversation import Conversation, Turn
+from .decision_cache import DecisionCache, hash_config, make_cache_key
+from .escalation import BELOW, ESCALATE, EscalationPolicy, EscalationStats
+from .event_loop import CoroutineSuspendedError, get_background_loop, run_coroutine_sync
 from .guardrail_interface import (
     GuardrailFactory,
     GuardrailInterface,
     GuardrailRegistry,
+    GuardrailResult,
 )
 from .input_validation import (
     ResourceExhaustionError,
@@ -26,11 +32,33 @@ from .input_validation import (
     validate_input_content,
     validate_system_resources,
 )
+from .normalization import normalized
+from .offload import DEFAULT_OFFLOAD_MIN_LENGTH, GuardrailOffloader
 from .preset_configs import PresetConfigs
 from .rate_limiter import get_global_rate_limiter
+from .scheduler import GuardrailScheduler
+from .streaming import DEFAULT_STREAM_OVERLAP, OutputStream
+
+if TYPE_CHECKING:
+    from ..guardrails.fused_ai_analysis import FusedAIAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Supported values for the per-pipeline ``execution`` setting
+EXECUTION_MODES = ("sequential", "parallel")
+
+# Default number of batch items whose AI guardrails may run at the same time
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+def _has_running_loop() -> bool:
+    """Whether the current thread is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
 
 class PipelineResult(TypedDict):
     """Type definition for guardrail check results."""
@@ -41,6 +69,7 @@ class PipelineResult(TypedDict):
     details: Dict[str, Any]
     pipeline_type: str
     conversation_id: Optional[str]
+    processing_time_ms: float
 
 
 class PipelineStatus(TypedDict):
@@ -52,6 +81,82 @@ class PipelineStatus(TypedDict):
     total_disabled: int
 
 
+@dataclass
+class _GuardrailOutcome:
+    """Outcome of running a single guardrail: a result, the error it raised, or a skip."""
+
+    guardrail: GuardrailInterface
+    result: Optional[GuardrailResult] = None
+    error: Optional[Exception] = None
+    skipped: bool = False
+    skip_reason: Optional[str] = None
+    duration_ms: float = 0.0
+    cpu_ms: float = 0.0
+    cached: bool = False
+    timed_out: bool = False
+
+    @property
+    def blocked(self) -> bool:
+        """Whether this outcome blocks the content."""
+        return self.result is not None and self.result.blocked
+
+    @property
+    def timing(self) -> Dict[str, Any]:
+        """Wall and CPU time spent in the guardrail, in milliseconds."""
+        timing: Dict[str, Any] = {
+            "wall_ms": round(self.duration_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+        }
+        if self.cached:
+            timing["cached"] = True
+        return timing
+
+
+class _CpuTimedCoroutine:
+    """
+    Awaitable that runs a coroutine and adds up the CPU time of its own steps.
+
+    Time the coroutine spends suspended (waiting for an AI call, or while other
+    guardrails run on the event loop) is not counted, so concurrently running
+    guardrails are each charged only for their own work.
+    """
+
+    def __init__(self, coro: Any):
+        self._coro = coro
+        self.cpu_ms = 0.0
+
+    def __await__(self):
+        coro = self._coro
+        value, error = None, None
+        while True:
+            start = time.thread_time()
+            try:
+                if error is None:
+                    yielded = coro.send(value)
+                else:
+                    yielded = coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.cpu_ms += (time.thread_time() - start) * 1000
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class _OffloadedAnalysis:
+    """Awaitable running a guardrail in the offload pool; ``cpu_ms`` is the worker's CPU time."""
+
+    def __init__(self, offloader: GuardrailOffloader, guardrail: GuardrailInterface, content: str):
+        self._run = offloader.run(guardrail, content)
+        self.cpu_ms = 0.0
+
+    def __await__(self):
+        result, self.cpu_ms = yield from self._run.__await__()
+        return result
+
+
 class GuardrailPipeline:
     """
     High-level API for using guardrails with a simple, synchronous interface.
@@ -131,6 +236,38 @@ class GuardrailPipeline:
             # Build pipelines
             self.input_pipeline = self._build_pipeline("input")
             self.output_pipeline = self._build_pipeline("output")
+            self.execution_modes = {
+                "input": self._get_execution_mode("input"),
+                "output": self._get_execution_mode("output"),
+            }
+            self.schedulers = {
+                pipeline_type: GuardrailScheduler(
+                    order=self._get_pipeline_setting(pipeline_type, "order", "config")
+                )
+                for pipeline_type in ("input", "output")
+            }
+            self.stop_on_first_block = {
+                pipeline_type: bool(
+                    self._get_pipeline_setting(pipeline_type, "stop_on_first_block", False)
+                )
+                for pipeline_type in ("input", "output")
+            }
+            self.ai_fusion = {
+                pipeline_type: bool(self._get_pipeline_setting(pipeline_type, "ai_fusion", False))
+                for pipeline_type in ("input", "output")
+            }
+            # Sync calls on local-only pipelines skip asyncio unless a guardrail needs a loop
+            self._sync_fast_path = {"input": True, "output": True}
+            self.stream_overlap = int(
+                self.config.get("pipeline", {}).get("stream_overlap", DEFAULT_STREAM_OVERLAP)
+            )
+            self.decision_cache = self._create_decision_cache()
+            self._config_hash = self._compute_config_hash()
+            self.offloader = self._create_offloader()
+            self._validate_escalations()
+            self.escalation_stats = {"input": EscalationStats(), "output": EscalationStats()}
+            # Shadow checks run detached from the checks they shadow
+            self._shadow_tasks: Set["asyncio.Task[None]"] = set()
 
             self.global_rate_limiter = get_global_rate_limiter()
 
@@ -254,12 +391,226 @@ class GuardrailPipeline:
 
         return pipeline
 
+    def _get_pipeline_setting(self, pipeline_type: str, key: str, default: Any) -> Any:
+        """
+        Read a pipeline-level setting for one pipeline type.
+
+        Settings live next to the ``input``/``output`` lists and may either apply to
+        both pipelines (``execution: parallel``) or be given per pipeline type
+        (``execution: {input: parallel, output: sequential}``).
+
+        Args:
+            pipeline_type: Type of pipeline ('input' or 'output')
+            key: Setting name
+            default: Value used when the setting is absent
+
+        Returns:
+            The configured value for this pipeline type, or the default
+        """
+        value = self.config.get("pipeline", {}).get(key, default)
+        if isinstance(value, dict):
+            return value.get(pipeline_type, default)
+        return value
+
+    def _create_decision_cache(self) -> Optional[DecisionCache]:
+        """
+        Create the decision cache if enabled by the pipeline's ``cache`` setting.
+
+        The setting is either a boolean or a mapping with ``enabled``, ``max_size``
+        and ``ttl_seconds`` keys. Caching is off by default.
+        """
+        setting = self.config.get("pipeline", {}).get("cache", False)
+        if isinstance(setting, dict):
+            if not setting.get("enabled", True):
+                return None
+            return DecisionCache(
+                max_size=setting.get("max_size", 1000),
+                ttl_seconds=setting.get("ttl_seconds", 300),
+            )
+        return DecisionCache() if setting else None
+
+    def _compute_config_hash(self) -> str:
+        """Hash the pipeline configuration and the current state of its guardrails."""
+        return hash_config(
+            {
+                "pipeline": self.config.get("pipeline", {}),
+                "guardrails": {
+                    pipeline_type: [
+                        [guardrail.name, guardrail.enabled, guardrail.get_config()]
+                        for guardrail in pipeline
+                    ]
+                    for pipeline_type, pipeline in (
+                        ("input", self.input_pipeline),
+                        ("output", self.output_pipeline),
+                    )
+                },
+            }
+        )
+
+    def _config_changed(self) -> None:
+        """Invalidate cached decisions after a guardrail was enabled, disabled or updated."""
+        self._config_hash = self._compute_config_hash()
+        if self.decision_cache is not None:
+            self.decision_cache.clear()
+
+    def _offload_config_changed(
+        self, guardrail: GuardrailInterface, changes: Dict[str, Any]
+    ) -> None:
+        """Keep the offload workers' copies of a guardrail in step with a runtime change."""
+        if self.offloader is not None:
+            self.offloader.update_spec(guardrail, changes)
+
+    def enable_decision_cache(self, max_size: int = 1000, ttl_seconds: float = 300.0) -> None:
+        """
+        Enable (or resize) the decision cache.
+
+        Args:
+            max_size: Maximum number of cached decisions
+            ttl_seconds: Seconds a cached decision stays valid
+        """
+        self.decision_cache = DecisionCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def disable_decision_cache(self) -> None:
+        """Disable the decision cache and drop all cached decisions."""
+        self.decision_cache = None
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get decision cache statistics.
+
+        Returns:
+            Dict with size, hits, misses, evictions and hit_rate, or None if caching is off
+        """
+        if self.decision_cache is None:
+            return None
+        return self.decision_cache.get_stats()
+
+    def _create_offloader(self) -> Optional[GuardrailOffloader]:
+        """
+        Create the offload pool if enabled by the pipeline's ``offload`` setting.
+
+        The setting is ``true`` (thread pool), a backend name ('thread' or 'process')
+        or a mapping with ``backend``, ``max_workers`` and ``min_length`` keys. Off by
+        default.
+        """
+        setting = self.config.get("pipeline", {}).get("offload", False)
+        if not setting:
+            return None
+        if not isinstance(setting, dict):
+            setting = {"backend": setting if isinstance(setting, str) else "thread"}
+        return self._build_offloader(
+            backend=setting.get("backend", "thread"),
+            max_workers=setting.get("max_workers"),
+            min_length=setting.get("min_length", DEFAULT_OFFLOAD_MIN_LENGTH),
+        )
+
+    def _build_offloader(
+        self, backend: str, max_workers: Optional[int], min_length: int
+    ) -> GuardrailOffloader:
+        """Create an offloader and register the guardrail configurations workers need."""
+        offloader = GuardrailOffloader(backend, max_workers=max_workers, min_length=min_length)
+        for pipeline_type, pipeline in (
+            ("input", self.input_pipeline),
+            ("output", self.output_pipeline),
+        ):
+            offloader.register(
+                pipeline_type, pipeline, self.config.get("pipeline", {}).get(pipeline_type, [])
+            )
+        return offloader
+
+    def enable_offload(
+        self,
+        backend: str = "thread",
+        max_workers: Optional[int] = None,
+        min_length: int = DEFAULT_OFFLOAD_MIN_LENGTH,
+    ) -> None:
+        """
+        Run CPU-heavy local guardrails on a thread or process pool in async checks.
+
+        Args:
+            backend: 'thread' or 'process'
+            max_workers: Pool size (defaults to the number of CPUs)
+            min_length: Minimum content length, in characters, that is offloaded
+        """
+        self.disable_offload()
+        self.offloader = self._build_offloader(backend, max_workers, min_length)
+
+    def disable_offload(self) -> None:
+        """Check all guardrails on the event loop thread and stop the offload pool."""
+        offloader, self.offloader = self.offloader, None
+        if offloader is not None:
+            offloader.shutdown(wait=False)
+
+    def _validate_escalations(self) -> None:
+        """
+        Check that every escalation policy names a local guardrail of the same pipeline.
+
+        Raises:
+            ValueError: If a policy's source is missing or is itself an AI guardrail
+        """
+        for pipeline_type, pipeline in (
+            ("input", self.input_pipeline),
+            ("output", self.output_pipeline),
+        ):
+            guardrails = {guardrail.name: guardrail for guardrail in pipeline}
+            for guardrail in pipeline:
+                policy = getattr(guardrail, "escalation", None)
+                if policy is None:
+                    continue
+                source = guardrails.get(policy.source)
+                if source is None:
+                    raise ValueError(
+                        f"Guardrail '{guardrail.name}' escalates from unknown {pipeline_type} "
+                        f"guardrail '{policy.source}'"
+                    )
+                if source.uses_ai:
+                    raise ValueError(
+                        f"Guardrail '{guardrail.name}' must escalate from a local guardrail, "
+                        f"'{policy.source}' uses AI"
+                    )
+
+    def get_escalation_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get tiered escalation statistics per pipeline type and guardrail.
+
+        For each escalating guardrail: how often it was evaluated, escalated to and
+        skipped, and how often shadow checks of skipped requests disagreed with the
+        local decision.
+        """
+        return {
+            pipeline_type: stats.get_stats()
+            for pipeline_type, stats in self.escalation_stats.items()
+        }
+
+    async def wait_for_shadow_checks(self) -> None:
+        """Wait for the shadow checks started on the running event loop to complete."""
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self._shadow_tasks if task.get_loop() is loop]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _get_execution_mode(self, pipeline_type: str) -> str:
+        """
+        Get the execution mode ('sequential' or 'parallel') for a pipeline.
+
+        Raises:
+            ValueError: If the configured execution mode is unknown
+        """
+        mode = self._get_pipeline_setting(pipeline_type, "execution", "sequential")
+        if mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"Invalid execution mode for {pipeline_type} pipeline: {mode}. "
+                f"Must be one of {list(EXECUTION_MODES)}"
+            )
+        return mode
+
     def check_input(
         self,
         content: str,
         conversation: Optional[Conversation] = None,
         api_key: Optional[str] = None,
         role: Optional[str] = None,
+        deadline_ms: Optional[float] = None,
     ) -> PipelineResult:
         """
         Check input content through all input guardrails.
@@ -269,6 +620,8 @@ class GuardrailPipeline:
             conversation: Optional conversation context for multi-turn scenarios
             api_key: Optional API key for global rate limiting
             role: Optional user role for role-based overrides
+            deadline_ms: Optional time budget for the whole check; guardrails still
+                running when it is used up time out and their on_error policy applies
 
         Returns:
             Dict with 'blocked', 'warnings', 'reasons', 'details', and 'conversation_id' keys
@@ -279,6 +632,7 @@ class GuardrailPipeline:
         """
         if content is None:
             raise ValueError("Content cannot be None")
+        deadline = self._deadline_from(deadline_ms)
 
         # Check global rate limits if API key provided
         if api_key:
@@ -291,6 +645,7 @@ class GuardrailPipeline:
                     "details": {"global_rate_limit": global_rate_result},
                     "pipeline_type": "input",
                     "conversation_id": conversation.conversation_id if conversation else None,
+                    "processing_time_ms": 0.0,
                 }
 
             # Record the request
@@ -305,6 +660,7 @@ class GuardrailPipeline:
                 "details": {"rate_limit": "exceeded"},
                 "pipeline_type": "input",
                 "conversation_id": conversation.conversation_id,
+                "processing_time_ms": 0.0,
             }
 
         # Add prompt to conversation if provided
@@ -324,7 +680,7 @@ class GuardrailPipeline:
         )
 
         # Run pipeline and get results
-        result = self._run_pipeline(self.input_pipeline, content, "input", conversation)
+        result = self._run_pipeline(self.input_pipeline, content, "input", conversation, deadline)
 
         # Annotate guardrail results into conversation if provided
         if conversation and conversation.turns:
@@ -338,6 +694,7 @@ class GuardrailPipeline:
         conversation: Optional[Conversation] = None,
         api_key: Optional[str] = None,
         role: Optional[str] = None,
+        deadline_ms: Optional[float] = None,
     ) -> PipelineResult:
         """
         Check output content through all output guardrails.
@@ -347,6 +704,8 @@ class GuardrailPipeline:
             conversation: Optional conversation context for multi-turn scenarios
             api_key: Optional API key for global rate limiting
             role: Optional user role for role-based overrides
+            deadline_ms: Optional time budget for the whole check; guardrails still
+                running when it is used up time out and their on_error policy applies
 
         Returns:
             Dict with 'blocked', 'warnings', 'reasons', 'details', and 'conversation_id' keys
@@ -357,6 +716,7 @@ class GuardrailPipeline:
         """
         if content is None:
             raise ValueError("Content cannot be None")
+        deadline = self._deadline_from(deadline_ms)
 
         # Check global rate limits if API key provided
         if api_key:
@@ -369,6 +729,7 @@ class GuardrailPipeline:
                     "details": {"global_rate_limit": global_rate_result},
                     "pipeline_type": "output",
                     "conversation_id": conversation.conversation_id if conversation else None,
+                    "processing_time_ms": 0.0,
                 }
 
             # Record the request
@@ -383,6 +744,7 @@ class GuardrailPipeline:
                 "details": {"rate_limit": "exceeded"},
                 "pipeline_type": "output",
                 "conversation_id": conversation.conversation_id,
+                "processing_time_ms": 0.0,
             }
 
         # Add response to conversation if provided
@@ -411,7 +773,7 @@ class GuardrailPipeline:
         )
 
         # Run pipeline and get results
-        result = self._run_pipeline(self.output_pipeline, content, "output", conversation)
+        result = self._run_pipeline(self.output_pipeline, content, "output", conversation, deadline)
 
         # Annotate guardrail results into conversation if provided
         if conversation and conversation.turns:
@@ -425,6 +787,7 @@ class GuardrailPipeline:
         conversation: Optional[Conversation] = None,
         api_key: Optional[str] = None,
         role: Optional[str] = None,
+        deadline_ms: Optional[float] = None,
     ) -> PipelineResult:
         """
         Async version of check_input - Check input content through all input guardrails.
@@ -434,6 +797,8 @@ class GuardrailPipeline:
             conversation: Optional conversation context for multi-turn scenarios
             api_key: Optional API key for global rate limiting
             role: Optional user role for role-based overrides
+            deadline_ms: Optional time budget for the whole check; guardrails still
+                running when it is used up time out and their on_error policy applies
 
         Returns:
             Dict with 'blocked', 'warnings', 'reasons', 'details', and 'conversation_id' keys
@@ -444,6 +809,7 @@ class GuardrailPipeline:
         """
         if content is None:
             raise ValueError("Content cannot be None")
+        deadline = self._deadline_from(deadline_ms)
 
         # Validate input content and system resources
         try:
@@ -460,6 +826,7 @@ class GuardrailPipeline:
                 details={"validation_error": safe_msg},
                 pipeline_type="input",
                 conversation_id=conversation.id if conversation else None,
+                processing_time_ms=0.0,
             )
 
         # Check global rate limits if API key provided
@@ -473,6 +840,7 @@ class GuardrailPipeline:
                     "details": {"global_rate_limit": global_rate_result},
                     "pipeline_type": "input",
                     "conversation_id": conversation.conversation_id if conversation else None,
+                    "processing_time_ms": 0.0,
                 }
 
             # Record the request
@@ -487,6 +855,7 @@ class GuardrailPipeline:
                 "details": {"rate_limit": "exceeded"},
                 "pipeline_type": "input",
                 "conversation_id": conversation.conversation_id,
+                "processing_time_ms": 0.0,
             }
 
         # Add prompt to conversation if provided
@@ -506,7 +875,9 @@ class GuardrailPipeline:
         )
 
         # Run pipeline and get results
-        result = await self._run_pipeline_async(self.input_pipeline, content, "input", conversation)
+        result = await self._run_pipeline_async(
+            self.input_pipeline, content, "input", conversation, deadline
+        )
 
         # Annotate guardrail results into conversation if provided
         if conversation and conversation.turns:
@@ -520,6 +891,7 @@ class GuardrailPipeline:
         conversation: Optional[Conversation] = None,
         api_key: Optional[str] = None,
         role: Optional[str] = None,
+        deadline_ms: Optional[float] = None,
     ) -> PipelineResult:
         """
         Async version of check_output - Check output content through all output guardrails.
@@ -529,6 +901,8 @@ class GuardrailPipeline:
             conversation: Optional conversation context for multi-turn scenarios
             api_key: Optional API key for global rate limiting
             role: Optional user role for role-based overrides
+            deadline_ms: Optional time budget for the whole check; guardrails still
+                running when it is used up time out and their on_error policy applies
 
         Returns:
             Dict with 'blocked', 'warnings', 'reasons', 'details', and 'conversation_id' keys
@@ -539,6 +913,7 @@ class GuardrailPipeline:
         """
         if content is None:
             raise ValueError("Content cannot be None")
+        deadline = self._deadline_from(deadline_ms)
 
         # Validate output content and system resources
         try:
@@ -555,6 +930,7 @@ class GuardrailPipeline:
                 details={"validation_error": safe_msg},
                 pipeline_type="output",
                 conversation_id=conversation.id if conversation else None,
+                processing_time_ms=0.0,
             )
 
         # Check global rate limits if API key provided
@@ -568,6 +944,7 @@ class GuardrailPipeline:
                     "details": {"global_rate_limit": global_rate_result},
                     "pipeline_type": "output",
                     "conversation_id": conversation.conversation_id if conversation else None,
+                    "processing_time_ms": 0.0,
                 }
 
             # Record the request
@@ -582,6 +959,7 @@ class GuardrailPipeline:
                 "details": {"rate_limit": "exceeded"},
                 "pipeline_type": "output",
                 "conversation_id": conversation.conversation_id,
+                "processing_time_ms": 0.0,
             }
 
         # Add response to conversation if provided
@@ -611,7 +989,7 @@ class GuardrailPipeline:
 
         # Run pipeline and get results
         result = await self._run_pipeline_async(
-            self.output_pipeline, content, "output", conversation
+            self.output_pipeline, content, "output", conversation, deadline
         )
 
         # Annotate guardrail results into conversation if provided
@@ -620,6 +998,387 @@ class GuardrailPipeline:
 
         return result
 
+    def stream_output(
+        self, conversation: Optional[Conversation] = None, min_chunk_chars: int = 1
+    ) -> OutputStream:
+        """
+        Start checking an output that arrives in chunks, e.g. a streamed LLM response.
+
+        Feed chunks with ``feed()`` / ``feed_async()`` as they arrive and call
+        ``finish()`` / ``finish_async()`` at the end of the stream. Keyword, regex,
+        URL, PII and toxicity guardrails check each chunk (plus the pipeline's
+        ``stream_overlap`` characters of preceding text) and can block mid-stream;
+        the full output pipeline runs on the complete response at ``finish()``.
+
+        Args:
+            conversation: Optional conversation context for the final check
+            min_chunk_chars: Minimum number of new characters between window checks
+
+        Returns:
+            OutputStream for this response
+        """
+        return OutputStream(
+            self,
+            conversation=conversation,
+            overlap=self.stream_overlap,
+            min_chunk_chars=min_chunk_chars,
+        )
+
+    def check_input_batch(
+        self,
+        contents: List[str],
+        api_key: Optional[str] = None,
+        role: Optional[str] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[PipelineResult]:
+        """
+        Check a batch of independent input texts through all input guardrails.
+
+        Local guardrails run over the whole batch in one pass; AI guardrails are
+        called for up to ``max_concurrency`` items at a time. Rate limits and system
+        resources are checked once for the whole batch.
+
+        Args:
+            contents: The input texts to check
+            api_key: Optional API key for global rate limiting
+            role: Optional user role for role-based overrides
+            max_concurrency: Maximum number of items with AI guardrails in flight
+
+        Returns:
+            One result per text, in the same order as ``contents``
+
+        Raises:
+            ValueError: If contents or any item is None, or max_concurrency < 1
+            RuntimeError: If called from an async context
+        """
+        return self._run_batch(
+            self.input_pipeline, contents, "input", api_key, role, max_concurrency
+        )
+
+    def check_output_batch(
+        self,
+        contents: List[str],
+        api_key: Optional[str] = None,
+        role: Optional[str] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[PipelineResult]:
+        """
+        Check a batch of independent output texts through all output guardrails.
+
+        See ``check_input_batch`` for how the batch is executed.
+
+        Args:
+            contents: The output texts to check
+            api_key: Optional API key for global rate limiting
+            role: Optional user role for role-based overrides
+            max_concurrency: Maximum number of items with AI guardrails in flight
+
+        Returns:
+            One result per text, in the same order as ``contents``
+
+        Raises:
+            ValueError: If contents or any item is None, or max_concurrency < 1
+            RuntimeError: If called from an async context
+        """
+        return self._run_batch(
+            self.output_pipeline, contents, "output", api_key, role, max_concurrency
+        )
+
+    async def check_input_batch_async(
+        self,
+        contents: List[str],
+        api_key: Optional[str] = None,
+        role: Optional[str] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[PipelineResult]:
+        """
+        Async version of check_input_batch.
+
+        Args:
+            contents: The input texts to check
+            api_key: Optional API key for global rate limiting
+            role: Optional user role for role-based overrides
+            max_concurrency: Maximum number of items with AI guardrails in flight
+
+        Returns:
+            One result per text, in the same order as ``contents``
+
+        Raises:
+            ValueError: If contents or any item is None, or max_concurrency < 1
+        """
+        results, pending = self._prepare_batch(contents, "input", api_key, role, max_concurrency)
+        if pending:
+            checked = await self._execute_batch(
+                self.input_pipeline, [contents[i] for i in pending], "input", max_concurrency
+            )
+            for index, result in zip(pending, checked):
+                results[index] = result
+        return results
+
+    async def check_output_batch_async(
+        self,
+        contents: List[str],
+        api_key: Optional[str] = None,
+        role: Optional[str] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[PipelineResult]:
+        """
+        Async version of check_output_batch.
+
+        Args:
+            contents: The output texts to check
+            api_key: Optional API key for global rate limiting
+            role: Optional user role for role-based overrides
+            max_concurrency: Maximum number of items with AI guardrails in flight
+
+        Returns:
+            One result per text, in the same order as ``contents``
+
+        Raises:
+            ValueError: If contents or any item is None, or max_concurrency < 1
+        """
+        results, pending = self._prepare_batch(contents, "output", api_key, role, max_concurrency)
+        if pending:
+            checked = await self._execute_batch(
+                self.output_pipeline, [contents[i] for i in pending], "output", max_concurrency
+            )
+            for index, result in zip(pending, checked):
+                results[index] = result
+        return results
+
+    def _prepare_batch(
+        self,
+        contents: List[str],
+        pipeline_type: str,
+        api_key: Optional[str],
+        role: Optional[str],
+        max_concurrency: int,
+    ) -> Tuple[List[Optional[PipelineResult]], List[int]]:
+        """
+        Apply the per-call checks to a batch before any guardrail runs.
+
+        Rate limits and system resources are checked once for the whole batch,
+        content validation and audit logging happen per item.
+
+        Returns:
+            Results list with rejected items filled in, and indices of items to check
+
+        Raises:
+            ValueError: If contents or any item is None, or max_concurrency < 1
+        """
+        if contents is None:
+            raise ValueError("Contents cannot be None")
+        if any(content is None for content in contents):
+            raise ValueError("Content cannot be None")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        results: List[Optional[PipelineResult]] = [None] * len(contents)
+        if not contents:
+            return results, []
+
+        # Check global rate limits once for the whole batch
+        if api_key:
+            global_rate_result = self.global_rate_limiter.check_rate_limit(api_key, role=role)
+            if global_rate_result["exceeded"]:
+                for index in range(len(contents)):
+                    results[index] = {
+                        "blocked": True,
+                        "warnings": [],
+                        "reasons": [f"Global rate limit exceeded for API key {api_key}"],
+                        "details": {"global_rate_limit": global_rate_result},
+                        "pipeline_type": pipeline_type,
+                        "conversation_id": None,
+                        "processing_time_ms": 0.0,
+                    }
+                return results, []
+
+            # Record the batch as a single request
+            self.global_rate_limiter.record_request(api_key)
+
+        from .error_handling import safe_error_message
+
+        try:
+            validate_system_resources()
+        except ResourceExhaustionError as e:
+            safe_msg = safe_error_message(e, f"{pipeline_type} validation")
+            for index in range(len(contents)):
+                results[index] = PipelineResult(
+                    blocked=True,
+                    warnings=[safe_msg],
+                    reasons=[safe_msg],
+                    details={"validation_error": safe_msg},
+                    pipeline_type=pipeline_type,
+                    conversation_id=None,
+                    processing_time_ms=0.0,
+                )
+            return results, []
+
+        log_content = audit.log_prompt if pipeline_type == "input" else audit.log_response
+        pending: List[int] = []
+        for index, content in enumerate(contents):
+            try:
+                validate_input_content(content, pipeline_type)
+            except ValidationError as e:
+                safe_msg = safe_error_message(e, f"{pipeline_type} validation")
+                results[index] = PipelineResult(
+                    blocked=True,
+                    warnings=[safe_msg],
+                    reasons=[safe_msg],
+                    details={"validation_error": safe_msg},
+                    pipeline_type=pipeline_type,
+                    conversation_id=None,
+                    processing_time_ms=0.0,
+                )
+                continue
+
+            log_content(content, user_id="", conversation_id="", request_id="")
+            pending.append(index)
+
+        return results, pending
+
+    def _run_batch(
+        self,
+        pipeline: List[GuardrailInterface],
+        contents: List[str],
+        pipeline_type: str,
+        api_key: Optional[str],
+        role: Optional[str],
+        max_concurrency: int,
+    ) -> List[PipelineResult]:
+        """Sync wrapper for batch execution, mirroring ``_run_pipeline``."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                f"Cannot call {pipeline_type} batch sync method from async context. "
+                f"Use check_{pipeline_type}_batch_async() instead."
+            )
+
+        results, pending = self._prepare_batch(
+            contents, pipeline_type, api_key, role, max_concurrency
+        )
+        if not pending:
+            return results
+
+        items = [contents[i] for i in pending]
+        checked = None
+        if self._sync_fast_path.get(pipeline_type) and not any(g.uses_ai for g in pipeline):
+            try:
+                checked = run_coroutine_sync(
+                    self._execute_batch(pipeline, items, pipeline_type, max_concurrency)
+                )
+            except CoroutineSuspendedError:
+                logger.debug(
+                    f"{pipeline_type} pipeline requires an event loop, disabling sync fast path"
+                )
+                self._sync_fast_path[pipeline_type] = False
+
+        if checked is None:
+            checked = get_background_loop().run(
+                self._execute_batch(pipeline, items, pipeline_type, max_concurrency)
+            )
+
+        for index, result in zip(pending, checked):
+            results[index] = result
+        return results
+
+    async def _execute_batch(
+        self,
+        pipeline: List[GuardrailInterface],
+        contents: List[str],
+        pipeline_type: str,
+        max_concurrency: int,
+    ) -> List[PipelineResult]:
+        """
+        Run a pipeline over a batch of texts.
+
+        Local guardrails run first, one guardrail at a time over every item. AI
+        guardrails then run per item, with at most ``max_concurrency`` items in
+        flight; within an item they follow the pipeline's execution mode. With
+        ``stop_on_first_block`` an item stops being checked once it is blocked.
+        Items found in the decision cache are not run again.
+
+        Args:
+            pipeline: Guardrails in configuration order
+            contents: Texts to check
+            pipeline_type: Type of pipeline for logging
+            max_concurrency: Maximum number of items with AI guardrails in flight
+
+        Returns:
+            One result per text, in order
+        """
+        stop_on_first_block = self.stop_on_first_block[pipeline_type]
+        stages = self.schedulers[pipeline_type].plan(
+            pipeline, parallel=self.execution_modes.get(pipeline_type) == "parallel"
+        )
+        local_order = [i for stage in stages for i in stage if not pipeline[i].uses_ai]
+        remote_stages = [
+            remote
+            for remote in ([i for i in stage if pipeline[i].uses_ai] for stage in stages)
+            if remote
+        ]
+
+        contents = [normalized(content) for content in contents]
+        outcomes: List[Dict[int, _GuardrailOutcome]] = []
+        cache_keys: List[Optional[str]] = []
+        pending: List[int] = []
+        for item, content in enumerate(contents):
+            cached, cache_key = self._lookup_decision(pipeline, content, pipeline_type)
+            outcomes.append(cached if cached is not None else {})
+            cache_keys.append(cache_key)
+            if cached is None:
+                pending.append(item)
+
+        def is_blocked(item: int) -> bool:
+            return stop_on_first_block and any(o.blocked for o in outcomes[item].values())
+
+        decisions: List[Tuple[str, bool]] = []
+        shadows: List[Tuple[int, str, Dict[int, _GuardrailOutcome]]] = []
+        for index in local_order:
+            guardrail = pipeline[index]
+            for item in pending:
+                if is_blocked(item):
+                    continue
+                stage, shadow = self._gate_escalations(pipeline, [index], outcomes[item], decisions)
+                if stage:
+                    outcomes[item][index] = await self._execute_guardrail(guardrail, contents[item])
+                shadows.extend((i, contents[item], outcomes[item]) for i in shadow)
+
+        if remote_stages:
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def run_remote(item: int) -> None:
+                async with semaphore:
+                    fusion = self._plan_fusion(pipeline, pipeline_type, contents[item])
+                    for stage in remote_stages:
+                        if is_blocked(item):
+                            break
+                        stage, shadow = self._gate_escalations(
+                            pipeline, stage, outcomes[item], decisions
+                        )
+                        if stage:
+                            outcomes[item].update(
+                                await self._run_stage(
+                                    pipeline,
+                                    stage,
+                                    contents[item],
+                                    stop_on_first_block,
+                                    fusion=fusion,
+                                )
+                            )
+                        shadows.extend((i, contents[item], outcomes[item]) for i in shadow)
+
+            await asyncio.gather(*(run_remote(item) for item in pending))
+
+        self._finish_escalations(pipeline, pipeline_type, decisions, shadows)
+        return [
+            self._finish_pipeline(pipeline, item_outcomes, pipeline_type, cache_key=cache_key)
+            for item_outcomes, cache_key in zip(outcomes, cache_keys)
+        ]
+
     def _annotate_guardrail_results(self, turn: Turn, result: PipelineResult) -> None:
         """
         Annotate guardrail results into turn metadata.
@@ -653,22 +1412,22 @@ class GuardrailPipeline:
         content: str,
         pipeline_type: str,
         conversation: Optional[Conversation] = None,
+        deadline: Optional[float] = None,
     ) -> PipelineResult:
         """
         Sync wrapper for pipeline execution.
 
-        This method provides a synchronous interface to the async pipeline execution.
-        It handles the async/sync boundary safely without creating thread safety issues.
+        Pipelines made only of local guardrails are run directly in the calling
+        thread without touching asyncio. Other pipelines are submitted to a
+        long-lived background event loop, so no event loop (or connection pool
+        bound to it) is created per call.
         """
         try:
             # Check if we're already in an async context
             asyncio.get_running_loop()
         except RuntimeError:
-            # No running loop, safe to create a new event loop
-            # This is the normal case for sync calls
-            return asyncio.run(
-                self._run_pipeline_async(pipeline, content, pipeline_type, conversation)
-            )
+            # No running loop - the normal case for sync calls
+            pass
         else:
             # We're in an async context, but this is a sync method
             # This indicates incorrect usage - the caller should use the async version
@@ -677,21 +1436,96 @@ class GuardrailPipeline:
                 f"Use check_{pipeline_type}_async() instead."
             )
 
+        if self._sync_fast_path.get(pipeline_type) and not any(g.uses_ai for g in pipeline):
+            try:
+                return self._run_pipeline_local(
+                    pipeline, content, pipeline_type, conversation, deadline
+                )
+            except CoroutineSuspendedError:
+                # A guardrail needs a real event loop; stop trying the fast path for it
+                logger.debug(
+                    f"{pipeline_type} pipeline requires an event loop, disabling sync fast path"
+                )
+                self._sync_fast_path[pipeline_type] = False
+
+        return get_background_loop().run(
+            self._run_pipeline_async(pipeline, content, pipeline_type, conversation, deadline)
+        )
+
+    def _run_pipeline_local(
+        self,
+        pipeline: List[GuardrailInterface],
+        content: str,
+        pipeline_type: str,
+        conversation: Optional[Conversation] = None,
+        deadline: Optional[float] = None,
+    ) -> PipelineResult:
+        """
+        Run a pipeline of local guardrails synchronously, without an event loop.
+
+        Guardrails run one at a time in scheduled order; the result is the same as
+        ``_run_pipeline_async`` would produce.
+
+        Raises:
+            CoroutineSuspendedError: If a guardrail needs a running event loop
+        """
+        started = time.perf_counter()
+        if conversation:
+            logger.info(
+                f"Processing {pipeline_type} for conversation {conversation.conversation_id} (turn {conversation.get_turn_count()})"
+            )
+
+        cached, cache_key = self._lookup_decision(pipeline, content, pipeline_type, conversation)
+        if cached is not None:
+            return self._finish_pipeline(
+                pipeline, cached, pipeline_type, conversation, started=started
+            )
+
+        # Normalized views of the content are computed once and shared by all guardrails
+        content = normalized(content)
+        stop_on_first_block = self.stop_on_first_block[pipeline_type]
+        outcomes: Dict[int, _GuardrailOutcome] = {}
+        decisions: List[Tuple[str, bool]] = []
+        shadow: List[int] = []
+        for stage in self.schedulers[pipeline_type].plan(pipeline):
+            if stop_on_first_block and any(o.blocked for o in outcomes.values()):
+                break
+            stage, stage_shadow = self._gate_escalations(pipeline, stage, outcomes, decisions)
+            for index in stage:
+                outcomes[index] = self._execute_guardrail_sync(pipeline[index], content, deadline)
+            shadow.extend(stage_shadow)
+
+        result = self._finish_pipeline(
+            pipeline, outcomes, pipeline_type, conversation, cache_key, started
+        )
+        self._finish_escalations(
+            pipeline, pipeline_type, decisions, [(i, content, outcomes) for i in shadow]
+        )
+        return result
+
     async def _run_pipeline_async(
         self,
         pipeline: List[GuardrailInterface],
         content: str,
         pipeline_type: str,
         conversation: Optional[Conversation] = None,
+        deadline: Optional[float] = None,
     ) -> PipelineResult:
         """
         Run content through a pipeline of guardrails.
 
+        Guardrails run one after another by default. When the pipeline's
+        ``execution`` setting is ``parallel`` they run concurrently; with
+        ``order: cost`` local guardrails run before AI guardrails, and with
+        ``stop_on_first_block`` the remaining guardrails are skipped (or cancelled
+        if in flight) once one blocks. The result is assembled in pipeline order.
+
         Args:
             pipeline: List of guardrail instances
             content: Content to check
             pipeline_type: Type of pipeline for logging
             conversation: Optional conversation context
+            deadline: Optional ``time.monotonic()`` value by which all guardrails must finish
 
         Returns:
             Standardized result dictionary
@@ -699,10 +1533,7 @@ class GuardrailPipeline:
         Raises:
             RuntimeError: If pipeline execution fails catastrophically
         """
-        blocked = False
-        warnings: List[str] = []
-        reasons: List[str] = []
-        details: Dict[str, Any] = {}
+        started = time.perf_counter()
         conversation_id = conversation.conversation_id if conversation else None
 
         # Log conversation context if available
@@ -711,87 +1542,661 @@ class GuardrailPipeline:
                 f"Processing {pipeline_type} for conversation {conversation_id} (turn {conversation.get_turn_count()})"
             )
 
-        for guardrail in pipeline:
-            try:
-                # Run the async analyze method properly
-                result = await guardrail.analyze(content)
+        cached, cache_key = self._lookup_decision(pipeline, content, pipeline_type, conversation)
+        if cached is not None:
+            return self._finish_pipeline(
+                pipeline, cached, pipeline_type, conversation, started=started
+            )
 
-                if result.blocked:
-                    blocked = True
-                    reasons.append(f"{guardrail.name}: {result.reason}")
+        # Normalized views of the content are computed once and shared by all guardrails
+        content = normalized(content)
+        scheduler = self.schedulers[pipeline_type]
+        stop_on_first_block = self.stop_on_first_block[pipeline_type]
+        stages = scheduler.plan(
+            pipeline, parallel=self.execution_modes.get(pipeline_type) == "parallel"
+        )
 
-                # Check if this should be a warning - only if the original action was 'warn'
-                original_action = result.details.get("action", "")
-                if original_action == "warn":
-                    warnings.append(f"{guardrail.name}: {result.reason}")
+        fusion = self._plan_fusion(pipeline, pipeline_type, content)
+
+        outcomes: Dict[int, _GuardrailOutcome] = {}
+        decisions: List[Tuple[str, bool]] = []
+        shadow: List[int] = []
+        for stage in stages:
+            if stop_on_first_block and any(o.blocked for o in outcomes.values()):
+                break
+            stage, stage_shadow = self._gate_escalations(pipeline, stage, outcomes, decisions)
+            if stage:
+                outcomes.update(
+                    await self._run_stage(
+                        pipeline, stage, content, stop_on_first_block, deadline, fusion
+                    )
+                )
+            shadow.extend(stage_shadow)
 
-                # Store detailed results
-                details[guardrail.name] = {
-                    "blocked": result.blocked,
-                    "confidence": result.confidence,
-                    "reason": result.reason,
-                    "details": result.details,
-                }
+        self._finish_escalations(
+            pipeline, pipeline_type, decisions, [(i, content, outcomes) for i in shadow]
+        )
+        return self._finish_pipeline(
+            pipeline, outcomes, pipeline_type, conversation, cache_key, started
+        )
 
-                # Log guardrail decision to audit trail
-                request_id = (
-                    getattr(conversation, "current_request_id", None) if conversation else None
-                )
-                user_id = getattr(conversation, "initiator", None) if conversation else None
-
-                # Determine decision type for audit based on original action
-                original_action = result.details.get("action", "")
-                if result.blocked:
-                    decision = "block"
-                elif original_action == "warn":
-                    decision = "warn"
-                else:
-                    decision = "allow"
+    def _finish_pipeline(
+        self,
+        pipeline: List[GuardrailInterface],
+        outcomes: Dict[int, _GuardrailOutcome],
+        pipeline_type: str,
+        conversation: Optional[Conversation] = None,
+        cache_key: Optional[str] = None,
+        started: Optional[float] = None,
+    ) -> PipelineResult:
+        """
+        Put outcomes back in pipeline order, record costs and assemble the result.
 
-                audit.log_guardrail_decision(
-                    guardrail_name=guardrail.name,
-                    decision=decision,
-                    reason=result.reason,
-                    user_id=user_id or "",
-                    conversation_id=conversation_id or "",
-                    request_id=request_id or "",
-                    confidence=result.confidence,
-                    rule_triggered=getattr(result, "rule_triggered", None) or "",
+        Guardrails without an outcome were never run and are reported as skipped.
+        With a ``cache_key`` the outcomes are stored in the decision cache, unless a
+        guardrail failed or timed out. ``started`` is the ``time.perf_counter()``
+        value at which the check began; without it the processing time is the sum
+        of the guardrail run times.
+        """
+        scheduler = self.schedulers[pipeline_type]
+        ordered: List[_GuardrailOutcome] = []
+        for index, guardrail in enumerate(pipeline):
+            outcome = outcomes.get(index)
+            if outcome is None:
+                outcome = _GuardrailOutcome(guardrail=guardrail, skipped=True)
+            elif not outcome.skipped and not outcome.cached:
+                scheduler.record(guardrail.name, outcome.duration_ms)
+            ordered.append(outcome)
+
+        if cache_key is not None and not any(o.error is not None or o.timed_out for o in ordered):
+            self.decision_cache.put(
+                cache_key,
+                {
+                    index: (copy.deepcopy(outcome.result), outcome.skip_reason)
+                    for index, outcome in outcomes.items()
+                    if outcome.result is not None or outcome.skip_reason is not None
+                },
+            )
+
+        processing_time_ms = None
+        if started is not None:
+            processing_time_ms = (time.perf_counter() - started) * 1000
+        return self._assemble_result(
+            ordered, pipeline_type, conversation, processing_time_ms=processing_time_ms
+        )
+
+    def _lookup_decision(
+        self,
+        pipeline: List[GuardrailInterface],
+        content: str,
+        pipeline_type: str,
+        conversation: Optional[Conversation] = None,
+    ) -> Tuple[Optional[Dict[int, _GuardrailOutcome]], Optional[str]]:
+        """
+        Look up cached guardrail outcomes for content.
+
+        Checks with a conversation bypass the cache when any guardrail in the
+        pipeline uses conversation context, since the same content may then get a
+        different decision.
+
+        Returns:
+            Cached outcomes (or None on a miss) and the key to store new outcomes
+            under (None if the cache does not apply)
+        """
+        if self.decision_cache is None:
+            return None, None
+        if conversation is not None and any(g.uses_conversation for g in pipeline):
+            return None, None
+
+        cache_key = make_cache_key(self._config_hash, pipeline_type, content)
+        results = self.decision_cache.get(cache_key)
+        if results is None:
+            return None, cache_key
+
+        logger.debug(f"Decision cache hit for {pipeline_type} pipeline")
+        outcomes = {
+            index: _GuardrailOutcome(
+                guardrail=pipeline[index],
+                result=copy.deepcopy(result),
+                skipped=result is None,
+                skip_reason=skip_reason,
+                cached=True,
+            )
+            for index, (result, skip_reason) in results.items()
+        }
+        return outcomes, None
+
+    def _gate_escalations(
+        self,
+        pipeline: List[GuardrailInterface],
+        stage: List[int],
+        outcomes: Dict[int, _GuardrailOutcome],
+        decisions: List[Tuple[str, bool]],
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Decide which escalating guardrails of a stage are consulted.
+
+        A guardrail with an escalation policy runs only when the score of its source
+        guardrail falls inside the gray zone, or when the source has no usable score
+        (error or timeout). Guardrails that are not escalated get a skipped outcome,
+        which is added to ``outcomes``. Each decision is appended to ``decisions``
+        as (guardrail name, escalated), to be recorded once the check completes.
+
+        Returns:
+            Indices to run, and indices of non-escalated guardrails sampled for a
+            shadow check
+        """
+        run: List[int] = []
+        shadow: List[int] = []
+        for index in stage:
+            guardrail = pipeline[index]
+            policy: Optional[EscalationPolicy] = getattr(guardrail, "escalation", None)
+            if policy is None:
+                run.append(index)
+                continue
+
+            source = self._escalation_source(pipeline, policy, outcomes)
+            if source is None or source.result is None or source.timed_out:
+                decision = ESCALATE
+            else:
+                score = source.result.confidence
+                decision = policy.decide(score)
+
+            decisions.append((guardrail.name, decision == ESCALATE))
+            if decision == ESCALATE:
+                run.append(index)
+                continue
+
+            side = "below" if decision == BELOW else "above"
+            outcomes[index] = _GuardrailOutcome(
+                guardrail=guardrail,
+                skipped=True,
+                skip_reason=(
+                    f"Not escalated: {policy.source} score {score:.2f} is {side} "
+                    f"gray zone [{policy.low}, {policy.high})"
+                ),
+            )
+            if policy.sample_shadow():
+                shadow.append(index)
+        return run, shadow
+
+    @staticmethod
+    def _escalation_source(
+        pipeline: List[GuardrailInterface],
+        policy: EscalationPolicy,
+        outcomes: Dict[int, _GuardrailOutcome],
+    ) -> Optional[_GuardrailOutcome]:
+        """Get the outcome of the guardrail an escalation policy depends on."""
+        for index, outcome in outcomes.items():
+            if pipeline[index].name == policy.source:
+                return outcome
+        return None
+
+    def _finish_escalations(
+        self,
+        pipeline: List[GuardrailInterface],
+        pipeline_type: str,
+        decisions: List[Tuple[str, bool]],
+        shadows: List[Tuple[int, str, Dict[int, _GuardrailOutcome]]],
+    ) -> None:
+        """
+        Record the escalation decisions of a completed check and start its shadow checks.
+
+        Only called once the check has run to completion, so a sync check that is
+        run again on the event loop after a guardrail suspended is counted once.
+
+        Args:
+            pipeline: Guardrails of the check
+            pipeline_type: Type of pipeline the check ran
+            decisions: (guardrail name, escalated) per escalation decision
+            shadows: (index, content, outcomes of its item) per sampled shadow check
+        """
+        stats = self.escalation_stats[pipeline_type]
+        for guardrail_name, escalated in decisions:
+            stats.record_decision(guardrail_name, escalated)
+        for index, content, outcomes in shadows:
+            self._start_shadow_check(pipeline, index, content, outcomes, pipeline_type)
+
+    def _start_shadow_check(
+        self,
+        pipeline: List[GuardrailInterface],
+        index: int,
+        content: str,
+        outcomes: Dict[int, _GuardrailOutcome],
+        pipeline_type: str,
+    ) -> None:
+        """
+        Run a non-escalated guardrail for comparison only; its result is discarded.
+
+        Within an event loop the shadow check runs as a detached task, so it never
+        delays the check it shadows; it is bounded by the guardrail's own
+        ``timeout_ms``. Without a loop (local guardrails) it runs inline.
+        """
+        if _has_running_loop():
+            task = asyncio.get_running_loop().create_task(
+                self._shadow_check(pipeline, index, content, outcomes, pipeline_type)
+            )
+            # Keep the task referenced until it completes
+            self._shadow_tasks.add(task)
+            task.add_done_callback(self._shadow_tasks.discard)
+            return
+
+        try:
+            outcome = self._execute_guardrail_sync(pipeline[index], content)
+        except CoroutineSuspendedError:
+            logger.debug(f"Shadow check of {pipeline[index].name} requires an event loop, skipped")
+            return
+        self._record_shadow(pipeline, outcome, outcomes, pipeline_type)
+
+    async def _shadow_check(
+        self,
+        pipeline: List[GuardrailInterface],
+        index: int,
+        content: str,
+        outcomes: Dict[int, _GuardrailOutcome],
+        pipeline_type: str,
+    ) -> None:
+        outcome = await self._execute_guardrail(pipeline[index], content)
+        self._record_shadow(pipeline, outcome, outcomes, pipeline_type)
+
+    def _record_shadow(
+        self,
+        pipeline: List[GuardrailInterface],
+        shadow: _GuardrailOutcome,
+        outcomes: Dict[int, _GuardrailOutcome],
+        pipeline_type: str,
+    ) -> None:
+        """Count whether a shadow check disagreed with the local guardrail's decision."""
+        if shadow.result is None or shadow.timed_out:
+            return
+        source = self._escalation_source(pipeline, shadow.guardrail.escalation, outcomes)
+        diverged = shadow.blocked != (source is not None and source.blocked)
+        if diverged:
+            logger.info(
+                f"Shadow check of {shadow.guardrail.name} disagrees with "
+                f"{shadow.guardrail.escalation.source}: blocked={shadow.blocked}"
+            )
+        self.escalation_stats[pipeline_type].record_shadow(shadow.guardrail.name, diverged)
+
+    def _plan_fusion(
+        self, pipeline: List[GuardrailInterface], pipeline_type: str, content: str
+    ) -> Optional["FusedAIAnalysis"]:
+        """Plan the fused AI calls of a check, if the pipeline has AI fusion enabled."""
+        if not self.ai_fusion[pipeline_type]:
+            return None
+        # Imported here: the fused analysis is built on the AI guardrails, which import core
+        from ..guardrails.fused_ai_analysis import FusedAIAnalysis
+
+        return FusedAIAnalysis.plan(pipeline, content)
+
+    async def _run_stage(
+        self,
+        pipeline: List[GuardrailInterface],
+        stage: List[int],
+        content: str,
+        stop_on_first_block: bool = False,
+        deadline: Optional[float] = None,
+        fusion: Optional["FusedAIAnalysis"] = None,
+    ) -> Dict[int, _GuardrailOutcome]:
+        """
+        Run one execution stage, concurrently when it holds several guardrails.
+
+        With ``stop_on_first_block`` the remaining in-flight guardrails of the stage
+        are cancelled as soon as one of them blocks; they are left out of the returned
+        outcomes and reported as skipped.
+
+        Args:
+            pipeline: Guardrails in configuration order
+            stage: Indices of the guardrails to run
+            content: Content to check
+            stop_on_first_block: Whether to cancel the stage once a guardrail blocks
+            deadline: Optional ``time.monotonic()`` value by which the stage must finish
+            fusion: Fused AI calls of the check, if AI fusion is enabled
+
+        Returns:
+            Outcomes keyed by guardrail index
+        """
+        if len(stage) == 1:
+            index = stage[0]
+            return {
+                index: await self._execute_guardrail(pipeline[index], content, deadline, fusion)
+            }
+
+        if not stop_on_first_block:
+            # Guardrails are independent, so run them concurrently and keep config order
+            results = await asyncio.gather(
+                *(
+                    self._execute_guardrail(pipeline[index], content, deadline, fusion)
+                    for index in stage
                 )
+            )
+            return dict(zip(stage, results))
 
-                # Log with conversation context if available
-                if conversation:
-                    logger.debug(
-                        f"Guardrail {guardrail.name} result for conversation {conversation_id}: blocked={result.blocked}, confidence={result.confidence}"
-                    )
-                else:
-                    logger.debug(
-                        f"Guardrail {guardrail.name} result: blocked={result.blocked}, confidence={result.confidence}"
+        tasks = {
+            asyncio.ensure_future(
+                self._execute_guardrail(pipeline[index], content, deadline, fusion)
+            ): index
+            for index in stage
+        }
+        outcomes: Dict[int, _GuardrailOutcome] = {}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    outcomes[tasks[task]] = task.result()
+                if any(outcomes[tasks[task]].blocked for task in done):
+                    break
+        finally:
+            # Cancel in-flight guardrails (e.g. AI calls) once the block decision is final
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        return outcomes
+
+    async def _execute_guardrail(
+        self,
+        guardrail: GuardrailInterface,
+        content: str,
+        deadline: Optional[float] = None,
+        fusion: Optional["FusedAIAnalysis"] = None,
+    ) -> _GuardrailOutcome:
+        """
+        Run a single guardrail and capture its result or error.
+
+        The guardrail gets its own ``timeout_ms``, cut short by the request deadline
+        if less time is left. On timeout its ``on_error`` policy decides the result.
+
+        Args:
+            guardrail: Guardrail instance to run
+            content: Content to check
+            deadline: Optional ``time.monotonic()`` value by which it must finish
+            fusion: Fused AI calls of the check; covered guardrails take their result from them
+
+        Returns:
+            Outcome holding either the guardrail result or the raised exception
+        """
+        start = time.perf_counter()
+        timeout = self._guardrail_timeout(guardrail, deadline)
+        if timeout is not None and timeout <= 0:
+            return self._timeout_outcome(guardrail, 0.0, 0.0)
+
+        in_loop = _has_running_loop()
+        if fusion is not None and fusion.covers(guardrail):
+            analysis = _CpuTimedCoroutine(fusion.analyze(guardrail))
+        elif (
+            in_loop
+            and self.offloader is not None
+            and self.offloader.should_offload(guardrail, content)
+        ):
+            analysis = _OffloadedAnalysis(self.offloader, guardrail, content)
+        else:
+            analysis = _CpuTimedCoroutine(guardrail.analyze(content))
+        try:
+            if in_loop and timeout is not None:
+                result = await asyncio.wait_for(analysis, timeout)
+            else:
+                # Driven without an event loop (local guardrails only): nothing to interrupt
+                result = await analysis
+            return _GuardrailOutcome(
+                guardrail=guardrail,
+                result=result,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                cpu_ms=analysis.cpu_ms,
+            )
+        except asyncio.TimeoutError:
+            return self._timeout_outcome(
+                guardrail,
+                timeout * 1000,
+                (time.perf_counter() - start) * 1000,
+                analysis.cpu_ms,
+            )
+        except RuntimeError as e:
+            if not in_loop and "no running event loop" in str(e):
+                raise CoroutineSuspendedError("Guardrail requires a running event loop") from e
+            return _GuardrailOutcome(
+                guardrail=guardrail,
+                error=e,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                cpu_ms=analysis.cpu_ms,
+            )
+        except Exception as e:
+            return _GuardrailOutcome(
+                guardrail=guardrail,
+                error=e,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                cpu_ms=analysis.cpu_ms,
+            )
+
+    def _execute_guardrail_sync(
+        self, guardrail: GuardrailInterface, content: str, deadline: Optional[float] = None
+    ) -> _GuardrailOutcome:
+        """
+        Run a single local guardrail without an event loop.
+
+        Local guardrails cannot be interrupted, so the timeout only stops a
+        guardrail from starting once the request deadline has passed.
+
+        Raises:
+            CoroutineSuspendedError: If the guardrail needs a running event loop
+        """
+        start = time.perf_counter()
+        timeout = self._guardrail_timeout(guardrail, deadline)
+        if timeout is not None and timeout <= 0:
+            return self._timeout_outcome(guardrail, 0.0, 0.0)
+
+        cpu_start = time.thread_time()
+        try:
+            result = run_coroutine_sync(guardrail.analyze(content))
+            return _GuardrailOutcome(
+                guardrail=guardrail,
+                result=result,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                cpu_ms=(time.thread_time() - cpu_start) * 1000,
+            )
+        except CoroutineSuspendedError:
+            raise
+        except Exception as e:
+            return _GuardrailOutcome(
+                guardrail=guardrail,
+                error=e,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                cpu_ms=(time.thread_time() - cpu_start) * 1000,
+            )
+
+    @staticmethod
+    def _deadline_from(deadline_ms: Optional[float]) -> Optional[float]:
+        """Convert a request time budget into an absolute ``time.monotonic()`` deadline."""
+        if deadline_ms is None:
+            return None
+        if deadline_ms <= 0:
+            raise ValueError("deadline_ms must be positive")
+        return time.monotonic() + deadline_ms / 1000
+
+    @staticmethod
+    def _guardrail_timeout(
+        guardrail: GuardrailInterface, deadline: Optional[float]
+    ) -> Optional[float]:
+        """Seconds a guardrail may run: its own timeout, capped by the time left."""
+        timeout_ms = getattr(guardrail, "timeout_ms", None)
+        timeout = timeout_ms / 1000 if timeout_ms else None
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    @staticmethod
+    def _timeout_outcome(
+        guardrail: GuardrailInterface, timeout_ms: float, duration_ms: float, cpu_ms: float = 0.0
+    ) -> _GuardrailOutcome:
+        """Build the outcome of a timed-out guardrail from its on_error policy."""
+        on_error = getattr(guardrail, "on_error", "block")
+        if timeout_ms > 0:
+            reason = f"Timed out after {timeout_ms:.0f} ms"
+        else:
+            reason = "Not run: request deadline exceeded"
+        logger.warning(f"Guardrail {guardrail.name}: {reason} (on_error={on_error})")
+
+        result = GuardrailResult(
+            blocked=on_error == "block",
+            confidence=0.0,
+            reason=reason,
+            details={
+                "error": "timeout",
+                "timeout_ms": timeout_ms,
+                "on_error": on_error,
+                "action": on_error if on_error in ("block", "warn") else "allow",
+            },
+            guardrail_name=guardrail.name,
+            guardrail_type=guardrail.guardrail_type,
+        )
+        return _GuardrailOutcome(
+            guardrail=guardrail,
+            result=result,
+            duration_ms=duration_ms,
+            cpu_ms=cpu_ms,
+            timed_out=True,
+        )
+
+    def _assemble_result(
+        self,
+        outcomes: List[_GuardrailOutcome],
+        pipeline_type: str,
+        conversation: Optional[Conversation] = None,
+        audit_decisions: bool = True,
+        processing_time_ms: Optional[float] = None,
+    ) -> PipelineResult:
+        """
+        Combine guardrail outcomes into a pipeline result and audit each decision.
+
+        Outcomes are processed in the order given, so reasons, warnings, details and
+        audit records are identical regardless of how the guardrails were executed.
+        Each guardrail that ran gets its measured wall and CPU time in
+        ``details[name]["timing"]``.
+
+        Args:
+            outcomes: Guardrail outcomes in pipeline order
+            pipeline_type: Type of pipeline for logging
+            conversation: Optional conversation context
+            audit_decisions: Whether to write guardrail decisions to the audit trail
+            processing_time_ms: Time taken by the whole check (defaults to the sum of
+                the guardrail run times)
+
+        Returns:
+            Standardized result dictionary
+        """
+        blocked = False
+        warnings: List[str] = []
+        reasons: List[str] = []
+        details: Dict[str, Any] = {}
+        conversation_id = conversation.conversation_id if conversation else None
+        request_id = getattr(conversation, "current_request_id", None) if conversation else None
+        user_id = getattr(conversation, "initiator", None) if conversation else None
+
+        for outcome in outcomes:
+            guardrail = outcome.guardrail
+
+            if outcome.skipped:
+                reason = (
+                    outcome.skip_reason or "Skipped: pipeline already blocked by another guardrail"
+                )
+                details[guardrail.name] = {
+                    "blocked": False,
+                    "confidence": 0.0,
+                    "reason": reason,
+                    "skipped": True,
+                }
+                if audit_decisions:
+                    audit.log_guardrail_decision(
+                        guardrail_name=guardrail.name,
+                        decision="skip",
+                        reason=reason,
+                        user_id=user_id or "",
+                        conversation_id=conversation_id or "",
+                        request_id=request_id or "",
+                        confidence=0.0,
                     )
+                continue
 
-            except Exception as e:
+            if outcome.error is not None:
+                e = outcome.error
                 error_msg = f"Error running {guardrail.name} guardrail: {e}"
                 if conversation:
                     error_msg += f" (conversation {conversation_id})"
                 logger.error(error_msg)
 
                 reasons.append(f"{guardrail.name}: Error - {str(e)}")
-                details[guardrail.name] = {"error": str(e), "blocked": False, "confidence": 0.0}
+                details[guardrail.name] = {
+                    "error": str(e),
+                    "blocked": False,
+                    "confidence": 0.0,
+                    "timing": outcome.timing,
+                }
 
                 # Log error decision to audit trail
-                request_id = (
-                    getattr(conversation, "current_request_id", None) if conversation else None
-                )
-                user_id = getattr(conversation, "initiator", None) if conversation else None
+                if audit_decisions:
+                    audit.log_guardrail_decision(
+                        guardrail_name=guardrail.name,
+                        decision="error",
+                        reason=f"Error: {str(e)}",
+                        user_id=user_id or "",
+                        conversation_id=conversation_id or "",
+                        request_id=request_id or "",
+                        confidence=0.0,
+                        processing_time_ms=outcome.duration_ms,
+                    )
+                continue
+
+            result = outcome.result
+
+            if result.blocked:
+                blocked = True
+                reasons.append(f"{guardrail.name}: {result.reason}")
+
+            # Check if this should be a warning - only if the original action was 'warn'
+            original_action = result.details.get("action", "")
+            if original_action == "warn":
+                warnings.append(f"{guardrail.name}: {result.reason}")
+
+            # Store detailed results
+            details[guardrail.name] = {
+                "blocked": result.blocked,
+                "confidence": result.confidence,
+                "reason": result.reason,
+                "details": result.details,
+                "timing": outcome.timing,
+            }
+
+            # Determine decision type for audit based on original action
+            if result.blocked:
+                decision = "block"
+            elif original_action == "warn":
+                decision = "warn"
+            else:
+                decision = "allow"
 
+            if audit_decisions:
                 audit.log_guardrail_decision(
                     guardrail_name=guardrail.name,
-                    decision="error",
-                    reason=f"Error: {str(e)}",
+                    decision=decision,
+                    reason=result.reason,
                     user_id=user_id or "",
                     conversation_id=conversation_id or "",
                     request_id=request_id or "",
-                    confidence=0.0,
+                    confidence=result.confidence,
+                    rule_triggered=getattr(result, "rule_triggered", None) or "",
+                    processing_time_ms=None if outcome.cached else outcome.duration_ms,
+                )
+
+            # Log with conversation context if available
+            if conversation:
+                logger.debug(
+                    f"Guardrail {guardrail.name} result for conversation {conversation_id}: blocked={result.blocked}, confidence={result.confidence}"
+                )
+            else:
+                logger.debug(
+                    f"Guardrail {guardrail.name} result: blocked={result.blocked}, confidence={result.confidence}"
                 )
 
         return {
@@ -801,6 +2206,11 @@ class GuardrailPipeline:
             "details": details,
             "pipeline_type": pipeline_type,
             "conversation_id": conversation_id,
+            "processing_time_ms": (
+                processing_time_ms
+                if processing_time_ms is not None
+                else sum(outcome.duration_ms for outcome in outcomes)
+            ),
         }
 
     def get_guardrail_status(self) -> PipelineStatus:
@@ -864,6 +2274,7 @@ class GuardrailPipeline:
             for guardrail in self.input_pipeline:
                 if guardrail.name == name:
                     guardrail.enable()
+                    self._offload_config_changed(guardrail, {"enabled": True})
                     logger.info(f"Enabled input guardrail: {name}")
                     found = True
                     if pipeline_type == "input":
@@ -873,12 +2284,15 @@ class GuardrailPipeline:
             for guardrail in self.output_pipeline:
                 if guardrail.name == name:
                     guardrail.enable()
+                    self._offload_config_changed(guardrail, {"enabled": True})
                     logger.info(f"Enabled output guardrail: {name}")
                     found = True
                     if pipeline_type == "output":
                         break
 
-        if not found:
+        if found:
+            self._config_changed()
+        else:
             logger.warning(
                 f"Guardrail not found: {name}"
                 + (f" in {pipeline_type} pipeline" if pipeline_type else "")
@@ -902,6 +2316,7 @@ class GuardrailPipeline:
             for guardrail in self.input_pipeline:
                 if guardrail.name == name:
                     guardrail.disable()
+                    self._offload_config_changed(guardrail, {"enabled": False})
                     logger.info(f"Disabled input guardrail: {name}")
                     found = True
                     if pipeline_type == "input":
@@ -911,12 +2326,15 @@ class GuardrailPipeline:
             for guardrail in self.output_pipeline:
                 if guardrail.name == name:
                     guardrail.disable()
+                    self._offload_config_changed(guardrail, {"enabled": False})
                     logger.info(f"Disabled output guardrail: {name}")
                     found = True
                     if pipeline_type == "output":
                         break
 
-        if not found:
+        if found:
+            self._config_changed()
+        else:
             logger.warning(
                 f"Guardrail not found: {name}"
                 + (f" in {pipeline_type} pipeline" if pipeline_type else "")
@@ -954,6 +2372,8 @@ class GuardrailPipeline:
                 success = guardrail.update_config(config)
                 if success:
                     logger.info(f"Updated guardrail config: {name}")
+                    self._offload_config_changed(guardrail, config)
+                    self._config_changed()
                 else:
                     logger.error(f"Failed to update guardrail config: {name}")
                 return success
@@ -0,0 +1,420 @@
+"""
+Regex Matching Engine
+
+Runs the timeout-protected searches behind RegexSecurityValidator.safe_search.
+Searches run on a shared, bounded pool of workers that is reused across searches,
+instead of starting a thread per search.
+
+Two backends are available:
+
+- ``thread``: searches run on a thread pool. Starting a search costs a queue hand-off.
+  ``re`` holds the GIL while it searches, so a search that overruns its deadline
+  cannot be stopped, and the overrun is usually only noticed when the search
+  returns. It is then reported as a timeout, or, if its result is already
+  available, returned and counted as a deadline miss. A search still running after
+  its deadline keeps its worker until it finishes and is counted as overdue. When every worker is overdue, new searches fail immediately
+  instead of queueing behind them.
+- ``process``: searches run in spawned worker processes. A worker that overruns its
+  deadline is killed and replaced, so a runaway search never keeps burning CPU. Each
+  search sends the text to the worker, which costs more per search than ``thread``.
+
+When the optional ``google-re2`` package is installed and linear-time matching is
+enabled, patterns RE2 supports are searched inline with RE2 instead. RE2 runs in
+time linear in the length of the text, so it needs no worker or timeout. It is used
+only for ASCII text, where RE2 and ``re`` agree on character classes and case
+folding. A hit is confirmed with ``re`` at the position RE2 found, so callers always
+get an ``re.Match``.
+
+All backends record search counts, timeouts and deadline usage in shared statistics,
+see get_regex_search_stats().
+"""
+
+import logging
+import multiprocessing
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import re2
+
+    RE2_AVAILABLE = True
+except ImportError:
+    re2 = None
+    RE2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Supported values for the regex execution backend
+REGEX_BACKENDS = ("thread", "process")
+
+DEFAULT_REGEX_WORKERS = 4
+
+# How long a new worker process may take to start; not part of any search deadline
+_WORKER_START_TIMEOUT_S = 30.0
+
+# Python syntax RE2 accepts but reads differently: {,n}, and $, which re also
+# matches before a trailing newline
+_RE2_INCOMPATIBLE = re.compile(r"\{,|\$")
+
+# Text for which RE2 and re agree on \d, \w, \s, \b and case folding: ASCII without
+# the control characters re treats as whitespace and RE2 does not
+_RE2_UNSAFE_TEXT = re.compile(r"[^\x00-\x0a\x0c-\x1b\x20-\x7f]")
+
+# re flags that can be expressed as RE2 inline flags
+_RE2_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+
+
+class RegexSearchStats:
+    """Thread-safe counters for timeout-protected regex searches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Set all counters to zero."""
+        with self._lock:
+            self.searches = 0
+            self.linear_time_searches = 0
+            self.timeouts = 0
+            self.deadline_misses = 0
+            self.errors = 0
+            self.rejected = 0
+            self.workers_killed = 0
+            self.total_ms = 0.0
+            self.max_ms = 0.0
+            self.max_deadline_used = 0.0
+
+    def record_search(self, elapsed_ms: float, deadline_ms: Optional[float] = None) -> None:
+        """Record a completed search and how much of its deadline it used."""
+        with self._lock:
+            self.searches += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            if deadline_ms:
+                if elapsed_ms > deadline_ms:
+                    self.deadline_misses += 1
+                self.max_deadline_used = max(self.max_deadline_used, elapsed_ms / deadline_ms)
+
+    def increment(self, counter: str) -> None:
+        """Add one to a counter."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get search statistics."""
+        with self._lock:
+            return {
+                "searches": self.searches,
+                "linear_time_searches": self.linear_time_searches,
+                "timeouts": self.timeouts,
+                "deadline_misses": self.deadline_misses,
+                "errors": self.errors,
+                "rejected": self.rejected,
+                "workers_killed": self.workers_killed,
+                "avg_search_ms": self.total_ms / self.searches if self.searches else 0.0,
+                "max_search_ms": self.max_ms,
+                "max_deadline_used": self.max_deadline_used,
+            }
+
+
+# Shared by every matcher and validator in the process
+search_stats = RegexSearchStats()
+
+
+class ThreadRegexMatcher:
+    """Runs regex searches on a bounded, reusable thread pool."""
+
+    def __init__(self, max_workers: int = DEFAULT_REGEX_WORKERS):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._overdue = 0
+        self._lock = threading.Lock()
+
+    @property
+    def overdue(self) -> int:
+        """Number of searches still running past their deadline."""
+        return self._overdue
+
+    def search(
+        self, compiled_pattern: re.Pattern, text: str, timeout_ms: float
+    ) -> Optional[re.Match]:
+        """
+        Search text, waiting at most timeout_ms for the result.
+
+        Raises:
+            TimeoutError: If the search does not finish in time, or every worker
+                is busy with an overdue search
+        """
+        with self._lock:
+            if self._overdue >= self.max_workers:
+                search_stats.increment("rejected")
+                raise TimeoutError(
+                    f"all {self.max_workers} regex workers are busy with overdue searches"
+                )
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="StingerRegex"
+                )
+            executor = self._executor
+
+        future = executor.submit(compiled_pattern.search, text)
+        try:
+            return future.result(timeout_ms / 1000.0)
+        except FuturesTimeoutError:
+            if future.done():
+                # The search held the GIL past the deadline but has finished
+                return future.result()
+            # A search still queued is dropped; a running one keeps its worker until done
+            if not future.cancel():
+                with self._lock:
+                    self._overdue += 1
+                future.add_done_callback(self._overdue_finished)
+            raise TimeoutError(f">{timeout_ms}ms")
+
+    def _overdue_finished(self, future) -> None:
+        """Release the slot of a search that finished after its deadline."""
+        with self._lock:
+            self._overdue -= 1
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for overdue searches. It restarts on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                # cancel_futures needs 3.9; queued work still runs before the pool stops
+                executor.shutdown(wait=False)
+
+
+def _worker_main(conn) -> None:
+    """Serve searches in a worker process until the pipe is closed."""
+    conn.send(("ready", None))
+    while True:
+        try:
+            pattern, flags, text = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            match = re.compile(pattern, flags).search(text)
+            conn.send(("ok", None if match is None else match.start()))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+
+class _RegexWorker:
+    """A worker process and the pipe used to talk to it."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn,), name="StingerRegexWorker", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        if not self.conn.poll(_WORKER_START_TIMEOUT_S):
+            self.kill()
+            raise RuntimeError("Regex worker process did not start")
+        self.conn.recv()
+
+    def search(self, pattern: str, flags: int, text: str, timeout_s: float) -> Optional[int]:
+        """Search in the worker and return where the match starts, if there is one."""
+        self.conn.send((pattern, flags, text))
+        if not self.conn.poll(timeout_s):
+            raise TimeoutError
+        status, value = self.conn.recv()
+        if status == "error":
+            raise re.error(value)
+        return value
+
+    def kill(self) -> None:
+        """Stop the worker immediately."""
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ProcessRegexMatcher:
+    """Runs regex searches in worker processes that are killed when they overrun."""
+
+    def __init__(self, max_workers: int = DEFAULT_REGEX_WORKERS):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        # Spawned, not forked: the caller may be running an event loop thread
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: List[_RegexWorker] = []
+        self._workers = 0
+        self._available = threading.Condition()
+
+    @property
+    def overdue(self) -> int:
+        """Overdue searches are killed, so none keep running."""
+        return 0
+
+    def search(
+        self, compiled_pattern: re.Pattern, text: str, timeout_ms: float
+    ) -> Optional[re.Match]:
+        """
+        Search text in a worker process, killing the worker if it overruns.
+
+        Raises:
+            TimeoutError: If no worker frees up or the search does not finish in time
+        """
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        worker = self._acquire(deadline)
+        try:
+            position = worker.search(
+                compiled_pattern.pattern,
+                compiled_pattern.flags,
+                text,
+                max(deadline - time.monotonic(), 0.0),
+            )
+        except TimeoutError:
+            self._discard(worker)
+            search_stats.increment("workers_killed")
+            raise TimeoutError(f">{timeout_ms}ms")
+        except re.error:
+            self._release(worker)
+            raise
+        except (EOFError, OSError) as e:
+            self._discard(worker)
+            raise RuntimeError(f"Regex worker process failed: {e}")
+        self._release(worker)
+
+        if position is None:
+            return None
+        # Matching where the worker's search matched gives the match search returns
+        return compiled_pattern.match(text, position)
+
+    def _acquire(self, deadline: float) -> _RegexWorker:
+        """Take an idle worker, starting one if the pool is not full."""
+        with self._available:
+            while not self._idle and self._workers >= self.max_workers:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._available.wait(remaining):
+                    search_stats.increment("rejected")
+                    raise TimeoutError("no regex worker became available")
+            if self._idle:
+                return self._idle.pop()
+            self._workers += 1
+
+        try:
+            return _RegexWorker(self._context)
+        except Exception:
+            with self._available:
+                self._workers -= 1
+                self._available.notify()
+            raise
+
+    def _release(self, worker: _RegexWorker) -> None:
+        """Return a worker to the pool."""
+        with self._available:
+            self._idle.append(worker)
+            self._available.notify()
+
+    def _discard(self, worker: _RegexWorker) -> None:
+        """Kill a worker and free its slot in the pool."""
+        worker.kill()
+        with self._available:
+            self._workers -= 1
+            self._available.notify()
+
+    def shutdown(self) -> None:
+        """Stop the idle workers. Workers are started again on next use."""
+        with self._available:
+            idle, self._idle = self._idle, []
+            self._workers -= len(idle)
+        for worker in idle:
+            worker.kill()
+
+
+_matchers: Dict[str, Any] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_regex_matcher(backend: str = "thread", max_workers: Optional[int] = None):
+    """
+    Get the shared matcher for a backend, creating it on first use.
+
+    Args:
+        backend: 'thread' or 'process'
+        max_workers: Pool size, used when the matcher is created
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    matcher = _matchers.get(backend)
+    if matcher is not None:
+        return matcher
+    if backend not in REGEX_BACKENDS:
+        raise ValueError(f"Invalid regex backend: {backend}. Must be one of {list(REGEX_BACKENDS)}")
+    with _matchers_lock:
+        if backend not in _matchers:
+            matcher_class = ThreadRegexMatcher if backend == "thread" else ProcessRegexMatcher
+            _matchers[backend] = matcher_class(max_workers or DEFAULT_REGEX_WORKERS)
+        return _matchers[backend]
+
+
+def shutdown_regex_matchers() -> None:
+    """Stop the worker pools of all shared matchers."""
+    with _matchers_lock:
+        matchers = list(_matchers.values())
+    for matcher in matchers:
+        matcher.shutdown()
+
+
+@lru_cache(maxsize=1024)
+def _compile_linear(pattern: str, flags: int):
+    """Compile a pattern with RE2, or return None if RE2 would not match it the same way."""
+    if flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL | re.UNICODE):
+        return None
+    if _RE2_INCOMPATIBLE.search(pattern):
+        return None
+    inline = "".join(letter for flag, letter in _RE2_FLAGS.items() if flags & flag)
+    try:
+        return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+    except Exception:
+        # Backreferences, lookarounds and other syntax that needs backtracking
+        return None
+
+
+def linear_search(compiled_pattern: re.Pattern, text: str) -> Tuple[bool, Optional[re.Match]]:
+    """
+    Search with the linear-time backend, if it can answer for this pattern and text.
+
+    Returns:
+        Tuple of (handled, match); when handled is False the search must run on a worker
+    """
+    if not RE2_AVAILABLE or _RE2_UNSAFE_TEXT.search(text):
+        return False, None
+    linear = _compile_linear(compiled_pattern.pattern, compiled_pattern.flags)
+    if linear is None:
+        return False, None
+
+    start = time.perf_counter()
+    found = linear.search(text)
+    match = None if found is None else compiled_pattern.match(text, found.start())
+    if found is not None and match is None:
+        # The engines disagree; let re decide on a worker
+        return False, None
+    search_stats.record_search((time.perf_counter() - start) * 1000)
+    search_stats.increment("linear_time_searches")
+    return True, match
+
+
+def get_regex_search_stats() -> Dict[str, Any]:
+    """Get statistics for all timeout-protected regex searches in this process."""
+    stats = search_stats.get_stats()
+    stats["overdue"] = sum(matcher.overdue for matcher in list(_matchers.values()))
+    return stats
@@ -5,12 +5,20 @@ Prevents Regular Expression Denial of Service (ReDoS) attacks by validating
 regex patterns for dangerous constructs and enforcing complexity limits.
 """
 
+import os
 import re
-import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
 
+from .regex_matcher import (
+    DEFAULT_REGEX_WORKERS,
+    REGEX_BACKENDS,
+    get_regex_matcher,
+    linear_search,
+    search_stats,
+)
+
 
 @dataclass
 class RegexSecurityConfig:
@@ -21,8 +29,24 @@ class RegexSecurityConfig:
     MAX_COMPILE_TIME_MS: int = 100
     MAX_EXECUTION_TIME_MS: int = 50
     DANGEROUS_PATTERNS: List[str] = None
+    # Where timeout-protected searches run: 'thread' or 'process' (see regex_matcher)
+    EXECUTION_BACKEND: str = field(
+        default_factory=lambda: os.getenv("STINGER_REGEX_BACKEND", "thread")
+    )
+    MAX_WORKERS: int = field(
+        default_factory=lambda: int(os.getenv("STINGER_REGEX_WORKERS", str(DEFAULT_REGEX_WORKERS)))
+    )
+    # Search patterns RE2 supports with RE2 when google-re2 is installed
+    LINEAR_TIME: bool = field(
+        default_factory=lambda: os.getenv("STINGER_REGEX_LINEAR_TIME", "false").lower() == "true"
+    )
 
     def __post_init__(self):
+        if self.EXECUTION_BACKEND not in REGEX_BACKENDS:
+            raise ValueError(
+                f"Invalid regex backend: {self.EXECUTION_BACKEND}. "
+                f"Must be one of {list(REGEX_BACKENDS)}"
+            )
         if self.DANGEROUS_PATTERNS is None:
             # Known dangerous regex patterns that can cause ReDoS
             self.DANGEROUS_PATTERNS = [
@@ -61,29 +85,37 @@ class RegexSecurityValidator:
         Raises:
             SecurityError: If pattern violates security constraints
         """
+        static_reason = self._check_static(pattern)
+        if static_reason:
+            return False, static_reason
+
+        # Check compilation time
+        compile_time = self._measure_compile_time(pattern)
+        if compile_time > self.config.MAX_COMPILE_TIME_MS:
+            return (
+                False,
+                f"Compilation too slow: {compile_time}ms > {self.config.MAX_COMPILE_TIME_MS}ms",
+            )
+
+        return True, "Pattern is safe"
+
+    def _check_static(self, pattern: str) -> Optional[str]:
+        """Check the pattern source for security issues, without compiling it."""
         # Check pattern length
         if len(pattern) > self.config.MAX_PATTERN_LENGTH:
-            return False, f"Pattern too long: {len(pattern)} > {self.config.MAX_PATTERN_LENGTH}"
+            return f"Pattern too long: {len(pattern)} > {self.config.MAX_PATTERN_LENGTH}"
 
         # Check for dangerous patterns
         dangerous_reason = self._check_dangerous_patterns(pattern)
         if dangerous_reason:
-            return False, dangerous_reason
+            return dangerous_reason
 
         # Check complexity
         complexity = self._calculate_complexity(pattern)
         if complexity > self.config.MAX_REGEX_COMPLEXITY:
-            return False, f"Pattern too complex: {complexity} > {self.config.MAX_REGEX_COMPLEXITY}"
+            return f"Pattern too complex: {complexity} > {self.config.MAX_REGEX_COMPLEXITY}"
 
-        # Check compilation time
-        compile_time = self._measure_compile_time(pattern)
-        if compile_time > self.config.MAX_COMPILE_TIME_MS:
-            return (
-                False,
-                f"Compilation too slow: {compile_time}ms > {self.config.MAX_COMPILE_TIME_MS}ms",
-            )
-
-        return True, "Pattern is safe"
+        return None
 
     def safe_compile(self, pattern: str, flags: int = 0) -> re.Pattern:
         """
@@ -99,8 +131,9 @@ class RegexSecurityValidator:
         Raises:
             SecurityError: If pattern is unsafe
         """
-        is_safe, reason = self.validate_pattern(pattern)
-        if not is_safe:
+        # Same checks as validate_pattern, but the compilation is timed only once
+        reason = self._check_static(pattern)
+        if reason:
             raise SecurityError(f"Unsafe regex pattern: {reason}")
 
         try:
@@ -121,6 +154,10 @@ class RegexSecurityValidator:
         """
         Safely execute a regex search with timeout protection.
 
+        The search runs on the shared worker pool of the configured backend, or
+        inline with the linear-time backend when it is enabled and supports the
+        pattern.
+
         Args:
             compiled_pattern: Pre-compiled regex pattern
             text: Text to search
@@ -133,28 +170,25 @@ class RegexSecurityValidator:
             SecurityError: If execution times out
         """
         timeout = timeout_ms or self.config.MAX_EXECUTION_TIME_MS
-        result = [None]
-        exception = [None]
-
-        def search_worker():
-            try:
-                result[0] = compiled_pattern.search(text)
-            except Exception as e:
-                exception[0] = e
-
-        thread = threading.Thread(target=search_worker)
-        thread.daemon = True
-        thread.start()
-        thread.join(timeout / 1000.0)
 
-        if thread.is_alive():
-            # Thread is still running - timeout occurred
-            raise SecurityError(f"Regex execution timeout: >{timeout}ms")
+        if self.config.LINEAR_TIME:
+            handled, match = linear_search(compiled_pattern, text)
+            if handled:
+                return match
 
-        if exception[0]:
-            raise SecurityError(f"Regex execution error: {exception[0]}")
-
-        return result[0]
+        matcher = get_regex_matcher(self.config.EXECUTION_BACKEND, self.config.MAX_WORKERS)
+        start_time = time.perf_counter()
+        try:
+            match = matcher.search(compiled_pattern, text, timeout)
+        except TimeoutError as e:
+            search_stats.increment("timeouts")
+            raise SecurityError(f"Regex execution timeout: {e}")
+        except Exception as e:
+            search_stats.increment("errors")
+            raise SecurityError(f"Regex execution error: {e}")
+
+        search_stats.record_search((time.perf_counter() - start_time) * 1000, timeout)
+        return match
 
     def _check_dangerous_patterns(self, pattern: str) -> Optional[str]:
         """Check if pattern contains known dangerous constructs."""
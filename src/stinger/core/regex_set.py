@@ -0,0 +1,159 @@
+"""
+Regex Pattern Sets
+
+Checks a whole list of validated regex patterns against a text with one scan in
+the common case. The patterns are combined into a single alternation of named
+groups; when that union finds nothing, no pattern can match and the text has
+been scanned once instead of once per pattern. Only when the union matches are
+the remaining patterns confirmed one by one, so the reported matches are exactly
+those of checking every pattern separately.
+
+Patterns that cannot be embedded in an alternation (numeric backreferences,
+global inline flags, group names already used by another pattern) are always
+checked on their own.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Set
+
+from .regex_security import RegexSecurityValidator, SecurityError
+
+logger = logging.getLogger(__name__)
+
+# Numeric backreferences change meaning once groups are renumbered by the union
+_NUMERIC_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?\(\d")
+
+_GROUP_PREFIX = "_stinger_p"
+
+
+def _union_group_names(pattern: str, index: int, flags: int) -> Optional[Set[str]]:
+    """
+    Check whether a pattern can be embedded in the union as alternative index.
+
+    Returns:
+        The group names it adds to the union, or None if it must be checked on its
+        own (numeric backreferences, or global inline flags that only compile at
+        the start of a pattern)
+    """
+    if _NUMERIC_BACKREFERENCE.search(pattern):
+        return None
+    try:
+        wrapped = re.compile(f"(?P<{_GROUP_PREFIX}{index}>{pattern})", flags)
+    except re.error:
+        return None
+    return set(wrapped.groupindex)
+
+
+class RegexPatternSet:
+    """A list of compiled patterns searched through a single union regex."""
+
+    def __init__(
+        self,
+        patterns: List[str],
+        compiled_patterns: List[re.Pattern],
+        flags: int = 0,
+        security_validator: Optional[RegexSecurityValidator] = None,
+    ):
+        """
+        Build the union of already validated patterns.
+
+        Args:
+            patterns: Pattern sources, in reporting order
+            compiled_patterns: The same patterns compiled with flags
+            flags: Flags the patterns were compiled with
+            security_validator: Validator providing timeout-protected searches
+        """
+        self.patterns = patterns
+        self.compiled_patterns = compiled_patterns
+        self.flags = flags
+        self.security_validator = security_validator or RegexSecurityValidator()
+
+        self.union: Optional[re.Pattern] = None
+        self._union_indices: Dict[int, int] = {}
+        self._separate: List[int] = []
+        self._build_union()
+
+    def _build_union(self) -> None:
+        """Combine every pattern that can be embedded in an alternation."""
+        combinable = []
+        group_names = set()
+        for index, pattern in enumerate(self.patterns):
+            names = _union_group_names(pattern, index, self.flags)
+            # A group name may only appear once in the union
+            if names is None or names & group_names:
+                self._separate.append(index)
+                continue
+            group_names |= names
+            combinable.append(index)
+
+        if len(combinable) < 2:
+            self._separate = list(range(len(self.patterns)))
+            return
+
+        source = "|".join(
+            f"(?P<{_GROUP_PREFIX}{index}>{self.patterns[index]})" for index in combinable
+        )
+        try:
+            self.union = re.compile(source, self.flags)
+        except re.error as e:
+            logger.debug(f"Checking regex patterns separately: {e}")
+            self._separate = list(range(len(self.patterns)))
+            return
+
+        for name, group in self.union.groupindex.items():
+            if name.startswith(_GROUP_PREFIX):
+                self._union_indices[group] = int(name[len(_GROUP_PREFIX) :])
+
+    def _search_one(self, index: int, text: str) -> bool:
+        """Search one pattern, treating a security error as no match."""
+        try:
+            return (
+                self.security_validator.safe_search(self.compiled_patterns[index], text) is not None
+            )
+        except SecurityError as e:
+            logger.warning(f"Regex security error for pattern '{self.patterns[index]}': {e}")
+            return False
+
+    def search(self, text: str) -> List[str]:
+        """
+        Find the patterns that match text.
+
+        Returns:
+            Matching pattern sources, in pattern order
+        """
+        return [self.patterns[index] for index in self.search_indices(text)]
+
+    def search_indices(self, text: str) -> List[int]:
+        """
+        Find the patterns that match text.
+
+        Returns:
+            Indices of the matching patterns, in pattern order
+        """
+        candidates = list(range(len(self.patterns)))
+        found = set()
+
+        if self.union is not None:
+            union_size = len(self._union_indices)
+            timeout_ms = self.security_validator.config.MAX_EXECUTION_TIME_MS * union_size
+            try:
+                match = self.security_validator.safe_search(self.union, text, timeout_ms)
+            except SecurityError as e:
+                logger.warning(
+                    f"Regex security error for combined patterns, checking separately: {e}"
+                )
+            else:
+                if match is None:
+                    candidates = self._separate
+                else:
+                    found.update(
+                        index
+                        for group, index in self._union_indices.items()
+                        if match.start(group) != -1
+                    )
+
+        for index in candidates:
+            if index not in found and self._search_one(index, text):
+                found.add(index)
+        return sorted(found)
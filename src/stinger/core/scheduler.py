@@ -0,0 +1,138 @@
+"""
+Guardrail Scheduling
+
+This module decides the order in which a pipeline's guardrails are executed.
+Guardrails can run in configuration order or be ordered by cost, so cheap local
+checks (length, keyword, regex) get a chance to block content before any paid
+AI guardrail is called.
+"""
+
+import logging
+from threading import Lock
+from typing import Dict, List, Sequence
+
+from .guardrail_interface import GuardrailInterface
+
+logger = logging.getLogger(__name__)
+
+# Supported values for the per-pipeline ``order`` setting
+SCHEDULING_ORDERS = ("config", "cost")
+
+
+class GuardrailScheduler:
+    """
+    Plans guardrail execution for one pipeline.
+
+    The scheduler keeps an exponentially weighted moving average of each
+    guardrail's measured run time. With ``order: cost`` guardrails are ordered
+    local-first, then by measured cost, then by configuration position.
+    """
+
+    def __init__(self, order: str = "config", smoothing: float = 0.2):
+        """
+        Initialize the scheduler.
+
+        Args:
+            order: 'config' to keep configuration order, 'cost' to order by cost
+            smoothing: Weight given to the newest measurement (0.0 to 1.0)
+
+        Raises:
+            ValueError: If order or smoothing is invalid
+        """
+        if order not in SCHEDULING_ORDERS:
+            raise ValueError(
+                f"Invalid scheduling order: {order}. Must be one of {list(SCHEDULING_ORDERS)}"
+            )
+        if not 0.0 < smoothing <= 1.0:
+            raise ValueError("smoothing must be between 0.0 (exclusive) and 1.0")
+
+        self.order = order
+        self.smoothing = smoothing
+        self._costs: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def record(self, guardrail_name: str, duration_ms: float) -> None:
+        """Record a measured run time for a guardrail."""
+        with self._lock:
+            previous = self._costs.get(guardrail_name)
+            if previous is None:
+                self._costs[guardrail_name] = duration_ms
+            else:
+                self._costs[guardrail_name] = (
+                    self.smoothing * duration_ms + (1 - self.smoothing) * previous
+                )
+
+    def estimated_cost(self, guardrail_name: str) -> float:
+        """Get the average measured run time in milliseconds (0.0 if never measured)."""
+        return self._costs.get(guardrail_name, 0.0)
+
+    def get_costs(self) -> Dict[str, float]:
+        """Get a copy of all measured guardrail costs in milliseconds."""
+        with self._lock:
+            return dict(self._costs)
+
+    def plan(
+        self, pipeline: Sequence[GuardrailInterface], parallel: bool = False
+    ) -> List[List[int]]:
+        """
+        Plan execution stages for a pipeline.
+
+        Each stage is a list of indices into ``pipeline``. Guardrails within a stage
+        may run concurrently; stages run one after another. A guardrail with an
+        escalation policy always runs in a later stage than the guardrail it
+        escalates from.
+
+        Args:
+            pipeline: Guardrails in configuration order
+            parallel: Whether guardrails within a stage may run concurrently
+
+        Returns:
+            List of stages, each a list of guardrail indices
+        """
+        indices = list(range(len(pipeline)))
+        if not indices:
+            return []
+
+        if self.order == "cost":
+            indices.sort(
+                key=lambda i: (
+                    pipeline[i].uses_ai,
+                    self.estimated_cost(pipeline[i].name),
+                    i,
+                )
+            )
+
+        if not parallel:
+            stages = [[i] for i in indices]
+        elif self.order == "cost":
+            # Run all local guardrails first, then all AI guardrails, each group concurrently
+            local = [i for i in indices if not pipeline[i].uses_ai]
+            remote = [i for i in indices if pipeline[i].uses_ai]
+            stages = [stage for stage in (local, remote) if stage]
+        else:
+            stages = [indices]
+
+        return self._defer_escalations(pipeline, stages, parallel)
+
+    @staticmethod
+    def _defer_escalations(
+        pipeline: Sequence[GuardrailInterface], stages: List[List[int]], parallel: bool
+    ) -> List[List[int]]:
+        """Move escalating guardrails not preceded by their source to the end."""
+        position = {pipeline[i].name: number for number, stage in enumerate(stages) for i in stage}
+        kept: List[List[int]] = []
+        deferred: List[int] = []
+        for number, stage in enumerate(stages):
+            remaining = []
+            for i in stage:
+                escalation = getattr(pipeline[i], "escalation", None)
+                if escalation is not None and position.get(escalation.source, -1) >= number:
+                    deferred.append(i)
+                else:
+                    remaining.append(i)
+            if remaining:
+                kept.append(remaining)
+
+        if not deferred:
+            return kept
+        return kept + ([deferred] if parallel else [[i] for i in deferred])
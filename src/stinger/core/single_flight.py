@@ -0,0 +1,97 @@
+"""
+Request Coalescing
+
+During a burst of identical requests (a popular prompt template, a client retry
+storm), every concurrent check used to make its own model API call with the
+same input. The single-flight layer under the model adapters coalesces them:
+while a call is in flight, identical calls wait for its result instead of
+making their own, so the model API sees one call per distinct input at a time.
+
+Calls are identical when their key is: a hash of the client (provider, base URL,
+API key), the model and every request parameter, including the full prompt
+built from the guardrail's template and the content. Coalesced callers get the
+same result (or exception) the API returned to the first caller, so decisions do
+not change. Only concurrent calls are coalesced; nothing is kept once a call
+completes.
+
+The shared call runs as its own task: a caller that is cancelled (for example
+by a check deadline) stops waiting without cancelling the call for the others.
+
+get_coalescing_stats() reports the share of calls that were coalesced, and the
+API's ``/metrics`` endpoint exports it.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+from .artifacts import content_key
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent async calls with the same key into one call."""
+
+    def __init__(self):
+        # In-flight calls by event loop and key; a task is only valid on its own loop
+        self._flights: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a call, or wait for the identical call already in flight.
+
+        Args:
+            key: Key identifying the call; equal keys must mean equal results
+            call: Makes the call
+
+        Returns:
+            The call's result
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        task = self._flights.get(flight_key)
+        if task is None:
+            task = loop.create_task(call())
+            self._flights[flight_key] = task
+            task.add_done_callback(lambda done: self._land(flight_key, done))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _land(self, flight_key: Tuple[asyncio.AbstractEventLoop, str], task: asyncio.Task) -> None:
+        if self._flights.get(flight_key) is task:
+            del self._flights[flight_key]
+        # Mark the exception retrieved, in case every caller stopped waiting
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the number of calls made and coalesced."""
+        requested = self.calls + self.coalesced
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+            "dedupe_ratio": self.coalesced / requested if requested else 0.0,
+        }
+
+
+_single_flight = SingleFlight()
+
+
+def request_key(kind: str, *parts: Any) -> str:
+    """Hash the parameters of a model call into its coalescing key."""
+    return content_key(kind, list(parts))
+
+
+async def coalesce(key: str, call: Callable[[], Awaitable[T]]) -> T:
+    """Run a model call through the process-wide single-flight layer."""
+    return await _single_flight.run(key, call)
+
+
+def get_coalescing_stats() -> Dict[str, Any]:
+    """Get statistics of the process-wide single-flight layer."""
+    return _single_flight.get_stats()
@@ -0,0 +1,234 @@
+"""
+Streaming Output Checks
+
+Lets an output pipeline screen an LLM response while it is being generated.
+Chunks are fed in as they arrive; guardrails that only look for local patterns
+(keywords, regexes, URLs, PII, toxicity) check a sliding window of the text so
+far and can block mid-stream. When the stream ends, the complete response goes
+through the full output pipeline, so the final decision is the same as checking
+the buffered response with ``check_output``.
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from . import audit
+from .conversation import Conversation
+from .event_loop import CoroutineSuspendedError, get_background_loop, run_coroutine_sync
+from .normalization import normalized
+
+if TYPE_CHECKING:
+    from .pipeline import GuardrailPipeline, PipelineResult, _GuardrailOutcome
+
+logger = logging.getLogger(__name__)
+
+# Default number of already-checked characters re-checked with each new chunk
+DEFAULT_STREAM_OVERLAP = 256
+
+
+class OutputStream:
+    """
+    Incremental output checker returned by ``GuardrailPipeline.stream_output()``.
+
+    Each ``feed`` checks the new text together with the last ``overlap`` characters
+    already checked, so a match split across chunk boundaries is found as soon as
+    the chunk completing it arrives, provided the match is no longer than the
+    overlap. Longer matches and non-streaming guardrails (length, topic, AI) are
+    applied by ``finish``.
+
+    Example:
+        stream = pipeline.stream_output()
+        for chunk in llm_stream:
+            if stream.feed(chunk)["blocked"]:
+                break
+            send(chunk)
+        else:
+            result = stream.finish()
+    """
+
+    def __init__(
+        self,
+        pipeline: "GuardrailPipeline",
+        conversation: Optional[Conversation] = None,
+        overlap: int = DEFAULT_STREAM_OVERLAP,
+        min_chunk_chars: int = 1,
+    ):
+        """
+        Initialize the stream.
+
+        Args:
+            pipeline: Pipeline whose output guardrails check the stream
+            conversation: Optional conversation the final response belongs to
+            overlap: Number of already-checked characters re-checked with new text
+            min_chunk_chars: Minimum number of new characters before a window check
+
+        Raises:
+            ValueError: If overlap is negative or min_chunk_chars < 1
+        """
+        if overlap < 0:
+            raise ValueError("overlap must be non-negative")
+        if min_chunk_chars < 1:
+            raise ValueError("min_chunk_chars must be at least 1")
+
+        self.pipeline = pipeline
+        self.conversation = conversation
+        self.overlap = overlap
+        self.min_chunk_chars = min_chunk_chars
+        self.guardrails = [g for g in pipeline.output_pipeline if g.supports_streaming]
+
+        self._chunks: List[str] = []
+        self._pending: List[str] = []
+        self._pending_length = 0
+        self._tail = ""
+        self._length = 0
+        self._result: Optional["PipelineResult"] = None
+
+    @property
+    def text(self) -> str:
+        """The response text received so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @property
+    def chars_received(self) -> int:
+        """Number of characters received so far."""
+        return self._length
+
+    @property
+    def blocked(self) -> bool:
+        """Whether the stream has been blocked."""
+        return bool(self._result and self._result["blocked"])
+
+    @property
+    def finished(self) -> bool:
+        """Whether the stream has been blocked or finished."""
+        return self._result is not None
+
+    def feed(self, chunk: str) -> "PipelineResult":
+        """
+        Add a chunk of the response and check it.
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Result of the window check; ``blocked`` is True if the response must be
+            cut off. Once blocked, the blocking result is returned for every call.
+
+        Raises:
+            RuntimeError: If called from an async context or after finish()
+        """
+        window = self._append(chunk)
+        if window is None:
+            return self._current_result()
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "Cannot call OutputStream.feed from async context. Use feed_async() instead."
+            )
+
+        try:
+            outcomes = run_coroutine_sync(self._check_window(window))
+        except CoroutineSuspendedError:
+            outcomes = get_background_loop().run(self._check_window(window))
+        return self._apply(outcomes)
+
+    async def feed_async(self, chunk: str) -> "PipelineResult":
+        """Async version of feed."""
+        window = self._append(chunk)
+        if window is None:
+            return self._current_result()
+        return self._apply(await self._check_window(window))
+
+    def finish(self) -> "PipelineResult":
+        """
+        End the stream and check the complete response with the full output pipeline.
+
+        Returns:
+            The final result; the blocking result if the stream was blocked mid-stream
+        """
+        if self._result is None:
+            self._result = self.pipeline.check_output(self.text, conversation=self.conversation)
+        return self._result
+
+    async def finish_async(self) -> "PipelineResult":
+        """Async version of finish."""
+        if self._result is None:
+            self._result = await self.pipeline.check_output_async(
+                self.text, conversation=self.conversation
+            )
+        return self._result
+
+    def _append(self, chunk: str) -> Optional[str]:
+        """Store a chunk and return the window to check, or None if no check is due."""
+        if chunk is None:
+            raise ValueError("Chunk cannot be None")
+        if self._result is not None:
+            if self.blocked:
+                return None
+            raise RuntimeError("Cannot feed a finished stream")
+
+        if chunk:
+            self._chunks.append(chunk)
+            self._length += len(chunk)
+            if self.guardrails:
+                self._pending.append(chunk)
+                self._pending_length += len(chunk)
+
+        if not self.guardrails or self._pending_length < self.min_chunk_chars:
+            return None
+
+        # Only the tail of the checked text is kept, so each check costs O(overlap + chunk)
+        window = self._tail + "".join(self._pending)
+        self._tail = window[-self.overlap :] if self.overlap else ""
+        self._pending = []
+        self._pending_length = 0
+        return window
+
+    async def _check_window(self, window: str) -> Dict[int, "_GuardrailOutcome"]:
+        """Run the streaming guardrails over a window of the response."""
+        outcomes = {}
+        window = normalized(window)
+        for index, guardrail in enumerate(self.guardrails):
+            outcomes[index] = await self.pipeline._execute_guardrail(guardrail, window)
+        return outcomes
+
+    def _apply(self, outcomes: Dict[int, "_GuardrailOutcome"]) -> "PipelineResult":
+        """Turn window outcomes into a result, recording and auditing a block."""
+        ordered = [outcomes[index] for index in sorted(outcomes)]
+        blocked = any(outcome.blocked for outcome in ordered)
+        result = self.pipeline._assemble_result(
+            ordered, "output", self.conversation, audit_decisions=blocked
+        )
+
+        if blocked:
+            conversation_id = self.conversation.conversation_id if self.conversation else None
+            logger.info(f"Output stream blocked after {self._length} characters")
+            audit.log_response(
+                response=self.text,
+                user_id=getattr(self.conversation, "initiator", None) or "",
+                conversation_id=conversation_id or "",
+                request_id=getattr(self.conversation, "current_request_id", None) or "",
+            )
+            self._result = result
+        return result
+
+    def _current_result(self) -> "PipelineResult":
+        """Result for a feed that did not trigger a window check."""
+        if self._result is not None:
+            return self._result
+        return {
+            "blocked": False,
+            "warnings": [],
+            "reasons": [],
+            "details": {},
+            "pipeline_type": "output",
+            "conversation_id": self.conversation.conversation_id if self.conversation else None,
+            "processing_time_ms": 0.0,
+        }
@@ -0,0 +1,370 @@
+"""
+AI Verdict Cache
+
+AI guardrails used to query their model for every check, even for content they
+classified seconds before. The verdict cache keeps the model's verdicts, so a
+guardrail that sees the same content again reuses its earlier verdict instead
+of paying for another call.
+
+Verdicts are keyed on the guardrail type, the model, a hash of the prompt
+template (so editing a prompt acts as a new template version) and a hash of the
+exact content. Only the model's verdict is cached: thresholds and block/warn
+categories are applied to it on every check, so changing them needs no
+invalidation. Failed or unparseable responses are never cached.
+
+The cache has two tiers:
+
+- an in-memory LRU (see decision_cache) per process;
+- an optional SQLite database on local disk, which survives restarts and is
+  shared by all worker processes of a host.
+
+Both tiers expire entries after the same TTL. Because the model is part of the
+key, a guardrail whose model changes in ``models.yaml`` no longer sees verdicts
+of its old model; the disk tier also deletes them when a guardrail of that type
+is created with the new model.
+
+The cache is off unless enabled. VerdictCacheConfig reads its defaults from the
+environment:
+
+- ``STINGER_VERDICT_CACHE``: "true" to enable the cache
+- ``STINGER_VERDICT_CACHE_SIZE``: verdicts kept in memory (default 10000)
+- ``STINGER_VERDICT_CACHE_TTL``: seconds a verdict stays valid (default 3600)
+- ``STINGER_VERDICT_CACHE_PATH``: SQLite database of the disk tier; unset keeps
+  verdicts in memory only
+- ``STINGER_VERDICT_CACHE_DISK_SIZE``: verdicts kept on disk (default 100000)
+
+get_verdict_cache_stats() reports hits per tier, and the API's ``/metrics``
+endpoint exports it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .artifacts import content_key
+from .decision_cache import DecisionCache
+
+logger = logging.getLogger(__name__)
+
+# Puts between two prunes of the disk tier
+_PRUNE_INTERVAL = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    key TEXT PRIMARY KEY,
+    guardrail_type TEXT NOT NULL,
+    model TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS verdicts_model ON verdicts (guardrail_type, model);
+CREATE INDEX IF NOT EXISTS verdicts_expiry ON verdicts (expires_at);
+"""
+
+
+@dataclass
+class VerdictCacheConfig:
+    """Settings of the AI verdict cache."""
+
+    enabled: bool = field(
+        default_factory=lambda: os.getenv("STINGER_VERDICT_CACHE", "false").lower()
+        in ("1", "true", "yes")
+    )
+    max_size: int = field(
+        default_factory=lambda: int(os.getenv("STINGER_VERDICT_CACHE_SIZE", "10000"))
+    )
+    ttl_seconds: float = field(
+        default_factory=lambda: float(os.getenv("STINGER_VERDICT_CACHE_TTL", "3600"))
+    )
+    path: Optional[str] = field(
+        default_factory=lambda: os.getenv("STINGER_VERDICT_CACHE_PATH") or None
+    )
+    max_disk_entries: int = field(
+        default_factory=lambda: int(os.getenv("STINGER_VERDICT_CACHE_DISK_SIZE", "100000"))
+    )
+
+    def __post_init__(self):
+        if self.max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if self.ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        if self.max_disk_entries < 1:
+            raise ValueError("max_disk_entries must be at least 1")
+
+
+def verdict_key(guardrail_type: str, model: str, template: str, content: str) -> str:
+    """
+    Build the cache key of a verdict.
+
+    Args:
+        guardrail_type: Detection type, e.g. 'prompt_injection'
+        model: Model that gives the verdict
+        template: Prompt template the content is sent in
+        content: Checked content, hashed exactly as given
+
+    Returns:
+        Cache key string
+    """
+    template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()
+    content_hash = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+    return content_key("verdict", [guardrail_type, model, template_hash, content_hash])
+
+
+class _DiskTier:
+    """Verdicts in a SQLite database, shared by the processes of a host."""
+
+    def __init__(self, path: str, max_entries: int):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        # One connection per process; SQLite locks the file between processes
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._lock = Lock()
+        self._puts = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def get(self, key: str, now: float) -> Optional[Tuple[Any, float]]:
+        """Get a verdict and its expiry time, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM verdicts WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, guardrail_type: str, model: str, value: Any, expires_at: float) -> None:
+        encoded = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)",
+                (key, guardrail_type, model, encoded, expires_at),
+            )
+            self._puts += 1
+            if self._puts % _PRUNE_INTERVAL == 0:
+                self._prune(time.time())
+            self._conn.commit()
+
+    def _prune(self, now: float) -> None:
+        self._conn.execute("DELETE FROM verdicts WHERE expires_at <= ?", (now,))
+        # Entries expiring first are the oldest, as all share one TTL
+        self._conn.execute(
+            "DELETE FROM verdicts WHERE key IN ("
+            "SELECT key FROM verdicts ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def retire_models(self, guardrail_type: str, model: str) -> int:
+        """Delete verdicts of a guardrail type given by any other model."""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM verdicts WHERE guardrail_type = ? AND model != ?",
+                (guardrail_type, model),
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM verdicts")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class VerdictCache:
+    """Two-tier cache of AI verdicts: in-memory LRU, backed by an optional SQLite file."""
+
+    def __init__(self, config: Optional[VerdictCacheConfig] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            config: Cache settings; defaults to VerdictCacheConfig() from the environment
+
+        Raises:
+            ValueError: If the settings are invalid
+            sqlite3.Error: If the disk tier cannot be opened
+        """
+        self.config = config or VerdictCacheConfig()
+        self._memory = DecisionCache(
+            max_size=self.config.max_size, ttl_seconds=self.config.ttl_seconds
+        )
+        self._disk = (
+            _DiskTier(self.config.path, self.config.max_disk_entries) if self.config.path else None
+        )
+        self._models: Set[Tuple[str, str]] = set()
+        self._lock = Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.retired = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached verdict, or None if missing or expired."""
+        value = self._memory.get(key)
+        if value is not None:
+            with self._lock:
+                self.memory_hits += 1
+            return value
+
+        if self._disk is not None:
+            now = time.time()
+            try:
+                found = self._disk.get(key, now)
+            except sqlite3.Error as e:
+                logger.warning(f"Verdict cache read failed: {e}")
+                found = None
+            if found is not None:
+                value, expires_at = found
+                # Keep the verdict's remaining lifetime, not a fresh TTL
+                self._memory.put(key, value, ttl_seconds=expires_at - now)
+                with self._lock:
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Any, guardrail_type: str, model: str) -> None:
+        """
+        Store a verdict in both tiers.
+
+        Args:
+            key: Key from verdict_key()
+            value: JSON-serializable verdict
+            guardrail_type: Detection type the verdict belongs to
+            model: Model that gave the verdict
+        """
+        self._memory.put(key, value)
+        with self._lock:
+            self.stores += 1
+        if self._disk is not None:
+            try:
+                self._disk.put(
+                    key, guardrail_type, model, value, time.time() + self.config.ttl_seconds
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Verdict cache write failed: {e}")
+
+    def use_model(self, guardrail_type: str, model: str) -> None:
+        """
+        Record the model a guardrail type now uses.
+
+        Verdicts of other models for this type are never looked up again (the
+        model is part of the key); this deletes them from the disk tier, so a
+        model change in models.yaml does not leave them taking up space.
+        """
+        with self._lock:
+            if (guardrail_type, model) in self._models:
+                return
+            self._models.add((guardrail_type, model))
+        if self._disk is not None:
+            try:
+                retired = self._disk.retire_models(guardrail_type, model)
+            except sqlite3.Error as e:
+                logger.warning(f"Verdict cache invalidation failed: {e}")
+                return
+            if retired:
+                logger.info(f"Dropped {retired} cached {guardrail_type} verdicts of other models")
+                with self._lock:
+                    self.retired += retired
+
+    def clear(self) -> None:
+        """Remove all verdicts from both tiers. Counters are kept."""
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        if self._disk is not None:
+            self._disk.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit and size statistics of both tiers."""
+        memory = self._memory.get_stats()
+        disk_size = 0
+        if self._disk is not None:
+            try:
+                disk_size = len(self._disk)
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "size": memory["size"],
+                "max_size": memory["max_size"],
+                "disk_size": disk_size,
+                "ttl_seconds": memory["ttl_seconds"],
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "evictions": memory["evictions"],
+                "retired": self.retired,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+_cache: Optional[VerdictCache] = None
+_configured = False
+_cache_lock = Lock()
+
+
+def get_verdict_cache() -> Optional[VerdictCache]:
+    """Get the process-wide verdict cache, or None if it is disabled."""
+    global _cache, _configured
+    if not _configured:
+        with _cache_lock:
+            if not _configured:
+                config = VerdictCacheConfig()
+                if config.enabled:
+                    try:
+                        _cache = VerdictCache(config)
+                    except (sqlite3.Error, OSError) as e:
+                        logger.error(f"Failed to open verdict cache at {config.path}: {e}")
+                        _cache = VerdictCache(replace(config, path=None))
+                _configured = True
+    return _cache
+
+
+def configure_verdict_cache(config: VerdictCacheConfig) -> Optional[VerdictCache]:
+    """
+    Replace the process-wide verdict cache.
+
+    Returns:
+        The new cache, or None if config disables it
+    """
+    global _cache, _configured
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+        _cache = VerdictCache(config) if config.enabled else None
+        _configured = True
+    return _cache
+
+
+def get_verdict_cache_stats() -> Dict[str, Any]:
+    """Get statistics of the process-wide verdict cache (empty if disabled)."""
+    cache = get_verdict_cache()
+    return cache.get_stats() if cache is not None else {}
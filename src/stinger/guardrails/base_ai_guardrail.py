@@ -15,6 +15,7 @@ from ..core.config_validator import AI_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
 from ..core.model_config import ModelFactory
+from ..core.verdict_cache import get_verdict_cache, verdict_key
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,8 @@ logger = logging.getLogger(__name__)
 class BaseAIGuardrail(GuardrailInterface):
     """Base class for AI-powered guardrails with common functionality."""
 
+    uses_ai = True
+
     def __init__(
         self,
         name: str,
@@ -66,6 +69,9 @@ class BaseAIGuardrail(GuardrailInterface):
                     detection_type, self.api_key
                 )
                 logger.info(f"Initialized AI {detection_type} guardrail with centralized API key")
+                verdict_cache = get_verdict_cache()
+                if verdict_cache is not None:
+                    verdict_cache.use_model(detection_type, self.model_provider.get_model_name())
             except Exception as e:
                 logger.error(f"Failed to create model provider for {detection_type}: {e}")
         else:
@@ -124,54 +130,97 @@ class BaseAIGuardrail(GuardrailInterface):
             return await self._handle_ai_failure(content, "No API key configured")
 
         try:
-            # Use centralized model provider
+            # Use centralized model provider, unless it already judged this content
+            cache_key = self._verdict_key(content)
+            response_content = self._cached_response(cache_key)
+            if response_content is not None:
+                return await self._analyze_response(content, response_content)
             prompt = self.get_analysis_prompt()
             response_content = await self.model_provider.generate_response(
                 prompt.format(content=content)
             )
-
-            if response_content:
-                try:
-                    data = json.loads(response_content.strip())
-
-                    # Parse response using subclass implementation
-                    detected, categories, confidence = self.parse_ai_response(data)
-
-                    blocked = detected and confidence >= self.confidence_threshold
-
-                    # Build reason message
-                    detection_type = self._get_detection_type().replace("_", " ")
-                    categories_str = ", ".join(categories) if categories else "none"
-
-                    return GuardrailResult(
-                        blocked=blocked,
-                        confidence=confidence,
-                        reason=(
-                            f"{detection_type.replace('_', ' ').title()} detected (AI): {categories_str}"
-                            if detected
-                            else f"No {detection_type.replace('_', ' ')} detected (AI)"
-                        ),
-                        details={
-                            f"detected_{self.get_categories_field_name()}": categories,
-                            "confidence": confidence,
-                            "method": "ai",
-                            "model": self.model_provider.get_model_name(),
-                        },
-                        guardrail_name=self.name,
-                        guardrail_type=self.guardrail_type,
-                    )
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON response from AI model: {e}")
-                    return await self._handle_ai_failure(
-                        content, "Invalid JSON response from AI model"
-                    )
-            else:
-                return await self._handle_ai_failure(content, "Empty response from AI model")
+            return await self._analyze_response(content, response_content, cache_key)
 
         except Exception as e:
             logger.error(f"AI {self._get_detection_type()} error: {e}")
             return await self._handle_ai_failure(content, str(e))
 
+    def _verdict_key(self, content: str) -> Optional[str]:
+        """Get the verdict cache key of content, or None if the cache is disabled."""
+        if get_verdict_cache() is None:
+            return None
+        return verdict_key(
+            self._get_detection_type(),
+            self.model_provider.get_model_name(),
+            self.get_analysis_prompt(),
+            content,
+        )
+
+    def _cached_response(self, cache_key: Optional[str]) -> Optional[str]:
+        """Get the model response cached under a verdict cache key."""
+        verdict_cache = get_verdict_cache()
+        if cache_key is None or verdict_cache is None:
+            return None
+        return verdict_cache.get(cache_key)
+
+    async def _analyze_response(
+        self, content: str, response_content: Optional[str], cache_key: Optional[str] = None
+    ) -> GuardrailResult:
+        """
+        Turn the model's response into a result.
+
+        Args:
+            content: Analyzed content
+            response_content: JSON response of the model for this guardrail's prompt
+            cache_key: Verdict cache key to store a valid response under, if any
+
+        Returns:
+            The guardrail result, or the on_error result if the response is unusable
+        """
+        if not response_content:
+            return await self._handle_ai_failure(content, "Empty response from AI model")
+
+        try:
+            data = json.loads(response_content.strip())
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON response from AI model: {e}")
+            return await self._handle_ai_failure(content, "Invalid JSON response from AI model")
+
+        # Parse response using subclass implementation
+        detected, categories, confidence = self.parse_ai_response(data)
+        verdict_cache = get_verdict_cache()
+        if cache_key is not None and verdict_cache is not None:
+            verdict_cache.put(
+                cache_key,
+                response_content,
+                self._get_detection_type(),
+                self.model_provider.get_model_name(),
+            )
+
+        blocked = detected and confidence >= self.confidence_threshold
+
+        # Build reason message
+        detection_type = self._get_detection_type().replace("_", " ")
+        categories_str = ", ".join(categories) if categories else "none"
+
+        return GuardrailResult(
+            blocked=blocked,
+            confidence=confidence,
+            reason=(
+                f"{detection_type.replace('_', ' ').title()} detected (AI): {categories_str}"
+                if detected
+                else f"No {detection_type.replace('_', ' ')} detected (AI)"
+            ),
+            details={
+                f"detected_{self.get_categories_field_name()}": categories,
+                "confidence": confidence,
+                "method": "ai",
+                "model": self.model_provider.get_model_name(),
+            },
+            guardrail_name=self.name,
+            guardrail_type=self.guardrail_type,
+        )
+
     async def _handle_ai_failure(
         self, content: str, error: str = "AI analysis failed"
     ) -> GuardrailResult:
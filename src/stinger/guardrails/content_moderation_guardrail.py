@@ -5,13 +5,15 @@ This filter uses OpenAI's content moderation API to detect and block inappropria
 """
 
 import logging
+from dataclasses import asdict
 from typing import Any, Dict, List, Optional
 
-from ..adapters.openai_adapter import OpenAIAdapter
+from ..adapters.openai_adapter import ModerationResult, OpenAIAdapter
 from ..core.api_key_manager import APIKeyManager
 from ..core.config_validator import AI_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
+from ..core.verdict_cache import get_verdict_cache, verdict_key
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,11 @@ logger = logging.getLogger(__name__)
 class ContentModerationGuardrail(GuardrailInterface):
     """Content moderation filter using OpenAI API."""
 
+    uses_ai = True
+
+    # The Moderation API is called without a model, so it uses its default
+    MODERATION_MODEL = "openai-moderation-default"
+
     def __init__(self, name: str, config: Dict[str, Any]):
         """Initialize the content moderation filter."""
         super().__init__(name, GuardrailType.CONTENT_MODERATION, config)
@@ -42,7 +49,7 @@ class ContentModerationGuardrail(GuardrailInterface):
         self.on_error = config.get("on_error", "allow")  # 'allow', 'block', 'warn'
 
         # API setup
-        self.api_key_manager = APIKeyManager()
+        self.api_key_manager = APIKeyManager.shared()
         self.openai_adapter: Optional[OpenAIAdapter] = None
         self._initialize_adapter()
 
@@ -84,7 +91,7 @@ class ContentModerationGuardrail(GuardrailInterface):
             if self.openai_adapter is None:
                 return self._handle_error(Exception("OpenAI adapter not initialized"))
 
-            moderation_result = await self.openai_adapter.moderate_content(content)
+            moderation_result = await self._moderate(content)
 
             # Determine action based on categories and scores
             blocked_categories = []
@@ -130,6 +137,22 @@ class ContentModerationGuardrail(GuardrailInterface):
             logger.error(f"Content moderation analysis failed for {self.name}: {e}")
             return self._handle_error(e)
 
+    async def _moderate(self, content: str) -> ModerationResult:
+        """Moderate content, reusing a cached verdict for content seen before."""
+        verdict_cache = get_verdict_cache()
+        if verdict_cache is None:
+            return await self.openai_adapter.moderate_content(content)
+
+        key = verdict_key("content_moderation", self.MODERATION_MODEL, "", content)
+        cached = verdict_cache.get(key)
+        if cached is not None:
+            return ModerationResult(**cached)
+        moderation_result = await self.openai_adapter.moderate_content(content)
+        verdict_cache.put(
+            key, asdict(moderation_result), "content_moderation", self.MODERATION_MODEL
+        )
+        return moderation_result
+
     def _build_reason(
         self, blocked_categories: list, warned_categories: list, max_score: float
     ) -> str:
@@ -0,0 +1,226 @@
+"""
+Fused AI Analysis
+
+A pipeline with several AI guardrails used to send one chat completion per
+guardrail, each with its own prompt and its own copy of the content. With
+``ai_fusion`` enabled, the AI guardrails of a check that use the same model are
+analyzed in one call instead: their prompt templates are combined into one
+structured prompt that carries the content once, and the model answers with one
+JSON object holding each guardrail's usual response under its detection type.
+
+Each guardrail then turns its part of the response into its result exactly as
+it would its own response, with its own threshold and on_error policy. A
+guardrail whose part is missing or unusable (for example because the combined
+response is not valid JSON) falls back to its own call. If the fused call
+itself fails, every guardrail it covered handles the error through its
+on_error policy, as it would a failure of its own call.
+
+Only guardrails built on BaseAIGuardrail (AI PII, toxicity and code generation
+detection) are fused. The fused call is made when the first of them runs, so in
+sequential pipelines the later ones reuse its answer. Verdicts cached by the
+verdict cache are reused, and only the guardrails without one are fused.
+
+get_fusion_stats() reports the fused calls and fallbacks, and the API's
+``/metrics`` endpoint exports it.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..core.guardrail_interface import GuardrailResult
+from .base_ai_guardrail import BaseAIGuardrail
+
+logger = logging.getLogger(__name__)
+
+FUSED_PROMPT = """
+You are running several independent checks on the same text. Each check below has its own instructions and JSON response format.
+
+{checks}
+
+Respond with a single JSON object that has one key per check ({names}). The value of each key is the JSON object that check asks for.
+
+Text to analyze: {content}
+"""
+
+CHECK_SECTION = """Check "{name}":
+{instructions}"""
+
+# Stands in for the content in each check's instructions; the content follows once at the end
+_CONTENT_REFERENCE = "(the text given at the end)"
+
+_stats = {"fused_calls": 0, "fused_guardrails": 0, "fallbacks": 0}
+
+
+def is_fusable(guardrail: Any) -> bool:
+    """Check whether a guardrail can be analyzed in a fused call."""
+    return (
+        isinstance(guardrail, BaseAIGuardrail)
+        and guardrail.enabled
+        and guardrail.model_provider is not None
+    )
+
+
+def build_fused_prompt(guardrails: List[BaseAIGuardrail], content: str) -> str:
+    """
+    Combine the prompts of several guardrails into one.
+
+    Args:
+        guardrails: Guardrails to analyze, one per detection type
+        content: Content to analyze
+
+    Returns:
+        The fused prompt
+    """
+    checks = "\n\n".join(
+        CHECK_SECTION.format(
+            name=guardrail._get_detection_type(),
+            instructions=guardrail.get_analysis_prompt().format(content=_CONTENT_REFERENCE).strip(),
+        )
+        for guardrail in guardrails
+    )
+    names = ", ".join(f'"{guardrail._get_detection_type()}"' for guardrail in guardrails)
+    return FUSED_PROMPT.format(checks=checks, names=names, content=content)
+
+
+def split_fused_response(
+    response_content: Optional[str], guardrails: List[BaseAIGuardrail]
+) -> Dict[str, str]:
+    """
+    Split a fused response into the responses of its guardrails.
+
+    Returns:
+        JSON response by detection type; types without a usable part are left out
+    """
+    try:
+        data = json.loads((response_content or "").strip())
+    except json.JSONDecodeError as e:
+        logger.warning(f"Invalid JSON response to fused AI analysis: {e}")
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    responses = {}
+    for guardrail in guardrails:
+        detection_type = guardrail._get_detection_type()
+        part = data.get(detection_type)
+        if isinstance(part, dict):
+            responses[detection_type] = json.dumps(part)
+    return responses
+
+
+class FusedAIAnalysis:
+    """The fused AI calls of one check, shared by the guardrails they cover."""
+
+    def __init__(self, groups: Dict[str, List[BaseAIGuardrail]], content: str):
+        """
+        Args:
+            groups: Fusable guardrails by model name
+            content: Content of the check
+        """
+        self.content = content
+        self._groups = groups
+        self._covered = {id(guardrail) for group in groups.values() for guardrail in group}
+        self._calls: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+    @classmethod
+    def plan(cls, guardrails: Iterable[Any], content: str) -> Optional["FusedAIAnalysis"]:
+        """
+        Plan the fused calls for a check.
+
+        A fused response holds one part per detection type, so only the first
+        guardrail of each type is fused; later ones of the same type (which may
+        use their own prompt) make their own call.
+
+        Returns:
+            The fused analysis, or None if no two guardrails share a model
+        """
+        groups: Dict[str, List[BaseAIGuardrail]] = {}
+        for guardrail in guardrails:
+            if not is_fusable(guardrail):
+                continue
+            group = groups.setdefault(guardrail.model_provider.get_model_name(), [])
+            detection_type = guardrail._get_detection_type()
+            if all(other._get_detection_type() != detection_type for other in group):
+                group.append(guardrail)
+        groups = {model: group for model, group in groups.items() if len(group) > 1}
+        return cls(groups, content) if groups else None
+
+    def covers(self, guardrail: Any) -> bool:
+        """Check whether a guardrail is analyzed by one of the fused calls."""
+        return id(guardrail) in self._covered
+
+    async def analyze(self, guardrail: BaseAIGuardrail) -> GuardrailResult:
+        """Get a guardrail's result from the fused call of its model."""
+        model = guardrail.model_provider.get_model_name()
+        call = self._calls.get(model)
+        if call is None:
+            # One task per model, so a guardrail timing out does not cancel it for the others
+            call = self._calls[model] = asyncio.get_running_loop().create_task(
+                self._run(self._groups[model])
+            )
+            call.add_done_callback(_retrieve_exception)
+
+        detection_type = guardrail._get_detection_type()
+        try:
+            responses = await asyncio.shield(call)
+            response = responses.get(detection_type)
+            if response is None:
+                _stats["fallbacks"] += 1
+                return await guardrail.analyze(self.content)
+            response_content, cache_key = response
+            return await guardrail._analyze_response(self.content, response_content, cache_key)
+        except Exception as e:
+            logger.error(f"AI {detection_type} error: {e}")
+            return await guardrail._handle_ai_failure(self.content, str(e))
+
+    async def _run(self, group: List[BaseAIGuardrail]) -> Dict[str, Any]:
+        """Make the fused call; returns (response, cache key to store it under) by type."""
+        responses: Dict[str, Any] = {}
+        pending: Dict[str, BaseAIGuardrail] = {}
+        cache_keys: Dict[str, Optional[str]] = {}
+        for guardrail in group:
+            detection_type = guardrail._get_detection_type()
+            cache_key = guardrail._verdict_key(self.content)
+            cached = guardrail._cached_response(cache_key)
+            if cached is not None:
+                responses[detection_type] = (cached, None)
+            else:
+                pending[detection_type] = guardrail
+                cache_keys[detection_type] = cache_key
+        if not pending:
+            return responses
+
+        guardrails = list(pending.values())
+        provider = guardrails[0].model_provider
+        if len(guardrails) == 1:
+            # Nothing to fuse: use the guardrail's own prompt
+            prompt = guardrails[0].get_analysis_prompt().format(content=self.content)
+            fresh = {guardrails[0]._get_detection_type(): await provider.generate_response(prompt)}
+        else:
+            # Room for every guardrail's usual response
+            max_tokens = getattr(provider, "max_tokens", 500) * len(guardrails)
+            response_content = await provider.generate_response(
+                build_fused_prompt(guardrails, self.content), max_tokens=max_tokens
+            )
+            _stats["fused_calls"] += 1
+            _stats["fused_guardrails"] += len(guardrails)
+            fresh = split_fused_response(response_content, guardrails)
+
+        for detection_type, response_content in fresh.items():
+            responses[detection_type] = (response_content, cache_keys[detection_type])
+        return responses
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Mark the exception retrieved, in case every guardrail stopped waiting
+    if not task.cancelled():
+        task.exception()
+
+
+def get_fusion_stats() -> Dict[str, Any]:
+    """Get the number of fused AI calls and of guardrails that fell back to their own."""
+    stats = dict(_stats)
+    stats["calls_saved"] = stats["fused_guardrails"] - stats["fused_calls"] - stats["fallbacks"]
+    return stats
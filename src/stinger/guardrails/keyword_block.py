@@ -3,9 +3,13 @@ from typing import List, Optional
 from ..core.config_validator import COMMON_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
+from ..core.keyword_matcher import KeywordMatcher
 
 
 class KeywordBlockGuardrail(GuardrailInterface):
+    supports_streaming = True
+    cpu_bound = True
+
     def __init__(self, config: dict):
         """Initialize keyword block filter."""
         name = config.get("name", "keyword_block")
@@ -28,6 +32,12 @@ class KeywordBlockGuardrail(GuardrailInterface):
         self.case_sensitive = nested_config.get(
             "case_sensitive", config.get("case_sensitive", False)
         )
+        self.word_boundary = nested_config.get("word_boundary", config.get("word_boundary", False))
+        self._build_matcher()
+
+    def _build_matcher(self):
+        """Build the matcher used by analyze; matching is always case-insensitive."""
+        self.matcher = KeywordMatcher.shared([self.keyword], word_boundary=self.word_boundary)
 
     def get_validation_rules(self) -> List[ValidationRule]:
         """Get validation rules for keyword block guardrail."""
@@ -38,7 +48,8 @@ class KeywordBlockGuardrail(GuardrailInterface):
                 field_type=str,
                 min_length=1,
                 error_message="keyword must be a non-empty string",
-            )
+            ),
+            ValidationRule(field="word_boundary", required=False, field_type=bool),
         ]
 
     async def analyze(
@@ -67,7 +78,7 @@ class KeywordBlockGuardrail(GuardrailInterface):
                 risk_level="low",
             )
 
-        if self.keyword in content.lower():
+        if self.matcher.search(content):
             return GuardrailResult(
                 blocked=True,
                 confidence=1.0,
@@ -99,6 +110,7 @@ class KeywordBlockGuardrail(GuardrailInterface):
             "type": self.guardrail_type.value,
             "enabled": self.enabled,
             "keyword": self.keyword,
+            "word_boundary": self.word_boundary,
         }
 
     def update_config(self, config: dict) -> bool:
@@ -106,8 +118,12 @@ class KeywordBlockGuardrail(GuardrailInterface):
         try:
             if "keyword" in config:
                 self.keyword = config["keyword"].lower()
+            if "word_boundary" in config:
+                self.word_boundary = config["word_boundary"]
             if "enabled" in config:
                 self.enabled = config["enabled"]
+            if "keyword" in config or "word_boundary" in config:
+                self._build_matcher()
             return True
         except Exception:
             return False
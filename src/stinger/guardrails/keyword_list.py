@@ -1,21 +1,40 @@
 import logging
+import time
 from pathlib import Path
+from threading import Lock
 from typing import List, Optional, Tuple
 
 from ..core.config_validator import KEYWORD_GUARDRAIL_RULES, ConfigValidator, ValidationRule
 from ..core.conversation import Conversation
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
+from ..core.keyword_file import CompiledKeywordMatcher, KeywordListFile, load_compiled_keywords
+from ..core.keyword_matcher import KeywordMatcher
 from ..utils.exceptions import GuardrailError
 
 logger = logging.getLogger(__name__)
 
+# Seconds between checks of keyword files for changes
+DEFAULT_RELOAD_INTERVAL = 60.0
+
+# Settings update_config keeps in self.config, and those also kept as attributes
+_CONFIG_KEYS = ("keywords", "keywords_file")
+_ATTRIBUTE_KEYS = ("case_sensitive", "word_boundary", "reload_interval")
+# Settings after which update_config loads the keywords again
+_RELOAD_KEYS = {"keywords", "keywords_file", "case_sensitive", "reload_interval"}
+
 
 class KeywordListGuardrail(GuardrailInterface):
     """
     Filter that blocks content containing any of a list of keywords.
     Supports both inline keywords and loading from external files.
+
+    A keyword file compiled with ``stinger compile-keywords`` is memory-mapped
+    instead of parsed (see keyword_file).
     """
 
+    supports_streaming = True
+    cpu_bound = True
+
     def __init__(self, config: dict):
         """Initialize keyword list filter."""
         name = config.get("name", "keyword_list")
@@ -39,6 +58,13 @@ class KeywordListGuardrail(GuardrailInterface):
         self.case_sensitive = nested_config.get(
             "case_sensitive", config.get("case_sensitive", False)
         )
+        self.word_boundary = nested_config.get("word_boundary", config.get("word_boundary", False))
+        self.reload_interval = nested_config.get(
+            "reload_interval", config.get("reload_interval", DEFAULT_RELOAD_INTERVAL)
+        )
+        self._compiled = None
+        self._keywords_file: Optional[KeywordListFile] = None
+        self._reload_lock = Lock()
 
         self._load_keywords()
 
@@ -66,51 +92,127 @@ class KeywordListGuardrail(GuardrailInterface):
         """Load keywords from config or file."""
         # Handle nested config structure
         nested_config = self.config.get("config", {})
-
-        # Get inline keywords from nested or flat config
-        inline_keywords = nested_config.get("keywords", self.config.get("keywords", []))
-        if isinstance(inline_keywords, str):
-            inline_keywords = [inline_keywords]
+        inline_keywords = self._inline_keywords()
 
         # Get file path for keywords from nested or flat config
         keywords_file = nested_config.get("keywords_file", self.config.get("keywords_file"))
 
+        self._keywords_file = None
         if keywords_file:
+            # Resolve relative path from config file location
+            config_dir = self.config.get("_config_dir", ".")
+            self._keywords_file = KeywordListFile(
+                Path(config_dir) / keywords_file, self.reload_interval
+            )
             try:
-                file_keywords = self._load_keywords_from_file(keywords_file)
-                # Combine file keywords with inline keywords (file takes precedence)
-                self.keywords = file_keywords + [
-                    kw for kw in inline_keywords if kw not in file_keywords
-                ]
+                self._load_keywords_file(inline_keywords)
+                return
             except Exception as e:
                 # If file loading fails, use only inline keywords
                 from ..core.error_handling import safe_error_message, sanitize_path
 
                 safe_path = sanitize_path(keywords_file)
                 safe_msg = safe_error_message(e, f"loading keywords from file {safe_path}")
-                self.keywords = inline_keywords
                 logger.warning(f"{safe_msg}")
                 logger.warning(f"Using fallback keywords: {inline_keywords}")
-        else:
-            self.keywords = inline_keywords
 
         # Validate keywords
-        if not self.keywords:
+        if not inline_keywords:
             raise GuardrailError("No keywords provided for KeywordListGuardrail")
 
         # Convert to lowercase for case-insensitive matching
-        if not self.case_sensitive:
-            self.keywords = [kw.lower() for kw in self.keywords]
+        self.keywords = self._normalize_case(inline_keywords)
+        self._compiled = None
+        self._build_matcher()
 
-    def _load_keywords_from_file(self, file_path: str) -> List[str]:
-        """Load keywords from a text file."""
-        # Resolve relative path from config file location
-        config_dir = self.config.get("_config_dir", ".")
-        resolved_path = Path(config_dir) / file_path
+    def _inline_keywords(self) -> List[str]:
+        """Get inline keywords from nested or flat config."""
+        nested_config = self.config.get("config", {})
+        inline_keywords = nested_config.get("keywords", self.config.get("keywords", []))
+        if isinstance(inline_keywords, str):
+            inline_keywords = [inline_keywords]
+        return inline_keywords
+
+    def _normalize_case(self, keywords: List[str]) -> List[str]:
+        """Lower-case keywords for case-insensitive matching."""
+        return keywords if self.case_sensitive else [kw.lower() for kw in keywords]
+
+    def _load_keywords_file(self, inline_keywords: List[str]):
+        """Load the keyword file, combined with inline keywords (file keywords come first)."""
+        keywords_file = self._keywords_file
+        if not keywords_file.path.exists():
+            raise FileNotFoundError(f"Keywords file not found: {keywords_file.path}")
+
+        digest = keywords_file.mark_loaded(time.monotonic())
+        compiled = load_compiled_keywords(keywords_file.path, self.case_sensitive, digest)
+        matcher = None
+        if compiled is not None:
+            try:
+                matcher = CompiledKeywordMatcher.shared(
+                    compiled,
+                    self._normalize_case(inline_keywords),
+                    word_boundary=self.word_boundary,
+                )
+                keywords = matcher.keywords
+            except Exception as e:
+                # A broken compiled file must not drop the list: read the text file
+                logger.warning(
+                    f"Cannot use compiled {keywords_file.path.name} ({e}); "
+                    "reading the keyword file instead"
+                )
+                compiled = None
+        if compiled is None:
+            file_keywords = self._load_keywords_from_file(keywords_file.path)
+            keywords = self._normalize_case(
+                file_keywords + [kw for kw in inline_keywords if kw not in file_keywords]
+            )
+
+        if not keywords:
+            raise GuardrailError("No keywords provided for KeywordListGuardrail")
+
+        self._compiled = compiled
+        self.keywords = keywords
+        if matcher is not None:
+            self.matcher = matcher
+        else:
+            self._build_matcher()
+
+    def _build_matcher(self):
+        """Build the matcher used by analyze from the loaded keywords."""
+        if self._compiled is not None:
+            # Inline keywords follow those of the compiled file
+            inline_keywords = list(self.keywords[len(self._compiled) :])
+            self.matcher = CompiledKeywordMatcher.shared(
+                self._compiled, inline_keywords, word_boundary=self.word_boundary
+            )
+            return
+        self.matcher = KeywordMatcher.shared(
+            self.keywords, case_sensitive=self.case_sensitive, word_boundary=self.word_boundary
+        )
 
-        if not resolved_path.exists():
-            raise FileNotFoundError(f"Keywords file not found: {resolved_path}")
+    def _reload_changed_file(self):
+        """Reload the keyword file if its content changed since it was loaded."""
+        if self._keywords_file is None or not self._keywords_file.changed(time.monotonic()):
+            return
+        # Concurrent checks skip the reload instead of waiting for it
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._load_keywords_file(self._inline_keywords())
+            logger.info(
+                f"Reloaded {len(self.keywords)} keywords for {self.name} "
+                f"from {self._keywords_file.path.name}"
+            )
+        except Exception as e:
+            from ..core.error_handling import safe_error_message, sanitize_path
 
+            safe_path = sanitize_path(str(self._keywords_file.path))
+            logger.warning(safe_error_message(e, f"reloading keywords from file {safe_path}"))
+        finally:
+            self._reload_lock.release()
+
+    def _load_keywords_from_file(self, resolved_path: Path) -> List[str]:
+        """Load keywords from a text file."""
         keywords = []
         try:
             with open(resolved_path, "r", encoding="utf-8") as f:
@@ -138,6 +240,8 @@ class KeywordListGuardrail(GuardrailInterface):
         self, content: str, conversation: Optional["Conversation"] = None
     ) -> GuardrailResult:
         """Analyze content for blocked keywords."""
+        self._reload_changed_file()
+
         if not content:
             return GuardrailResult(
                 blocked=False,
@@ -160,14 +264,8 @@ class KeywordListGuardrail(GuardrailInterface):
                 risk_level="low",
             )
 
-        # Prepare content for matching
-        content_to_check = content if self.case_sensitive else content.lower()
-
-        # Check for matches
-        matched_keywords = []
-        for keyword in self.keywords:
-            if keyword in content_to_check:
-                matched_keywords.append(keyword)
+        # Single pass over the content, however many keywords there are
+        matched_keywords = self.matcher.find_all(content)
 
         if matched_keywords:
             return GuardrailResult(
@@ -178,6 +276,7 @@ class KeywordListGuardrail(GuardrailInterface):
                     "matched_keywords": matched_keywords,
                     "total_keywords": len(self.keywords),
                     "case_sensitive": self.case_sensitive,
+                    "word_boundary": self.word_boundary,
                 },
                 guardrail_name=self.name,
                 guardrail_type=self.guardrail_type,
@@ -208,28 +307,31 @@ class KeywordListGuardrail(GuardrailInterface):
             "name": self.name,
             "type": self.guardrail_type.value,
             "enabled": self.enabled,
-            "keywords": self.keywords,
+            "keywords": list(self.keywords),
             "case_sensitive": self.case_sensitive,
+            "word_boundary": self.word_boundary,
             "keywords_file": self.config.get("keywords_file"),
+            "reload_interval": self.reload_interval,
         }
 
     def update_config(self, config: dict) -> bool:
         """Update configuration."""
         try:
             # Update config dict for _load_keywords compatibility
-            if "keywords" in config:
-                self.config["keywords"] = config["keywords"]
-            if "keywords_file" in config:
-                self.config["keywords_file"] = config["keywords_file"]
-            if "case_sensitive" in config:
-                self.case_sensitive = config["case_sensitive"]
-                self.config["case_sensitive"] = config["case_sensitive"]
+            for key in _CONFIG_KEYS + _ATTRIBUTE_KEYS:
+                if key in config:
+                    self.config[key] = config[key]
+            for key in _ATTRIBUTE_KEYS:
+                if key in config:
+                    setattr(self, key, config[key])
             if "enabled" in config:
                 self.enabled = config["enabled"]
 
             # Reload keywords if keywords or file changed
-            if "keywords" in config or "keywords_file" in config or "case_sensitive" in config:
+            if _RELOAD_KEYS.intersection(config):
                 self._load_keywords()
+            elif "word_boundary" in config:
+                self._build_matcher()
 
             return True
         except Exception:
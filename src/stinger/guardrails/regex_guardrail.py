@@ -1,13 +1,19 @@
 import re
+from dataclasses import asdict
 from typing import List, Optional
 
+from ..core.artifacts import intern_artifact
 from ..core.config_validator import REGEX_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
 from ..core.regex_security import RegexSecurityValidator, SecurityError
+from ..core.regex_set import RegexPatternSet
 
 
 class RegexGuardrail(GuardrailInterface):
+    supports_streaming = True
+    cpu_bound = True
+
     def __init__(self, config: dict):
         """Initialize regex filter."""
         name = config.get("name", "regex_filter")
@@ -39,23 +45,7 @@ class RegexGuardrail(GuardrailInterface):
         self.security_validator = RegexSecurityValidator()
 
         # Compile patterns with security validation
-        self.compiled_patterns = []
-        for pattern in self.patterns:
-            try:
-                # Validate pattern for security before compiling
-                is_safe, reason = self.security_validator.validate_pattern(pattern)
-                if not is_safe:
-                    raise SecurityError(f"Unsafe regex pattern '{pattern}': {reason}")
-
-                flags = 0 if self.case_sensitive else re.IGNORECASE
-                flags |= self.flags
-
-                # Use safe compilation
-                compiled = self.security_validator.safe_compile(pattern, flags)
-                self.compiled_patterns.append(compiled)
-
-            except (re.error, SecurityError) as e:
-                raise ValueError(f"Invalid or unsafe regex pattern '{pattern}': {str(e)}")
+        self._compile_patterns()
 
     def get_validation_rules(self) -> List[ValidationRule]:
         """Get validation rules for regex guardrail."""
@@ -76,19 +66,8 @@ class RegexGuardrail(GuardrailInterface):
                 risk_level="low",
             )
 
-        matches = []
-        for i, pattern in enumerate(self.compiled_patterns):
-            try:
-                # Use safe search with timeout protection
-                match = self.security_validator.safe_search(pattern, content)
-                if match:
-                    matches.append(self.patterns[i])
-            except SecurityError as e:
-                # Log security error but continue processing other patterns
-                import logging
-
-                logging.warning(f"Regex security error for pattern '{self.patterns[i]}': {e}")
-                continue
+        # One timeout-protected scan of the union; patterns are confirmed only on a hit
+        matches = self.pattern_set.search(content)
 
         if matches:
             return GuardrailResult(
@@ -152,20 +131,25 @@ class RegexGuardrail(GuardrailInterface):
 
     def _compile_patterns(self):
         """Recompile patterns after configuration update."""
-        self.compiled_patterns = []
-        for pattern in self.patterns:
-            try:
-                # Validate pattern for security before compiling
-                is_safe, reason = self.security_validator.validate_pattern(pattern)
-                if not is_safe:
-                    raise SecurityError(f"Unsafe regex pattern '{pattern}': {reason}")
-
-                flags = 0 if self.case_sensitive else re.IGNORECASE
-                flags |= self.flags
-
-                # Use safe compilation
-                compiled = self.security_validator.safe_compile(pattern, flags)
-                self.compiled_patterns.append(compiled)
-
-            except (re.error, SecurityError) as e:
-                raise ValueError(f"Invalid or unsafe regex pattern '{pattern}': {str(e)}")
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        flags |= self.flags
+
+        def build() -> RegexPatternSet:
+            compiled_patterns = []
+            for pattern in self.patterns:
+                try:
+                    # Validated and compiled once; the compile itself is timed
+                    compiled_patterns.append(self.security_validator.safe_compile(pattern, flags))
+                except (re.error, SecurityError) as e:
+                    raise ValueError(f"Invalid or unsafe regex pattern '{pattern}': {str(e)}")
+            return RegexPatternSet(
+                list(self.patterns), compiled_patterns, flags, self.security_validator
+            )
+
+        # Guardrails with the same patterns and security settings share one compiled set
+        self.pattern_set = intern_artifact(
+            "regex_set",
+            [self.patterns, flags, asdict(self.security_validator.config)],
+            build,
+        )
+        self.compiled_patterns = self.pattern_set.compiled_patterns
@@ -9,6 +9,7 @@ import logging
 import re
 from typing import Any, Dict, List, Optional
 
+from ..core.category_matcher import CategoryMatcher
 from ..core.config_validator import COMMON_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
@@ -19,22 +20,24 @@ logger = logging.getLogger(__name__)
 class SimpleCodeGenerationGuardrail(GuardrailInterface):
     """Regex-based code generation detection filter."""
 
+    cpu_bound = True
+
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, GuardrailType.CODE_GENERATION, config)
 
         self.code_patterns = {
             "code_requests": [
-                r"\b(write|create|generate|code|implement|build)\s+.*?(function|script|program|query|class|api|endpoint)\b",
+                r"\b(write|create|generate|code|implement|build)\s+.{0,200}?(function|script|program|query|class|api|endpoint)\b",
                 r"\b(write|create|generate|code|implement|build)\s+a\s+\w+\s+(function|script|program|query|class|api|endpoint)\b",
                 r"\b(generate|create|write)\s+(sql|javascript|python|java|code|script)\b",
                 r"\bcode\s+a\s+solution\b",
                 r"\bimplement\s+a\s+\w+\b",
             ],
             "code_blocks": [
-                r"```[\w]*\n.*?\n```",  # Markdown code blocks
-                r"`.*?`",  # Inline code
-                r"<code>.*?</code>",  # HTML code tags
-                r"<pre>.*?</pre>",  # HTML pre tags
+                r"```[\w]*\n.{0,20000}?\n```",  # Markdown code blocks
+                r"`[^`]{0,2000}`",  # Inline code
+                r"<code>.{0,20000}?</code>",  # HTML code tags
+                r"<pre>.{0,20000}?</pre>",  # HTML pre tags
             ],
             "programming_keywords": [
                 r"\b(function|def|class|import|export|require|var|let|const)\b",
@@ -60,6 +63,8 @@ class SimpleCodeGenerationGuardrail(GuardrailInterface):
                 r"\b(git|svn|npm|pip|apt|yum|brew)\b",
             ],
         }
+        # Compiled once; each category is matched with a single scan
+        self.matcher = CategoryMatcher.shared(self.code_patterns, re.IGNORECASE | re.DOTALL)
 
         # Handle nested config structure from pipeline configuration
         nested_config = config.get("config", {})
@@ -106,26 +111,18 @@ class SimpleCodeGenerationGuardrail(GuardrailInterface):
             confidence_scores = {}
             total_keywords = 0
 
-            for category, patterns in self.code_patterns.items():
-                if category in self.enabled_categories:
-                    category_matches = 0
-                    for pattern in patterns:
-                        matches = re.findall(pattern, content, re.IGNORECASE | re.DOTALL)
-                        category_matches += len(matches)
-
-                    if category_matches > 0:
-                        detected_code.append(category)
-                        total_keywords += category_matches
-                        # Calculate confidence based on category and number of matches
-                        if category == "code_requests":
-                            base_confidence = 0.6  # High confidence for explicit code requests
-                        elif category == "code_blocks":
-                            base_confidence = 0.4
-                        else:
-                            base_confidence = 0.2
-                        confidence_scores[category] = min(
-                            0.9, base_confidence + category_matches * 0.15
-                        )
+            enabled = [c for c in self.code_patterns if c in self.enabled_categories]
+            for category, category_matches in self.matcher.count(content, enabled).items():
+                detected_code.append(category)
+                total_keywords += category_matches
+                # Calculate confidence based on category and number of matches
+                if category == "code_requests":
+                    base_confidence = 0.6  # High confidence for explicit code requests
+                elif category == "code_blocks":
+                    base_confidence = 0.4
+                else:
+                    base_confidence = 0.2
+                confidence_scores[category] = min(0.9, base_confidence + category_matches * 0.15)
 
             # Code requests are explicit, so require fewer matches
             min_required = 1 if "code_requests" in detected_code else self.min_keywords
@@ -3,15 +3,17 @@ Simple PII Detection Filter
 
 This module provides a regex-based PII detection filter that can identify
 various types of personally identifiable information without requiring AI.
+Detection uses a single-pass PIIScanner, which confirms candidates with
+checksum and range validators.
 """
 
 import logging
-import re
 from typing import Any, Dict, List, Optional
 
 from ..core.config_validator import COMMON_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
+from ..core.pii_scanner import PII_TYPES, PIIScanner
 
 logger = logging.getLogger(__name__)
 
@@ -19,19 +21,13 @@ logger = logging.getLogger(__name__)
 class SimplePIIDetectionGuardrail(GuardrailInterface):
     """Regex-based PII detection filter."""
 
+    supports_streaming = True
+    cpu_bound = True
+
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, GuardrailType.PII_DETECTION, config)
 
-        self.pii_patterns = {
-            "ssn": r"\b\d{3}-?\d{2}-?\d{4}\b",
-            "credit_card": r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b",
-            "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-            "phone": r"\b(\+\d{1,2}\s?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b",
-            "ip_address": r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b",
-            "driver_license": r"\b[A-Z]{1,2}\d{6,8}\b",
-            "passport": r"\b[A-Z]{1,2}\d{6,9}\b",
-            "bank_account": r"\b\d{8,17}\b",
-        }
+        self.pii_patterns = dict(PII_TYPES)
 
         # Handle nested config structure from pipeline configuration
         nested_config = config.get("config", {})
@@ -53,6 +49,7 @@ class SimplePIIDetectionGuardrail(GuardrailInterface):
                 logger.warning(f"Unknown PII pattern '{pattern}' in filter '{name}'")
 
         self.enabled_patterns = valid_patterns
+        self.scanner = PIIScanner.shared(self.enabled_patterns)
 
     def get_validation_rules(self) -> List[ValidationRule]:
         """Get validation rules for simple PII detection guardrail."""
@@ -73,20 +70,23 @@ class SimplePIIDetectionGuardrail(GuardrailInterface):
             )
 
         try:
+            matches = self.scanner.scan(content)
+            match_counts: Dict[str, int] = {}
+            for match in matches:
+                match_counts[match.pii_type] = match_counts.get(match.pii_type, 0) + 1
+
             detected_pii = []
             confidence_scores = {}
-
-            for pii_type, pattern in self.pii_patterns.items():
-                if pii_type in self.enabled_patterns:
-                    matches = re.findall(pattern, content, re.IGNORECASE)
-                    if matches:
-                        detected_pii.append(pii_type)
-                        # Calculate confidence based on PII type and number of matches
-                        # High confidence for unambiguous patterns like SSN, credit cards, and emails
-                        if pii_type in ["ssn", "credit_card", "email", "phone"]:
-                            confidence_scores[pii_type] = min(0.95, 0.8 + len(matches) * 0.05)
-                        else:
-                            confidence_scores[pii_type] = min(0.9, 0.5 + len(matches) * 0.1)
+            for pii_type in self.scanner.pii_types:
+                count = match_counts.get(pii_type)
+                if count:
+                    detected_pii.append(pii_type)
+                    # Calculate confidence based on PII type and number of matches
+                    # High confidence for unambiguous patterns like SSN, credit cards, and emails
+                    if pii_type in ["ssn", "credit_card", "email", "phone"]:
+                        confidence_scores[pii_type] = min(0.95, 0.8 + count * 0.05)
+                    else:
+                        confidence_scores[pii_type] = min(0.9, 0.5 + count * 0.1)
 
             if detected_pii:
                 max_confidence = max(confidence_scores.values())
@@ -99,6 +99,7 @@ class SimplePIIDetectionGuardrail(GuardrailInterface):
                     details={
                         "detected_pii": detected_pii,
                         "confidence_scores": confidence_scores,
+                        "matches": [match.to_dict() for match in matches],
                         "method": "regex",
                     },
                     guardrail_name=self.name,
@@ -109,7 +110,12 @@ class SimplePIIDetectionGuardrail(GuardrailInterface):
                     blocked=False,
                     confidence=0.0,
                     reason="No PII detected (regex)",
-                    details={"detected_pii": [], "confidence_scores": {}, "method": "regex"},
+                    details={
+                        "detected_pii": [],
+                        "confidence_scores": {},
+                        "matches": [],
+                        "method": "regex",
+                    },
                     guardrail_name=self.name,
                     guardrail_type=self.guardrail_type,
                 )
@@ -145,6 +151,7 @@ class SimplePIIDetectionGuardrail(GuardrailInterface):
             if "enabled" in config:
                 self.enabled = config["enabled"]
             if "patterns" in config:
+                self.scanner = PIIScanner.shared(config["patterns"])
                 self.enabled_patterns = config["patterns"]
             if "confidence_threshold" in config:
                 self.confidence_threshold = config["confidence_threshold"]
@@ -9,9 +9,11 @@ import logging
 import re
 from typing import Any, Dict, List, Optional
 
+from ..core.category_matcher import CategoryMatcher
 from ..core.config_validator import COMMON_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
+from ..core.normalization import normalized
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,9 @@ logger = logging.getLogger(__name__)
 class SimpleToxicityDetectionGuardrail(GuardrailInterface):
     """Regex-based toxicity detection filter."""
 
+    supports_streaming = True
+    cpu_bound = True
+
     def __init__(self, name: str, config: Dict[str, Any]):
         super().__init__(name, GuardrailType.TOXICITY_DETECTION, config)
 
@@ -40,9 +45,9 @@ class SimpleToxicityDetectionGuardrail(GuardrailInterface):
                 r"\b(i\s+hope\s+you\s+die|i\s+wish\s+you\s+were\s+dead)\b",
             ],
             "sexual_harassment": [
-                r"\b(sexual|nude|porn|explicit)\b.*\b(harass|assault|abuse)\b",
+                r"\b(sexual|nude|porn|explicit)\b.{0,200}?\b(harass|assault|abuse)\b",
                 r"\b(rape|molest|grope|fondle)\b",
-                r"\b(sexy|hot|beautiful)\b.*\b(send\s+pics|show\s+me)\b",
+                r"\b(sexy|hot|beautiful)\b.{0,200}?\b(send\s+pics|show\s+me)\b",
                 r"\b(porn\s+site|porn\s+video|xxx|adult\s+content)\b",
             ],
             "violence": [
@@ -52,6 +57,8 @@ class SimpleToxicityDetectionGuardrail(GuardrailInterface):
                 r"\b(let's\s+fight|wanna\s+fight|fight\s+me)\b",
             ],
         }
+        # Compiled once; each category is matched with a single scan
+        self.matcher = CategoryMatcher.shared(self.toxicity_patterns, re.IGNORECASE)
 
         # Handle nested config structure from pipeline configuration
         nested_config = config.get("config", {})
@@ -110,29 +117,22 @@ class SimpleToxicityDetectionGuardrail(GuardrailInterface):
             detected_toxicity = []
             confidence_scores = {}
 
-            for category, patterns in self.toxicity_patterns.items():
-                if category in self.enabled_categories:
-                    category_matches = 0
-                    for pattern in patterns:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        category_matches += len(matches)
-
-                    if category_matches > 0:
-                        detected_toxicity.append(category)
-                        # Calculate confidence based on category and number of matches
-                        # Higher base confidence for more serious categories
-                        if category in [
-                            "hate_speech",
-                            "harassment",
-                            "threats",
-                            "sexual_harassment",
-                        ]:
-                            base_confidence = 0.6
-                        else:
-                            base_confidence = 0.3
-                        confidence_scores[category] = min(
-                            0.95, base_confidence + category_matches * 0.15
-                        )
+            enabled = [c for c in self.toxicity_patterns if c in self.enabled_categories]
+            text = normalized(content).canonical
+            for category, category_matches in self.matcher.count(text, enabled).items():
+                detected_toxicity.append(category)
+                # Calculate confidence based on category and number of matches
+                # Higher base confidence for more serious categories
+                if category in [
+                    "hate_speech",
+                    "harassment",
+                    "threats",
+                    "sexual_harassment",
+                ]:
+                    base_confidence = 0.6
+                else:
+                    base_confidence = 0.3
+                confidence_scores[category] = min(0.95, base_confidence + category_matches * 0.15)
 
             if detected_toxicity:
                 max_confidence = max(confidence_scores.values())
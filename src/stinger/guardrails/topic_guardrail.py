@@ -7,13 +7,16 @@ It can be used to restrict or allow content based on predefined topic lists.
 
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from ..core.artifacts import intern_artifact
 from ..core.config_validator import TOPIC_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
 
 # FilterResult removed - now using GuardrailResult only
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
+from ..core.keyword_matcher import KeywordMatcher
+from ..core.regex_set import RegexPatternSet
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,8 @@ class TopicGuardrail(GuardrailInterface):
     - Provide confidence scoring based on match strength
     """
 
+    cpu_bound = True
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the topic filter.
@@ -61,9 +66,10 @@ class TopicGuardrail(GuardrailInterface):
             "confidence_threshold", config.get("confidence_threshold", 0.5)
         )
 
-        # Compile regex patterns if needed
-        self._compiled_allow_patterns: List[re.Pattern] = []
-        self._compiled_deny_patterns: List[re.Pattern] = []
+        # Both topic lists are matched together, by one automaton or regex pattern set
+        self._matched_topics: List[Tuple[str, str]] = []
+        self._literal_matcher: Optional[KeywordMatcher] = None
+        self._pattern_set: Optional[RegexPatternSet] = None
         self._compile_patterns()
 
         logger.info(f"Initialized TopicGuardrail '{self.name}' with mode '{self.mode}'")
@@ -73,36 +79,50 @@ class TopicGuardrail(GuardrailInterface):
         return TOPIC_GUARDRAIL_RULES
 
     def _compile_patterns(self) -> None:
-        """Compile regex patterns for topic matching."""
-        self._compiled_allow_patterns = []
-        self._compiled_deny_patterns = []
+        """
+        Build the matcher for both topic lists.
 
-        flags = 0 if self.case_sensitive else re.IGNORECASE
+        Plain topics go into one Aho-Corasick automaton (see KeywordMatcher) and
+        regex topics into one pattern set, so content is scanned once for all
+        topics of both lists however long they are. Invalid regex topics are skipped.
+        """
+        topics = [("allow", topic) for topic in self.allow_topics] + [
+            ("deny", topic) for topic in self.deny_topics
+        ]
+        self._literal_matcher = None
+        self._pattern_set = None
 
         if self.use_regex:
-            # Compile regex patterns
-            for topic in self.allow_topics:
-                try:
-                    pattern = re.compile(topic, flags)
-                    self._compiled_allow_patterns.append(pattern)
-                except re.error as e:
-                    logger.warning(f"Invalid regex pattern in allow_topics: {topic} - {e}")
-
-            for topic in self.deny_topics:
-                try:
-                    pattern = re.compile(topic, flags)
-                    self._compiled_deny_patterns.append(pattern)
-                except re.error as e:
-                    logger.warning(f"Invalid regex pattern in deny_topics: {topic} - {e}")
+            flags = 0 if self.case_sensitive else re.IGNORECASE
+
+            def build() -> RegexPatternSet:
+                valid = []
+                compiled = []
+                for list_name, topic in topics:
+                    try:
+                        compiled.append(re.compile(topic, flags))
+                        valid.append(topic)
+                    except re.error as e:
+                        logger.warning(
+                            f"Invalid regex pattern in {list_name}_topics: {topic} - {e}"
+                        )
+                return RegexPatternSet(valid, compiled, flags)
+
+            # Guardrails with the same topics share one compiled pattern set
+            self._pattern_set = intern_artifact("topic_regex", [topics, flags], build)
+            # Valid topics keep their order, and an invalid topic never equals a valid one
+            patterns = self._pattern_set.patterns
+            self._matched_topics = []
+            for list_name, topic in topics:
+                position = len(self._matched_topics)
+                if position < len(patterns) and patterns[position] == topic:
+                    self._matched_topics.append((list_name, topic))
         else:
-            # Create simple string patterns
-            for topic in self.allow_topics:
-                pattern = re.compile(re.escape(topic), flags)
-                self._compiled_allow_patterns.append(pattern)
-
-            for topic in self.deny_topics:
-                pattern = re.compile(re.escape(topic), flags)
-                self._compiled_deny_patterns.append(pattern)
+            # Case-insensitive topics are matched against the canonical text
+            self._matched_topics = topics
+            self._literal_matcher = KeywordMatcher.shared(
+                [topic for _, topic in topics], case_sensitive=self.case_sensitive
+            )
 
     # Legacy run() method removed - now using analyze() method only
 
@@ -132,11 +152,8 @@ class TopicGuardrail(GuardrailInterface):
                 "details": {"filter": self.name, "empty_content": True},
             }
 
-        # Find matches
-        allow_matches = self._find_matches(
-            content, self._compiled_allow_patterns, self.allow_topics
-        )
-        deny_matches = self._find_matches(content, self._compiled_deny_patterns, self.deny_topics)
+        # Find matches of both lists in one scan
+        allow_matches, deny_matches = self._find_matches(content)
 
         # Determine blocking decision based on mode
         blocked = False
@@ -199,27 +216,28 @@ class TopicGuardrail(GuardrailInterface):
             },
         }
 
-    def _find_matches(
-        self, content: str, patterns: List[re.Pattern], topics: List[str]
-    ) -> List[str]:
+    def _find_matches(self, content: str) -> Tuple[List[str], List[str]]:
         """
-        Find topic matches in content.
+        Find topic matches in content with a single scan.
 
         Args:
             content: Content to search
-            patterns: Compiled regex patterns
-            topics: Original topic strings
 
         Returns:
-            List of matched topics
+            Matched allow topics and matched deny topics, in list order
         """
-        matches = []
-
-        for i, pattern in enumerate(patterns):
-            if pattern.search(content):
-                matches.append(topics[i])
+        if self._pattern_set is not None:
+            indices = self._pattern_set.search_indices(content)
+        elif self._literal_matcher is not None:
+            indices = self._literal_matcher.find_indices(content)
+        else:
+            indices = []
 
-        return matches
+        matches: Dict[str, List[str]] = {"allow": [], "deny": []}
+        for index in indices:
+            list_name, topic = self._matched_topics[index]
+            matches[list_name].append(topic)
+        return matches["allow"], matches["deny"]
 
     def get_config(self) -> Dict[str, Any]:
         """Get filter configuration."""
@@ -288,8 +306,7 @@ class TopicGuardrail(GuardrailInterface):
             "available": True,
             "allow_topics_count": len(self.allow_topics),
             "deny_topics_count": len(self.deny_topics),
-            "compiled_patterns": len(self._compiled_allow_patterns)
-            + len(self._compiled_deny_patterns),
+            "compiled_patterns": len(self._matched_topics),
         }
 
     async def analyze(
@@ -325,11 +342,8 @@ class TopicGuardrail(GuardrailInterface):
                 guardrail_type=self.guardrail_type,
             )
 
-        # Find matches
-        allow_matches = self._find_matches(
-            content, self._compiled_allow_patterns, self.allow_topics
-        )
-        deny_matches = self._find_matches(content, self._compiled_deny_patterns, self.deny_topics)
+        # Find matches of both lists in one scan
+        allow_matches, deny_matches = self._find_matches(content)
 
         # Determine blocking decision based on mode
         blocked = False
@@ -1,12 +1,25 @@
+import logging
 import re
+import time
+from pathlib import Path
+from threading import Lock
 from typing import List, Optional
 
 from ..core.config_validator import URL_GUARDRAIL_RULES, ValidationRule
 from ..core.conversation import Conversation
+from ..core.domain_index import DomainIndex, DomainListFile
 from ..core.guardrail_interface import GuardrailInterface, GuardrailResult, GuardrailType
 
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of domain list files for changes
+DEFAULT_RELOAD_INTERVAL = 60.0
+
 
 class URLGuardrail(GuardrailInterface):
+    supports_streaming = True
+    cpu_bound = True
+
     def __init__(self, config: dict):
         """Initialize URL filter."""
         name = config.get("name", "url_filter")
@@ -21,7 +34,18 @@ class URLGuardrail(GuardrailInterface):
         self.allowed_domains = nested_config.get(
             "allowed_domains", config.get("allowed_domains", [])
         )
+        self.blocked_domains_file = nested_config.get(
+            "blocked_domains_file", config.get("blocked_domains_file")
+        )
+        self.allowed_domains_file = nested_config.get(
+            "allowed_domains_file", config.get("allowed_domains_file")
+        )
+        self.reload_interval = nested_config.get(
+            "reload_interval", config.get("reload_interval", DEFAULT_RELOAD_INTERVAL)
+        )
         self.action = nested_config.get("action", config.get("action", "block"))
+        self._config_dir = config.get("_config_dir", ".")
+        self._reload_lock = Lock()
 
         # Improved URL regex pattern that handles ports and domains without protocol
         # Matches: http://example.com, https://example.com, example.com, sub.example.com
@@ -30,6 +54,76 @@ class URLGuardrail(GuardrailInterface):
             re.IGNORECASE,
         )
 
+        self._build_indexes()
+
+    def _open_domain_file(self, file_path: Optional[str]) -> Optional[DomainListFile]:
+        """Set up watching of a domain list file, resolved from the config file location."""
+        if not file_path:
+            return None
+        return DomainListFile(Path(self._config_dir) / file_path, self.reload_interval)
+
+    def _load_domains(self, inline: List[str], domain_file: Optional[DomainListFile]) -> List[str]:
+        """Combine inline domains with those of a file, falling back to inline ones."""
+        if domain_file is None:
+            return list(inline)
+        try:
+            return domain_file.load(time.monotonic()) + list(inline)
+        except Exception as e:
+            from ..core.error_handling import safe_error_message, sanitize_path
+
+            safe_path = sanitize_path(str(domain_file.path))
+            logger.warning(safe_error_message(e, f"loading domains from file {safe_path}"))
+            logger.warning(f"Using {len(inline)} inline domains only")
+            return list(inline)
+
+    def _build_indexes(self):
+        """Load the domain lists and index them for lookups."""
+        self._blocked_file = self._open_domain_file(self.blocked_domains_file)
+        self._allowed_file = self._open_domain_file(self.allowed_domains_file)
+        self.blocked_index = DomainIndex.shared(
+            self._load_domains(self.blocked_domains, self._blocked_file)
+        )
+        self.allowed_index = DomainIndex.shared(
+            self._load_domains(self.allowed_domains, self._allowed_file)
+        )
+
+    def _reload_changed_files(self):
+        """Reload domain list files that changed on disk since they were loaded."""
+        now = time.monotonic()
+        blocked_changed = self._blocked_file is not None and self._blocked_file.changed(now)
+        allowed_changed = self._allowed_file is not None and self._allowed_file.changed(now)
+        if not (blocked_changed or allowed_changed):
+            return
+        # Concurrent checks skip the reload instead of waiting for it
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            if blocked_changed:
+                self.blocked_index = self._reload_index(
+                    self._blocked_file, self.blocked_domains, self.blocked_index, now
+                )
+            if allowed_changed:
+                self.allowed_index = self._reload_index(
+                    self._allowed_file, self.allowed_domains, self.allowed_index, now
+                )
+        finally:
+            self._reload_lock.release()
+
+    def _reload_index(
+        self, domain_file: DomainListFile, inline: List[str], current: DomainIndex, now: float
+    ) -> DomainIndex:
+        """Rebuild the index of a changed file, keeping the current one if it cannot be read."""
+        try:
+            index = DomainIndex.shared(domain_file.load(now) + list(inline))
+        except Exception as e:
+            from ..core.error_handling import safe_error_message, sanitize_path
+
+            safe_path = sanitize_path(str(domain_file.path))
+            logger.warning(safe_error_message(e, f"reloading domains from file {safe_path}"))
+            return current
+        logger.info(f"Reloaded {len(index)} domains for {self.name} from {domain_file.path.name}")
+        return index
+
     def get_validation_rules(self) -> List[ValidationRule]:
         """Get validation rules for URL guardrail."""
         return URL_GUARDRAIL_RULES
@@ -49,6 +143,8 @@ class URLGuardrail(GuardrailInterface):
                 risk_level="low",
             )
 
+        self._reload_changed_files()
+
         # Extract URLs from content
         matches = list(self.url_pattern.finditer(content))
         if not matches:
@@ -64,25 +160,23 @@ class URLGuardrail(GuardrailInterface):
 
         blocked_urls = []
         allowed_urls = []
+        blocked_index = self.blocked_index
+        allowed_index = self.allowed_index
+        # An allowlist that is configured but empty (e.g. its file failed to load) allows nothing
+        allowlist = bool(self.allowed_domains or self.allowed_domains_file)
 
         for match in matches:
             full_match = match.group(0)
             domain = match.group(1).lower()  # The domain is captured in group 1
 
             # Check blocked domains first
-            if any(
-                domain == blocked or domain.endswith("." + blocked)
-                for blocked in self.blocked_domains
-            ):
+            if domain in blocked_index:
                 blocked_urls.append(full_match)
                 continue
 
             # Check allowed domains (if specified)
-            if self.allowed_domains:
-                if any(
-                    domain == allowed or domain.endswith("." + allowed)
-                    for allowed in self.allowed_domains
-                ):
+            if allowlist:
+                if domain in allowed_index:
                     allowed_urls.append(full_match)
                 else:
                     blocked_urls.append(full_match)
@@ -131,6 +225,9 @@ class URLGuardrail(GuardrailInterface):
             "enabled": self.enabled,
             "blocked_domains": self.blocked_domains,
             "allowed_domains": self.allowed_domains,
+            "blocked_domains_file": self.blocked_domains_file,
+            "allowed_domains_file": self.allowed_domains_file,
+            "reload_interval": self.reload_interval,
             "action": self.action,
         }
 
@@ -141,10 +238,26 @@ class URLGuardrail(GuardrailInterface):
                 self.blocked_domains = config["blocked_domains"]
             if "allowed_domains" in config:
                 self.allowed_domains = config["allowed_domains"]
+            for key in ("blocked_domains_file", "allowed_domains_file", "reload_interval"):
+                if key in config:
+                    setattr(self, key, config[key])
             if "action" in config:
                 self.action = config["action"]
             if "enabled" in config:
                 self.enabled = config["enabled"]
+
+            # Rebuild the indexes if any domain list changed
+            if any(
+                key in config
+                for key in (
+                    "blocked_domains",
+                    "allowed_domains",
+                    "blocked_domains_file",
+                    "allowed_domains_file",
+                    "reload_interval",
+                )
+            ):
+                self._build_indexes()
             return True
         except Exception:
             return False
@@ -157,6 +270,9 @@ class URLGuardrail(GuardrailInterface):
         if not isinstance(self.allowed_domains, list):
             return False
 
+        if not isinstance(self.reload_interval, (int, float)) or self.reload_interval < 0:
+            return False
+
         if self.action not in ["block", "allow", "warn"]:
             return False
 
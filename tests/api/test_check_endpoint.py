@@ -198,3 +198,97 @@ class TestCheckEndpoint:
         # If it detects toxicity, there should be reasons or warnings
         if data["action"] != "allow":
             assert len(data["reasons"]) > 0 or len(data["warnings"]) > 0
+
+
+class TestBatchCheckEndpoint:
+    """Test cases for the /v1/check/batch endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a test client."""
+        return TestClient(app)
+
+    def test_batch_results_in_order(self, client):
+        """Each text gets its own decision, in request order."""
+        request_data = {
+            "texts": ["What's the weather like today?", "My SSN is 123-45-6789"],
+            "kind": "prompt",
+            "preset": "customer_service",
+        }
+
+        response = client.post("/v1/check/batch", json=request_data)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [result["action"] for result in data["results"]] == ["allow", "block"]
+        assert data["metadata"]["count"] == 2
+
+    def test_batch_matches_single_check(self, client):
+        """Batch results match the single-text endpoint."""
+        text = "My SSN is 123-45-6789"
+        single = client.post("/v1/check", json={"text": text, "kind": "response"}).json()
+        batch = client.post("/v1/check/batch", json={"texts": [text], "kind": "response"}).json()
+
+        assert batch["results"][0]["action"] == single["action"]
+        assert batch["results"][0]["reasons"] == single["reasons"]
+
+    def test_batch_rejects_empty_list(self, client):
+        """An empty batch is a validation error."""
+        response = client.post("/v1/check/batch", json={"texts": []})
+        assert response.status_code == 422
+
+    def test_batch_rejects_empty_text(self, client):
+        """Every text must be non-empty."""
+        response = client.post("/v1/check/batch", json={"texts": ["ok", ""]})
+        assert response.status_code == 422
+
+    def test_batch_too_large(self, client):
+        """Batches are capped at 100 texts."""
+        response = client.post("/v1/check/batch", json={"texts": ["hello"] * 101})
+        assert response.status_code == 422
+
+
+class TestStreamCheckEndpoint:
+    """Test cases for the /v1/check/stream endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        """Create a test client."""
+        return TestClient(app)
+
+    @staticmethod
+    def parse_events(body: str):
+        """Parse a server-sent event stream into (event, data) pairs."""
+        import json
+
+        events = []
+        for block in body.strip().split("\n\n"):
+            lines = dict(line.split(": ", 1) for line in block.split("\n"))
+            events.append((lines["event"], json.loads(lines["data"])))
+        return events
+
+    def test_stream_allowed(self, client):
+        """Clean chunks are echoed and followed by a final result."""
+        chunks = [b"The weather ", b"today is ", b"sunny."]
+
+        response = client.post("/v1/check/stream", content=iter(chunks))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = self.parse_events(response.text)
+        echoed = "".join(data["text"] for event, data in events if event == "chunk")
+        assert echoed == "The weather today is sunny."
+        assert events[-1][0] == "result"
+        assert events[-1][1]["action"] == "allow"
+
+    def test_stream_blocked_mid_stream(self, client):
+        """Text that fails a streaming guardrail is not echoed."""
+        chunks = [b"Sure, the SSN is 123-", b"45-6789", b" and more text"]
+
+        response = client.post("/v1/check/stream", content=iter(chunks))
+
+        events = self.parse_events(response.text)
+        echoed = "".join(data["text"] for event, data in events if event == "chunk")
+        assert "6789" not in echoed
+        assert events[-1][0] == "result"
+        assert events[-1][1]["action"] == "block"
@@ -77,6 +77,21 @@ def test_guardrail_metrics_recorded(client):
     assert any("guardrail_checks_total" in key for key in data["counters"])
 
 
+@pytest.mark.ci
+def test_guardrail_timings_recorded(client):
+    """Test that per-guardrail timings come from the pipeline's measurements."""
+    response = client.post("/v1/check", json={"text": "This is a test message", "kind": "prompt"})
+    assert response.json()["metadata"]["processing_time_ms"] > 0
+
+    histograms = client.get("/metrics").json()["histograms"]
+    durations = [v for k, v in histograms.items() if k.startswith("guardrail_check_duration_ms")]
+    cpu_times = [v for k, v in histograms.items() if k.startswith("guardrail_check_cpu_ms")]
+
+    assert durations and cpu_times
+    # Measured per guardrail, not the total split evenly
+    assert len({stats["max"] for stats in durations}) > 1
+
+
 @pytest.mark.ci
 def test_error_metrics_recorded(client):
     """Test that errors are recorded in metrics."""
@@ -133,3 +148,97 @@ def test_metrics_collector_unit():
     collector.increment("labeled_metric", 1, {"env": "test", "version": "1.0"})
     summary = collector.get_metrics_summary()
     assert "labeled_metric{env=test,version=1.0}" in summary["counters"]
+
+
+@pytest.mark.ci
+def test_decision_cache_metrics_exported(client, monkeypatch):
+    """Test that decision cache hits and misses are exported when caching is enabled."""
+    from stinger.api.endpoints import check
+
+    monkeypatch.setenv("STINGER_DECISION_CACHE", "true")
+    monkeypatch.setattr(check, "_pipeline_cache", {})
+
+    for _ in range(3):
+        client.post("/v1/check", json={"text": "hello there", "kind": "prompt"})
+
+    gauges = client.get("/metrics").json()["gauges"]
+    assert gauges["decision_cache_hits{preset=customer_service}"] == 2
+    assert gauges["decision_cache_misses{preset=customer_service}"] == 1
+
+
+@pytest.mark.ci
+def test_regex_search_metrics_exported(client):
+    """Test that timeout-protected regex search statistics are exported."""
+    from stinger.core.regex_security import safe_compile_regex, safe_regex_search
+
+    safe_regex_search(safe_compile_regex(r"\d+"), "order 123")
+
+    gauges = client.get("/metrics").json()["gauges"]
+    assert gauges["regex_search_searches"] >= 1
+    assert "regex_search_timeouts" in gauges
+    assert "regex_search_deadline_misses" in gauges
+    assert "regex_search_overdue" in gauges
+
+
+@pytest.mark.ci
+def test_artifact_cache_metrics_exported(client):
+    """Test that shared compiled artifact statistics are exported."""
+    from stinger.guardrails.keyword_list import KeywordListGuardrail
+
+    guardrail = KeywordListGuardrail({"name": "metrics_keywords", "keywords": ["metrics"]})
+
+    gauges = client.get("/metrics").json()["gauges"]
+    assert gauges["artifact_cache_artifacts"] >= 1
+    assert gauges["artifact_cache_memory_bytes"] > 0
+    assert gauges["artifact_cache_artifacts_by_kind{kind=keywords}"] >= 1
+    assert "artifact_cache_hit_rate" in gauges
+    del guardrail
+
+
+@pytest.mark.ci
+def test_model_client_metrics_exported(client):
+    """Test that shared model client pool statistics are exported."""
+    gauges = client.get("/metrics").json()["gauges"]
+    assert "model_client_clients" in gauges
+    assert "model_client_connections_open" in gauges
+    assert "model_client_pool_utilization" in gauges
+
+
+@pytest.mark.ci
+def test_coalescing_metrics_exported(client):
+    """Test that the share of coalesced model calls is exported."""
+    gauges = client.get("/metrics").json()["gauges"]
+    assert "ai_coalescing_calls" in gauges
+    assert "ai_coalescing_coalesced" in gauges
+    assert "ai_coalescing_dedupe_ratio" in gauges
+
+
+@pytest.mark.ci
+def test_batching_metrics_exported(client):
+    """Test that the size of batched moderation calls is exported."""
+    gauges = client.get("/metrics").json()["gauges"]
+    assert "ai_batching_batches" in gauges
+    assert "ai_batching_mean_batch_size" in gauges
+    assert "ai_batching_requests_saved" in gauges
+
+
+@pytest.mark.ci
+def test_fusion_metrics_exported(client):
+    """Test that fused AI calls are exported."""
+    gauges = client.get("/metrics").json()["gauges"]
+    assert "ai_fusion_fused_calls" in gauges
+    assert "ai_fusion_fallbacks" in gauges
+    assert "ai_fusion_calls_saved" in gauges
+
+
+@pytest.mark.ci
+def test_verdict_cache_metrics_exported(client, monkeypatch):
+    """Test that verdict cache statistics are exported when the cache is enabled."""
+    from stinger.core import verdict_cache
+
+    cache = verdict_cache.VerdictCache(verdict_cache.VerdictCacheConfig(enabled=True))
+    monkeypatch.setattr(verdict_cache, "_cache", cache)
+    monkeypatch.setattr(verdict_cache, "_configured", True)
+    gauges = client.get("/metrics").json()["gauges"]
+    assert "verdict_cache_hit_rate" in gauges
+    assert "verdict_cache_disk_hits" in gauges
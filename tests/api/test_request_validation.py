@@ -90,6 +90,21 @@ def test_context_validation(client):
     assert response.status_code == 422
 
 
+@pytest.mark.ci
+def test_deadline_validation(client):
+    """Test deadline_ms field validation."""
+    for deadline_ms in (0, 60001):
+        response = client.post(
+            "/v1/check", json={"text": "hello", "kind": "prompt", "deadline_ms": deadline_ms}
+        )
+        assert response.status_code == 422
+
+    response = client.post(
+        "/v1/check", json={"text": "hello", "kind": "prompt", "deadline_ms": 2000}
+    )
+    assert response.status_code == 200
+
+
 @pytest.mark.ci
 def test_valid_request_passes(client):
     """Test that valid requests pass validation."""
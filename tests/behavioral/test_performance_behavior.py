@@ -8,6 +8,7 @@ Users expect near real-time responses - we must deliver.
 
 import asyncio
 import concurrent.futures
+import re
 import statistics
 import time
 
@@ -15,6 +16,7 @@ import pytest
 
 from src.stinger.core.pipeline import GuardrailPipeline
 from src.stinger.guardrails.prompt_injection_guardrail import PromptInjectionGuardrail
+from src.stinger.guardrails.simple_code_generation_guardrail import SimpleCodeGenerationGuardrail
 from src.stinger.guardrails.simple_pii_detection_guardrail import SimplePIIDetectionGuardrail
 from src.stinger.guardrails.simple_toxicity_detection_guardrail import (
     SimpleToxicityDetectionGuardrail,
@@ -139,7 +141,8 @@ class TestBatchPerformance:
         guardrail = SimplePIIDetectionGuardrail("test", config)
 
         # Generate test data
-        test_texts = [f"User {i} with SSN {i:03d}-{i:02d}-{i:04d}" for i in range(100)]
+        # 000-00-0000 is not a valid SSN, so start at 1
+        test_texts = [f"User {i} with SSN {i:03d}-{i:02d}-{i:04d}" for i in range(1, 101)]
 
         # Process individually
         start = time.time()
@@ -250,6 +253,41 @@ class TestMemoryEfficiency:
         assert elapsed < 1.0, "Large text should process in under 1 second"
 
 
+@pytest.mark.performance
+class TestPatternMatchingPerformance:
+    """Compiled category matchers against running every pattern separately"""
+
+    @staticmethod
+    def _per_pattern_counts(patterns, text, flags):
+        return {
+            category: sum(len(re.findall(pattern, text, flags)) for pattern in category_patterns)
+            for category, category_patterns in patterns.items()
+        }
+
+    @pytest.mark.parametrize("size_kb", [1, 10, 50])
+    def test_category_matching_counts(self, size_kb):
+        """Category matchers count the same matches as per-pattern scans"""
+        paragraph = (
+            "The quarterly report covers revenue, hiring and the roadmap for next year. "
+            "Please write a summary and create a short slide deck, then fight me on it. "
+        )
+        text = (paragraph * (size_kb * 1024 // len(paragraph) + 1))[: size_kb * 1024]
+
+        guardrails = [
+            (SimpleToxicityDetectionGuardrail("tox", {}), "toxicity_patterns", re.IGNORECASE),
+            (SimpleCodeGenerationGuardrail("code", {}), "code_patterns", re.IGNORECASE | re.DOTALL),
+        ]
+        # Timings: scripts/benchmark_category_matching.py
+        for guardrail, attribute, flags in guardrails:
+            patterns = getattr(guardrail, attribute)
+            expected = {
+                category: count
+                for category, count in self._per_pattern_counts(patterns, text, flags).items()
+                if count
+            }
+            assert guardrail.matcher.count(text, list(patterns)) == expected
+
+
 @pytest.mark.performance
 class TestPerformanceUnderLoad:
     """Test performance characteristics under various loads"""
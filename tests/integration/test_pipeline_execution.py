@@ -0,0 +1,1482 @@
+#!/usr/bin/env python3
+"""
+Integration tests for pipeline execution behaviour.
+
+Covers how GuardrailPipeline schedules guardrails (sequential vs parallel)
+and checks that the assembled PipelineResult does not depend on scheduling.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from src.stinger.core.event_loop import get_background_loop
+from src.stinger.core.guardrail_interface import (
+    GuardrailInterface,
+    GuardrailResult,
+    GuardrailType,
+)
+from src.stinger.core.normalization import NormalizedContent, canonicalize, normalized
+from src.stinger.core.pipeline import GuardrailPipeline
+
+
+class SlowGuardrail(GuardrailInterface):
+    """Test guardrail that sleeps before returning a fixed decision."""
+
+    def __init__(self, name: str, delay: float, blocked: bool = False, action: str = "block"):
+        super().__init__(name, GuardrailType.PASS_THROUGH, {"enabled": True})
+        self.delay = delay
+        self.blocked = blocked
+        self.action = action
+        self.calls = 0
+
+    async def analyze(self, content, conversation=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return GuardrailResult(
+            blocked=self.blocked,
+            confidence=1.0 if self.blocked else 0.0,
+            reason=f"{self.name} {'blocked' if self.blocked else 'passed'}",
+            details={"action": self.action},
+            guardrail_name=self.name,
+            guardrail_type=self.guardrail_type,
+        )
+
+    def is_available(self):
+        return True
+
+    def get_config(self):
+        return {"name": self.name}
+
+    def get_validation_rules(self):
+        return []
+
+    def update_config(self, config):
+        return True
+
+
+def create_pipeline_from_config(config: dict) -> GuardrailPipeline:
+    """Helper to create pipeline from config dict"""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        json.dump(config, f)
+        config_file = f.name
+
+    try:
+        return GuardrailPipeline(config_file)
+    finally:
+        os.unlink(config_file)
+
+
+def base_config(**pipeline_settings) -> dict:
+    """Minimal valid config with optional pipeline-level settings."""
+    pipeline = {
+        "input": [
+            {
+                "name": "length_check",
+                "type": "length_filter",
+                "enabled": True,
+                "on_error": "block",
+                "max_length": 100,
+            }
+        ],
+        "output": [],
+    }
+    pipeline.update(pipeline_settings)
+    return {"version": "1.0", "pipeline": pipeline}
+
+
+def without_timing(result: dict) -> dict:
+    """Copy of a result without measured timings, for comparing decisions."""
+    stripped = {k: v for k, v in result.items() if k != "processing_time_ms"}
+    stripped["details"] = {
+        name: {k: v for k, v in detail.items() if k != "timing"}
+        for name, detail in result["details"].items()
+    }
+    return stripped
+
+
+@pytest.mark.ci
+class TestExecutionModes:
+    """Sequential and parallel execution produce the same results."""
+
+    def test_default_execution_is_sequential(self):
+        pipeline = create_pipeline_from_config(base_config())
+        assert pipeline.execution_modes == {"input": "sequential", "output": "sequential"}
+
+    def test_execution_mode_per_pipeline_type(self):
+        pipeline = create_pipeline_from_config(
+            base_config(execution={"input": "parallel", "output": "sequential"})
+        )
+        assert pipeline.execution_modes == {"input": "parallel", "output": "sequential"}
+
+    def test_invalid_execution_mode_rejected(self):
+        with pytest.raises(RuntimeError):
+            create_pipeline_from_config(base_config(execution="threaded"))
+
+    @pytest.mark.asyncio
+    async def test_parallel_runs_guardrails_concurrently(self):
+        pipeline = create_pipeline_from_config(base_config(execution="parallel"))
+        pipeline.input_pipeline = [SlowGuardrail(f"slow_{i}", 0.2) for i in range(3)]
+
+        start = time.perf_counter()
+        result = await pipeline.check_input_async("hello")
+        elapsed = time.perf_counter() - start
+
+        assert result["blocked"] is False
+        assert elapsed < 0.5, f"parallel pipeline took {elapsed:.2f}s"
+
+    @pytest.mark.asyncio
+    async def test_parallel_result_matches_sequential(self):
+        def guardrails():
+            # Slowest guardrail first so completion order differs from config order
+            return [
+                SlowGuardrail("first", 0.15, blocked=True),
+                SlowGuardrail("second", 0.05, blocked=False, action="warn"),
+                SlowGuardrail("third", 0.0, blocked=True, action="warn"),
+            ]
+
+        sequential = create_pipeline_from_config(base_config())
+        sequential.input_pipeline = guardrails()
+        parallel = create_pipeline_from_config(base_config(execution="parallel"))
+        parallel.input_pipeline = guardrails()
+
+        seq_result = await sequential.check_input_async("hello")
+        par_result = await parallel.check_input_async("hello")
+
+        assert without_timing(par_result) == without_timing(seq_result)
+        assert list(par_result["details"]) == ["first", "second", "third"]
+        assert par_result["reasons"] == ["first: first blocked", "third: third blocked"]
+        assert par_result["warnings"] == ["second: second passed", "third: third blocked"]
+
+    @pytest.mark.asyncio
+    async def test_parallel_isolates_guardrail_errors(self):
+        class FailingGuardrail(SlowGuardrail):
+            async def analyze(self, content, conversation=None):
+                raise RuntimeError("boom")
+
+        pipeline = create_pipeline_from_config(base_config(execution="parallel"))
+        pipeline.input_pipeline = [FailingGuardrail("broken", 0), SlowGuardrail("ok", 0.01)]
+
+        result = await pipeline.check_input_async("hello")
+
+        assert result["details"]["broken"]["error"] == "boom"
+        assert result["details"]["ok"]["blocked"] is False
+        assert result["reasons"] == ["broken: Error - boom"]
+
+
+class SlowAIGuardrail(SlowGuardrail):
+    """Slow guardrail flagged as calling an AI model."""
+
+    uses_ai = True
+
+
+@pytest.mark.ci
+class TestScheduling:
+    """Cost-ordered scheduling and stop_on_first_block."""
+
+    def test_cost_order_puts_local_guardrails_first(self):
+        from src.stinger.core.scheduler import GuardrailScheduler
+
+        pipeline = [
+            SlowAIGuardrail("ai", 0),
+            SlowGuardrail("slow_local", 0),
+            SlowGuardrail("fast_local", 0),
+        ]
+        scheduler = GuardrailScheduler(order="cost")
+        scheduler.record("slow_local", 5.0)
+        scheduler.record("fast_local", 0.1)
+
+        assert scheduler.plan(pipeline) == [[2], [1], [0]]
+        assert scheduler.plan(pipeline, parallel=True) == [[2, 1], [0]]
+        assert GuardrailScheduler().plan(pipeline, parallel=True) == [[0, 1, 2]]
+
+    def test_invalid_order_rejected(self):
+        with pytest.raises(RuntimeError):
+            create_pipeline_from_config(base_config(order="random"))
+
+    @pytest.mark.asyncio
+    async def test_local_block_skips_ai_guardrail(self):
+        pipeline = create_pipeline_from_config(base_config(order="cost", stop_on_first_block=True))
+        ai = SlowAIGuardrail("ai", 0)
+        local = SlowGuardrail("local", 0, blocked=True)
+        pipeline.input_pipeline = [ai, local]
+
+        result = await pipeline.check_input_async("hello")
+
+        assert ai.calls == 0
+        assert result["blocked"] is True
+        assert result["reasons"] == ["local: local blocked"]
+        assert list(result["details"]) == ["ai", "local"]
+        assert result["details"]["ai"]["skipped"] is True
+
+    @pytest.mark.asyncio
+    async def test_block_cancels_in_flight_guardrails(self):
+        pipeline = create_pipeline_from_config(
+            base_config(execution="parallel", stop_on_first_block=True)
+        )
+        pipeline.input_pipeline = [
+            SlowAIGuardrail("slow_ai", 5.0),
+            SlowAIGuardrail("fast_ai", 0.01, blocked=True),
+        ]
+
+        start = time.perf_counter()
+        result = await pipeline.check_input_async("hello")
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0, f"in-flight guardrail was not cancelled ({elapsed:.2f}s)"
+        assert result["blocked"] is True
+        assert result["details"]["slow_ai"]["skipped"] is True
+        assert result["details"]["fast_ai"]["blocked"] is True
+
+    @pytest.mark.asyncio
+    async def test_without_stop_on_first_block_all_guardrails_run(self):
+        pipeline = create_pipeline_from_config(base_config(order="cost"))
+        ai = SlowAIGuardrail("ai", 0)
+        pipeline.input_pipeline = [ai, SlowGuardrail("local", 0, blocked=True)]
+
+        result = await pipeline.check_input_async("hello")
+
+        assert ai.calls == 1
+        assert "skipped" not in result["details"]["ai"]
+
+
+class LocalGuardrail(SlowGuardrail):
+    """Local guardrail whose analyze never suspends."""
+
+    async def analyze(self, content, conversation=None):
+        self.calls += 1
+        return GuardrailResult(
+            blocked=self.blocked,
+            confidence=1.0 if self.blocked else 0.0,
+            reason=f"{self.name} {'blocked' if self.blocked else 'passed'}",
+            details={"action": self.action},
+            guardrail_name=self.name,
+            guardrail_type=self.guardrail_type,
+        )
+
+
+class LoopThreadGuardrail(SlowAIGuardrail):
+    """AI guardrail that records the thread its analyze runs on."""
+
+    def __init__(self, name: str):
+        super().__init__(name, 0)
+        self.threads = []
+
+    async def analyze(self, content, conversation=None):
+        self.threads.append(threading.current_thread())
+        return await super().analyze(content, conversation)
+
+
+@pytest.mark.ci
+class TestSyncExecution:
+    """The sync API reuses one event loop and skips asyncio for local pipelines."""
+
+    def test_local_pipeline_runs_without_event_loop(self, monkeypatch):
+        from src.stinger.core import pipeline as pipeline_module
+
+        pipeline = create_pipeline_from_config(base_config())
+        pipeline.input_pipeline = [LocalGuardrail("local", 0, blocked=True)]
+
+        def fail():
+            raise AssertionError("event loop used for a local-only pipeline")
+
+        monkeypatch.setattr(pipeline_module, "get_background_loop", fail)
+        result = pipeline.check_input("hello")
+
+        assert result["blocked"] is True
+        assert result["reasons"] == ["local: local blocked"]
+
+    def test_suspending_local_guardrail_falls_back_to_loop(self):
+        pipeline = create_pipeline_from_config(base_config())
+        pipeline.input_pipeline = [SlowGuardrail("sleepy", 0.01, blocked=True)]
+
+        result = pipeline.check_input("hello")
+
+        assert result["blocked"] is True
+        assert pipeline._sync_fast_path["input"] is False
+        # Later calls go straight to the event loop
+        assert pipeline.check_input("hello")["blocked"] is True
+
+    def test_ai_pipeline_reuses_background_loop(self):
+        pipeline = create_pipeline_from_config(base_config())
+        guardrail = LoopThreadGuardrail("ai")
+        pipeline.input_pipeline = [guardrail]
+
+        pipeline.check_input("one")
+        pipeline.check_input("two")
+
+        assert len(guardrail.threads) == 2
+        assert guardrail.threads[0] is guardrail.threads[1]
+        assert guardrail.threads[0] is not threading.current_thread()
+
+    def test_sync_and_async_results_match(self):
+        def guardrails():
+            return [
+                LocalGuardrail("first", 0, blocked=True),
+                LocalGuardrail("second", 0, action="warn"),
+            ]
+
+        pipeline = create_pipeline_from_config(base_config())
+        pipeline.input_pipeline = guardrails()
+        sync_result = pipeline.check_input("hello")
+        pipeline.input_pipeline = guardrails()
+        async_result = asyncio.run(pipeline.check_input_async("hello"))
+
+        assert without_timing(sync_result) == without_timing(async_result)
+
+    @pytest.mark.asyncio
+    async def test_sync_call_from_async_context_rejected(self):
+        pipeline = create_pipeline_from_config(base_config())
+        with pytest.raises(RuntimeError, match="check_input_async"):
+            pipeline.check_input("hello")
+
+
+class ConcurrencyTrackingAIGuardrail(SlowAIGuardrail):
+    """AI guardrail that records how many calls overlap."""
+
+    def __init__(self, name: str, delay: float):
+        super().__init__(name, delay)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def analyze(self, content, conversation=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().analyze(content, conversation)
+        finally:
+            self.in_flight -= 1
+
+
+class KeywordGuardrail(LocalGuardrail):
+    """Local guardrail that blocks texts containing 'bad'."""
+
+    async def analyze(self, content, conversation=None):
+        self.calls += 1
+        blocked = "bad" in content
+        return GuardrailResult(
+            blocked=blocked,
+            confidence=1.0 if blocked else 0.0,
+            reason="contains bad" if blocked else "clean",
+            details={"action": "block"},
+            guardrail_name=self.name,
+            guardrail_type=self.guardrail_type,
+        )
+
+
+@pytest.mark.ci
+class TestBatchExecution:
+    """check_input_batch / check_output_batch."""
+
+    def test_batch_matches_single_checks(self):
+        pipeline = create_pipeline_from_config(base_config())
+        texts = ["hello", "too long " * 20, "fine"]
+
+        batch = pipeline.check_input_batch(texts)
+        single = [pipeline.check_input(text) for text in texts]
+
+        assert [without_timing(r) for r in batch] == [without_timing(r) for r in single]
+        assert [r["blocked"] for r in batch] == [False, True, False]
+
+    def test_local_guardrails_run_once_per_item(self):
+        pipeline = create_pipeline_from_config(base_config())
+        guardrail = KeywordGuardrail("keywords", 0)
+        pipeline.output_pipeline = [guardrail]
+
+        results = pipeline.check_output_batch(["good", "bad", "good"])
+
+        assert guardrail.calls == 3
+        assert [r["blocked"] for r in results] == [False, True, False]
+        assert all(r["pipeline_type"] == "output" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_ai_guardrails_bounded_concurrency(self):
+        pipeline = create_pipeline_from_config(base_config())
+        ai = ConcurrencyTrackingAIGuardrail("ai", 0.02)
+        pipeline.input_pipeline = [ai]
+
+        results = await pipeline.check_input_batch_async(["text"] * 10, max_concurrency=3)
+
+        assert len(results) == 10
+        assert ai.calls == 10
+        assert ai.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_blocked_items_skip_ai_guardrails(self):
+        pipeline = create_pipeline_from_config(base_config(stop_on_first_block=True))
+        ai = SlowAIGuardrail("ai", 0)
+        pipeline.input_pipeline = [ai, KeywordGuardrail("keywords", 0)]
+
+        results = await pipeline.check_input_batch_async(["good", "bad"])
+
+        assert ai.calls == 1
+        assert results[1]["details"]["ai"]["skipped"] is True
+        assert list(results[1]["details"]) == ["ai", "keywords"]
+
+    def test_rate_limit_checked_once_per_batch(self):
+        pipeline = create_pipeline_from_config(base_config())
+        calls = []
+
+        class RecordingLimiter:
+            def check_rate_limit(self, api_key, role=None):
+                calls.append("check")
+                return {"exceeded": False}
+
+            def record_request(self, api_key):
+                calls.append("record")
+
+        pipeline.global_rate_limiter = RecordingLimiter()
+        pipeline.check_input_batch(["a", "b", "c"], api_key="key")
+
+        assert calls == ["check", "record"]
+
+    def test_invalid_items_rejected_individually(self):
+        pipeline = create_pipeline_from_config(base_config())
+
+        results = pipeline.check_input_batch(["hello", "null\x00byte"])
+
+        assert results[0]["blocked"] is False
+        assert results[1]["blocked"] is True
+        assert "validation_error" in results[1]["details"]
+        assert results[1]["processing_time_ms"] == 0.0
+
+    def test_none_item_rejected(self):
+        pipeline = create_pipeline_from_config(base_config())
+        with pytest.raises(ValueError):
+            pipeline.check_input_batch(["hello", None])
+
+    def test_empty_batch(self):
+        pipeline = create_pipeline_from_config(base_config())
+        assert pipeline.check_input_batch([]) == []
+
+
+def streaming_config(**pipeline_settings) -> dict:
+    """Config with streaming-capable and final-only output guardrails."""
+    config = base_config(**pipeline_settings)
+    config["pipeline"]["output"] = [
+        {
+            "name": "secrets",
+            "type": "keyword_list",
+            "enabled": True,
+            "on_error": "block",
+            "keywords": ["top secret"],
+        },
+        {
+            "name": "pii",
+            "type": "simple_pii_detection",
+            "enabled": True,
+            "on_error": "block",
+        },
+        {
+            "name": "length",
+            "type": "length_filter",
+            "enabled": True,
+            "on_error": "block",
+            "max_length": 60,
+        },
+    ]
+    return config
+
+
+@pytest.mark.ci
+class TestStreamingOutput:
+    """stream_output() checks chunks as they arrive."""
+
+    def test_blocks_match_split_across_chunks(self):
+        pipeline = create_pipeline_from_config(streaming_config())
+        stream = pipeline.stream_output()
+
+        assert stream.feed("This is top ")["blocked"] is False
+        result = stream.feed("secret stuff")
+
+        assert result["blocked"] is True
+        assert result["reasons"][0].startswith("secrets:")
+        assert stream.blocked
+        # Once blocked, the stream keeps returning the blocking result
+        assert stream.feed("more")["blocked"] is True
+        assert stream.finish() is result
+
+    def test_pii_split_across_chunks(self):
+        pipeline = create_pipeline_from_config(streaming_config())
+        stream = pipeline.stream_output()
+
+        for chunk in ["My SSN ", "is 123-", "45-", "6789"]:
+            result = stream.feed(chunk)
+
+        assert result["blocked"] is True
+        assert "pii" in result["details"]
+
+    def test_only_streaming_guardrails_run_mid_stream(self):
+        pipeline = create_pipeline_from_config(streaming_config())
+        stream = pipeline.stream_output()
+
+        assert [g.name for g in stream.guardrails] == ["secrets", "pii"]
+        for _ in range(10):
+            assert stream.feed("harmless words ")["blocked"] is False
+
+        # The length guardrail only applies to the complete response
+        final = stream.finish()
+        assert final["blocked"] is True
+        assert final["reasons"][0].startswith("length:")
+
+    def test_finish_matches_check_output(self):
+        pipeline = create_pipeline_from_config(streaming_config())
+        text = "A perfectly normal reply."
+        stream = pipeline.stream_output()
+        for word in text.split(" "):
+            stream.feed(word + " ")
+
+        assert stream.text == text + " "
+        assert without_timing(stream.finish()) == without_timing(pipeline.check_output(text + " "))
+
+    def test_match_longer_than_overlap_caught_at_finish(self):
+        pipeline = create_pipeline_from_config(streaming_config(stream_overlap=0))
+        stream = pipeline.stream_output()
+
+        assert stream.feed("top ")["blocked"] is False
+        assert stream.feed("secret")["blocked"] is False
+        assert stream.finish()["blocked"] is True
+
+    def test_min_chunk_chars_batches_window_checks(self):
+        pipeline = create_pipeline_from_config(streaming_config())
+        stream = pipeline.stream_output(min_chunk_chars=20)
+        guardrail = stream.guardrails[0]
+        calls = []
+        original = guardrail.analyze
+
+        async def counting_analyze(content, conversation=None):
+            calls.append(content)
+            return await original(content)
+
+        guardrail.analyze = counting_analyze
+        for _ in range(10):
+            stream.feed("abcd")
+
+        assert len(calls) == 2
+
+    def test_feed_after_finish_rejected(self):
+        pipeline = create_pipeline_from_config(streaming_config())
+        stream = pipeline.stream_output()
+        stream.feed("fine")
+        stream.finish()
+
+        with pytest.raises(RuntimeError):
+            stream.feed("more")
+
+    @pytest.mark.asyncio
+    async def test_async_stream(self):
+        pipeline = create_pipeline_from_config(streaming_config())
+        stream = pipeline.stream_output()
+
+        assert (await stream.feed_async("the top"))["blocked"] is False
+        assert (await stream.feed_async(" secret"))["blocked"] is True
+        assert (await stream.finish_async())["blocked"] is True
+
+
+class ConversationAwareGuardrail(SlowAIGuardrail):
+    """AI guardrail whose decisions depend on conversation context."""
+
+    uses_conversation = True
+
+
+@pytest.mark.ci
+class TestDecisionCache:
+    """Opt-in caching of whole-pipeline decisions."""
+
+    def test_cache_disabled_by_default(self):
+        pipeline = create_pipeline_from_config(base_config())
+        assert pipeline.decision_cache is None
+        assert pipeline.get_cache_stats() is None
+
+    def test_repeated_content_served_from_cache(self):
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        ai = SlowAIGuardrail("ai", 0, blocked=True)
+        pipeline.input_pipeline = [ai]
+
+        first = pipeline.check_input("hello")
+        second = pipeline.check_input("hello")
+        pipeline.check_input("hello again")
+
+        assert ai.calls == 2
+        assert second["details"]["ai"]["timing"]["cached"] is True
+        assert without_timing(second) == without_timing(first)
+        stats = pipeline.get_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+    @pytest.mark.asyncio
+    async def test_async_and_batch_share_cache(self):
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        ai = SlowAIGuardrail("ai", 0)
+        pipeline.input_pipeline = [ai]
+
+        await pipeline.check_input_async("hello")
+        results = await pipeline.check_input_batch_async(["hello", "other"])
+
+        assert ai.calls == 2
+        assert [r["blocked"] for r in results] == [False, False]
+
+    def test_cache_key_includes_pipeline_type(self):
+        config = base_config(cache=True)
+        pipeline = create_pipeline_from_config(config)
+        guardrail = LocalGuardrail("shared", 0)
+        pipeline.input_pipeline = [guardrail]
+        pipeline.output_pipeline = [guardrail]
+
+        pipeline.check_input("hello")
+        result = pipeline.check_output("hello")
+
+        assert guardrail.calls == 2
+        assert result["pipeline_type"] == "output"
+
+    def test_content_is_not_normalized(self):
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        guardrail = LocalGuardrail("local", 0)
+        pipeline.input_pipeline = [guardrail]
+
+        pipeline.check_input("hello")
+        pipeline.check_input("hello ")
+        pipeline.check_input("Hello")
+
+        assert guardrail.calls == 3
+
+    def test_errors_are_not_cached(self):
+        class FlakyGuardrail(LocalGuardrail):
+            async def analyze(self, content, conversation=None):
+                self.calls += 1
+                if self.calls == 1:
+                    raise RuntimeError("temporary failure")
+                return await super().analyze(content, conversation)
+
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        guardrail = FlakyGuardrail("flaky", 0)
+        pipeline.input_pipeline = [guardrail]
+
+        assert "flaky" in pipeline.check_input("hello")["details"]
+        assert "error" not in pipeline.check_input("hello")["details"]["flaky"]
+        assert guardrail.calls == 3
+
+    def test_cached_result_is_not_shared(self):
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        pipeline.input_pipeline = [LocalGuardrail("local", 0)]
+
+        first = pipeline.check_input("hello")
+        first["details"]["local"]["details"]["action"] = "tampered"
+
+        assert pipeline.check_input("hello")["details"]["local"]["details"]["action"] == "block"
+
+    def test_ttl_and_size_bounds(self, monkeypatch):
+        from src.stinger.core import decision_cache
+
+        now = [1000.0]
+        monkeypatch.setattr(decision_cache.time, "monotonic", lambda: now[0])
+        cache = decision_cache.DecisionCache(max_size=2, ttl_seconds=10)
+
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)  # evicts least recently used "b"
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+        now[0] += 11
+        assert cache.get("a") is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_config_change_invalidates_cache(self):
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        guardrail = LocalGuardrail("local", 0)
+        pipeline.input_pipeline = [guardrail]
+
+        pipeline.check_input("hello")
+        pipeline.disable_guardrail("local")
+        pipeline.check_input("hello")
+
+        assert guardrail.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_conversation_aware_guardrails_bypass_cache(self):
+        from src.stinger.core.conversation import Conversation
+
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        guardrail = ConversationAwareGuardrail("aware", 0)
+        pipeline.input_pipeline = [guardrail]
+        conversation = Conversation.human_ai("user", "model")
+
+        await pipeline.check_input_async("hello", conversation=conversation)
+        await pipeline.check_input_async("hello", conversation=conversation)
+
+        assert guardrail.calls == 2
+        assert pipeline.get_cache_stats()["size"] == 0
+
+
+def timed_guardrail(name: str, delay: float, timeout_ms=None, on_error="block", uses_ai=True):
+    """Slow guardrail with a timeout and error policy."""
+    guardrail = SlowAIGuardrail(name, delay) if uses_ai else SlowGuardrail(name, delay)
+    guardrail.timeout_ms = timeout_ms
+    guardrail.on_error = on_error
+    return guardrail
+
+
+@pytest.mark.ci
+class TestTimeouts:
+    """Per-guardrail timeouts and per-request deadlines."""
+
+    def test_timeout_defaults(self):
+        from src.stinger.core.input_validation import ValidationLimits
+
+        pipeline = create_pipeline_from_config(base_config())
+        guardrail = pipeline.input_pipeline[0]
+
+        assert guardrail.timeout_ms == ValidationLimits.MAX_FILTER_PROCESSING_TIME_MS
+        assert guardrail.on_error == "block"
+
+    def test_timeout_ms_from_config(self):
+        config = base_config()
+        config["pipeline"]["input"][0]["timeout_ms"] = 250
+        pipeline = create_pipeline_from_config(config)
+
+        assert pipeline.input_pipeline[0].timeout_ms == 250
+
+    def test_invalid_timeout_rejected(self):
+        config = base_config()
+        config["pipeline"]["input"][0]["timeout_ms"] = 0
+        with pytest.raises(RuntimeError):
+            create_pipeline_from_config(config)
+
+    @pytest.mark.parametrize(
+        "on_error, blocked, warned",
+        [("block", True, False), ("warn", False, True), ("allow", False, False)],
+    )
+    @pytest.mark.asyncio
+    async def test_timeout_applies_on_error_policy(self, on_error, blocked, warned):
+        pipeline = create_pipeline_from_config(base_config())
+        pipeline.input_pipeline = [timed_guardrail("slow", 5.0, timeout_ms=50, on_error=on_error)]
+
+        start = time.perf_counter()
+        result = await pipeline.check_input_async("hello")
+
+        assert time.perf_counter() - start < 1.0
+        assert result["blocked"] is blocked
+        assert bool(result["warnings"]) is warned
+        assert result["details"]["slow"]["details"]["error"] == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_deadline_shared_across_guardrails(self):
+        pipeline = create_pipeline_from_config(base_config())
+        first = timed_guardrail("first", 0.15)
+        second = timed_guardrail("second", 0.15, on_error="warn")
+        third = timed_guardrail("third", 0.0, on_error="allow")
+        pipeline.input_pipeline = [first, second, third]
+
+        start = time.perf_counter()
+        result = await pipeline.check_input_async("hello", deadline_ms=200)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5, f"deadline not enforced ({elapsed:.2f}s)"
+        assert result["details"]["first"]["blocked"] is False
+        assert result["details"]["second"]["details"]["error"] == "timeout"
+        # Budget is used up, so the last guardrail is not started at all
+        assert third.calls == 0
+        assert result["details"]["third"]["reason"] == "Not run: request deadline exceeded"
+
+    @pytest.mark.asyncio
+    async def test_parallel_guardrails_share_deadline(self):
+        pipeline = create_pipeline_from_config(base_config(execution="parallel"))
+        pipeline.input_pipeline = [timed_guardrail(f"slow_{i}", 5.0) for i in range(3)]
+
+        start = time.perf_counter()
+        result = await pipeline.check_input_async("hello", deadline_ms=100)
+
+        assert time.perf_counter() - start < 1.0
+        assert result["blocked"] is True
+        assert len(result["reasons"]) == 3
+
+    def test_sync_check_honours_deadline(self):
+        pipeline = create_pipeline_from_config(base_config())
+        pipeline.input_pipeline = [timed_guardrail("slow", 5.0, on_error="block")]
+
+        start = time.perf_counter()
+        result = pipeline.check_input("hello", deadline_ms=100)
+
+        assert time.perf_counter() - start < 1.0
+        assert result["blocked"] is True
+
+    def test_timeouts_not_cached(self):
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        guardrail = timed_guardrail("slow", 0.2, timeout_ms=20, on_error="allow")
+        pipeline.input_pipeline = [guardrail]
+
+        pipeline.check_input("hello")
+        pipeline.check_input("hello")
+
+        assert guardrail.calls == 2
+
+    def test_invalid_deadline_rejected(self):
+        pipeline = create_pipeline_from_config(base_config())
+        with pytest.raises(ValueError):
+            pipeline.check_input("hello", deadline_ms=0)
+
+
+class BusyGuardrail(LocalGuardrail):
+    """Local guardrail that burns CPU for a fixed time."""
+
+    def __init__(self, name: str, busy: float):
+        super().__init__(name, 0)
+        self.busy = busy
+
+    async def analyze(self, content, conversation=None):
+        end = time.thread_time() + self.busy
+        while time.thread_time() < end:
+            pass
+        return await super().analyze(content, conversation)
+
+
+@pytest.mark.ci
+class TestTiming:
+    """Per-guardrail wall and CPU time and the total processing time."""
+
+    @pytest.mark.asyncio
+    async def test_details_include_wall_and_cpu_time(self):
+        pipeline = create_pipeline_from_config(base_config())
+        pipeline.input_pipeline = [SlowAIGuardrail("waiting", 0.1), BusyGuardrail("busy", 0.05)]
+
+        result = await pipeline.check_input_async("hello")
+        waiting = result["details"]["waiting"]["timing"]
+        busy = result["details"]["busy"]["timing"]
+
+        # Waiting on I/O takes wall time but almost no CPU time
+        assert waiting["wall_ms"] >= 100
+        assert waiting["cpu_ms"] < 50
+        assert busy["cpu_ms"] >= 50
+        assert busy["wall_ms"] >= busy["cpu_ms"] * 0.9
+
+    @pytest.mark.asyncio
+    async def test_parallel_guardrails_charged_only_for_own_cpu(self):
+        pipeline = create_pipeline_from_config(base_config(execution="parallel"))
+        pipeline.input_pipeline = [SlowAIGuardrail("waiting", 0.1), BusyGuardrail("busy", 0.05)]
+
+        result = await pipeline.check_input_async("hello")
+
+        assert result["details"]["waiting"]["timing"]["cpu_ms"] < 25
+
+    @pytest.mark.asyncio
+    async def test_processing_time_is_wall_time_of_check(self):
+        pipeline = create_pipeline_from_config(base_config(execution="parallel"))
+        pipeline.input_pipeline = [SlowGuardrail(f"slow_{i}", 0.1) for i in range(3)]
+
+        result = await pipeline.check_input_async("hello")
+
+        assert 100 <= result["processing_time_ms"] < 250
+
+    @pytest.mark.asyncio
+    async def test_rejected_input_reports_processing_time(self):
+        pipeline = create_pipeline_from_config(base_config())
+        too_long = "x" * (200 * 1024)
+
+        for result in [
+            await pipeline.check_input_async(too_long),
+            await pipeline.check_output_async(too_long),
+        ]:
+            assert "validation_error" in result["details"]
+            assert result["processing_time_ms"] == 0.0
+
+    def test_sync_fast_path_records_timing(self):
+        pipeline = create_pipeline_from_config(base_config())
+        pipeline.input_pipeline = [BusyGuardrail("busy", 0.02)]
+
+        result = pipeline.check_input("hello")
+
+        assert result["details"]["busy"]["timing"]["cpu_ms"] >= 20
+        assert result["processing_time_ms"] >= result["details"]["busy"]["timing"]["wall_ms"]
+
+    def test_timed_out_and_failed_guardrails_report_timing(self):
+        class FailingGuardrail(LocalGuardrail):
+            async def analyze(self, content, conversation=None):
+                raise ValueError("boom")
+
+        pipeline = create_pipeline_from_config(base_config())
+        pipeline.input_pipeline = [
+            timed_guardrail("slow", 5.0, timeout_ms=50, on_error="allow"),
+            FailingGuardrail("failing", 0),
+        ]
+
+        result = pipeline.check_input("hello")
+
+        assert result["details"]["slow"]["timing"]["wall_ms"] >= 50
+        assert "timing" in result["details"]["failing"]
+
+    def test_cached_results_report_cache_hit(self):
+        pipeline = create_pipeline_from_config(base_config(cache=True))
+        pipeline.input_pipeline = [LocalGuardrail("local", 0)]
+
+        pipeline.check_input("hello")
+        result = pipeline.check_input("hello")
+
+        assert result["details"]["local"]["timing"] == {
+            "wall_ms": 0.0,
+            "cpu_ms": 0.0,
+            "cached": True,
+        }
+
+    def test_skipped_guardrails_have_no_timing(self):
+        pipeline = create_pipeline_from_config(base_config(stop_on_first_block=True))
+        pipeline.input_pipeline = [
+            LocalGuardrail("blocker", 0, blocked=True),
+            LocalGuardrail("after", 0),
+        ]
+
+        result = pipeline.check_input("hello")
+
+        assert "timing" in result["details"]["blocker"]
+        assert "timing" not in result["details"]["after"]
+
+
+class ScoringGuardrail(LocalGuardrail):
+    """Local guardrail scoring content by lookup; blocks at 0.7 and above."""
+
+    def __init__(self, name: str, scores: dict):
+        super().__init__(name, 0)
+        self.scores = scores
+
+    async def analyze(self, content, conversation=None):
+        self.calls += 1
+        score = self.scores.get(content, 0.0)
+        return GuardrailResult(
+            blocked=score >= 0.7,
+            confidence=score,
+            reason=f"{self.name} scored {score}",
+            details={},
+            guardrail_name=self.name,
+            guardrail_type=self.guardrail_type,
+        )
+
+
+def tiered_pipeline(shadow_rate=0.0, ai_blocks=True, **settings):
+    """Pipeline whose AI guardrail escalates from a local scoring guardrail."""
+    from src.stinger.core.escalation import EscalationPolicy
+
+    pipeline = create_pipeline_from_config(base_config(**settings))
+    local = ScoringGuardrail("local_toxicity", {"unsure": 0.5, "toxic": 0.9})
+    ai = SlowAIGuardrail("ai_toxicity", 0, blocked=ai_blocks)
+    ai.escalation = EscalationPolicy("local_toxicity", 0.3, 0.7, shadow_rate)
+    # AI guardrail first: scheduling must still run the local guardrail before it
+    pipeline.input_pipeline = [ai, local]
+    return pipeline, local, ai
+
+
+@pytest.mark.ci
+class TestTieredEscalation:
+    """AI guardrails consulted only when a local guardrail is unsure."""
+
+    @pytest.mark.parametrize("execution", ["sequential", "parallel"])
+    def test_benign_content_not_escalated(self, execution):
+        pipeline, local, ai = tiered_pipeline(execution=execution)
+
+        result = pipeline.check_input("hello")
+
+        assert local.calls == 1
+        assert ai.calls == 0
+        assert result["blocked"] is False
+        assert result["details"]["ai_toxicity"]["skipped"] is True
+        assert result["details"]["ai_toxicity"]["reason"] == (
+            "Not escalated: local_toxicity score 0.00 is below gray zone [0.3, 0.7)"
+        )
+
+    def test_gray_zone_escalates(self):
+        pipeline, local, ai = tiered_pipeline()
+
+        result = pipeline.check_input("unsure")
+
+        assert ai.calls == 1
+        assert result["blocked"] is True
+        assert result["reasons"] == ["ai_toxicity: ai_toxicity blocked"]
+
+    def test_local_decides_above_gray_zone(self):
+        pipeline, local, ai = tiered_pipeline()
+
+        result = pipeline.check_input("toxic")
+
+        assert ai.calls == 0
+        assert result["blocked"] is True
+        assert "above gray zone" in result["details"]["ai_toxicity"]["reason"]
+
+    def test_failed_local_guardrail_escalates(self):
+        pipeline, local, ai = tiered_pipeline()
+
+        async def broken(content, conversation=None):
+            raise RuntimeError("boom")
+
+        local.analyze = broken
+        pipeline.check_input("hello")
+
+        assert ai.calls == 1
+
+    def test_stats_report_skipped_calls(self):
+        pipeline, local, ai = tiered_pipeline()
+
+        for text in ["hello", "hi", "unsure", "toxic"]:
+            pipeline.check_input(text)
+
+        stats = pipeline.get_escalation_stats()["input"]["ai_toxicity"]
+        assert (stats["evaluated"], stats["escalated"], stats["skipped"]) == (4, 1, 3)
+        assert stats["skip_rate"] == 0.75
+        assert stats["shadow_checks"] == 0
+
+    def test_shadow_checks_measure_divergence(self):
+        pipeline, local, ai = tiered_pipeline(shadow_rate=1.0)
+
+        results = [pipeline.check_input(text) for text in ["hello", "hi", "toxic"]]
+        get_background_loop().run(pipeline.wait_for_shadow_checks())
+
+        # Shadow results never change the decision
+        assert [r["blocked"] for r in results] == [False, False, True]
+        assert ai.calls == 3
+        stats = pipeline.get_escalation_stats()["input"]["ai_toxicity"]
+        assert (stats["shadow_checks"], stats["divergences"]) == (3, 2)
+        assert stats["divergence_rate"] == pytest.approx(2 / 3)
+
+    def test_shadow_checks_do_not_delay_the_check(self):
+        pipeline, local, ai = tiered_pipeline(shadow_rate=1.0)
+        ai.delay = 0.5
+
+        start = time.perf_counter()
+        result = pipeline.check_input("hello")
+        elapsed = time.perf_counter() - start
+
+        assert result["blocked"] is False
+        assert elapsed < 0.4
+        get_background_loop().run(pipeline.wait_for_shadow_checks())
+        stats = pipeline.get_escalation_stats()["input"]["ai_toxicity"]
+        assert stats["shadow_checks"] == 1
+
+    def test_stats_count_suspended_sync_check_once(self):
+        from src.stinger.core.escalation import EscalationPolicy
+
+        pipeline = create_pipeline_from_config(base_config())
+        local = ScoringGuardrail("local_toxicity", {"unsure": 0.5})
+        # Local but suspending: the sync fast path gives up and runs the check again
+        sleepy = SlowGuardrail("sleepy", 0.01)
+        sleepy.escalation = EscalationPolicy("local_toxicity", 0.3, 0.7, 0.0)
+        pipeline.input_pipeline = [local, sleepy]
+
+        pipeline.check_input("unsure")
+
+        assert pipeline._sync_fast_path["input"] is False
+        stats = pipeline.get_escalation_stats()["input"]["sleepy"]
+        assert (stats["evaluated"], stats["escalated"]) == (1, 1)
+
+    def test_batch_escalates_per_item(self):
+        pipeline, local, ai = tiered_pipeline()
+
+        results = pipeline.check_input_batch(["hello", "unsure", "hi"])
+
+        assert ai.calls == 1
+        assert [r["blocked"] for r in results] == [False, True, False]
+
+    def test_cached_result_keeps_escalation_reason(self):
+        pipeline, local, ai = tiered_pipeline(cache=True)
+
+        first = pipeline.check_input("hello")
+        second = pipeline.check_input("hello")
+
+        assert local.calls == 1
+        assert second["details"]["ai_toxicity"] == first["details"]["ai_toxicity"]
+
+    def test_escalation_from_config(self):
+        config = base_config()
+        config["pipeline"]["input"] = [
+            {
+                "name": "toxicity",
+                "type": "simple_toxicity_detection",
+                "enabled": True,
+                "on_error": "allow",
+            },
+            {
+                "name": "banned",
+                "type": "keyword_block",
+                "enabled": True,
+                "on_error": "block",
+                "keyword": "forbidden",
+                "escalation": {"from": "toxicity", "gray_zone": [0.2, 0.9], "shadow_rate": 0.1},
+            },
+        ]
+        pipeline = create_pipeline_from_config(config)
+        policy = pipeline.input_pipeline[1].escalation
+
+        assert (policy.source, policy.low, policy.high, policy.shadow_rate) == (
+            "toxicity",
+            0.2,
+            0.9,
+            0.1,
+        )
+        assert pipeline.check_input("forbidden words")["blocked"] is False
+
+    @staticmethod
+    def escalating_config(escalation: dict) -> dict:
+        config = base_config()
+        config["pipeline"]["input"].append(
+            {
+                "name": "banned",
+                "type": "keyword_block",
+                "enabled": True,
+                "on_error": "block",
+                "keyword": "forbidden",
+                "escalation": escalation,
+            }
+        )
+        return config
+
+    @pytest.mark.parametrize("escalation", [{"from": "missing"}, {"gray_zone": [0, 1]}])
+    def test_invalid_escalation_rejected(self, escalation):
+        with pytest.raises(RuntimeError):
+            create_pipeline_from_config(self.escalating_config(escalation))
+
+    def test_guardrail_with_invalid_gray_zone_not_built(self):
+        config = self.escalating_config({"from": "length_check", "gray_zone": [0.8, 0.2]})
+        pipeline = create_pipeline_from_config(config)
+
+        assert [g.name for g in pipeline.input_pipeline] == ["length_check"]
+
+
+class ThreadRecordingGuardrail(LocalGuardrail):
+    """CPU-bound local guardrail that records the thread it runs on."""
+
+    cpu_bound = True
+
+    def __init__(self, name: str, busy: float = 0.0):
+        super().__init__(name, 0)
+        self.busy = busy
+        self.threads = []
+
+    async def analyze(self, content, conversation=None):
+        self.threads.append(threading.current_thread())
+        end = time.thread_time() + self.busy
+        while time.thread_time() < end:
+            pass
+        return await super().analyze(content, conversation)
+
+
+def offload_config(**offload) -> dict:
+    """Config with a keyword guardrail and the given offload setting."""
+    config = base_config(offload=offload or True)
+    config["pipeline"]["input"] = [
+        {
+            "name": "secrets",
+            "type": "keyword_list",
+            "enabled": True,
+            "on_error": "block",
+            "keywords": ["top secret"],
+        }
+    ]
+    return config
+
+
+@pytest.mark.ci
+class TestOffload:
+    """CPU-heavy guardrails moved off the event loop thread."""
+
+    def test_offload_disabled_by_default(self):
+        pipeline = create_pipeline_from_config(base_config())
+        assert pipeline.offloader is None
+
+    def test_offload_settings(self):
+        pipeline = create_pipeline_from_config(
+            offload_config(backend="process", max_workers=2, min_length=10)
+        )
+        offloader = pipeline.offloader
+
+        assert (offloader.backend, offloader.max_workers, offloader.min_length) == (
+            "process",
+            2,
+            10,
+        )
+
+    def test_invalid_backend_rejected(self):
+        with pytest.raises(RuntimeError):
+            create_pipeline_from_config(base_config(offload="fork"))
+
+    @pytest.mark.asyncio
+    async def test_long_content_runs_on_thread_pool(self):
+        pipeline = create_pipeline_from_config(offload_config(min_length=100))
+        guardrail = ThreadRecordingGuardrail("heavy")
+        pipeline.input_pipeline = [guardrail]
+
+        await pipeline.check_input_async("short")
+        result = await pipeline.check_input_async("long text " * 20)
+
+        assert guardrail.threads[0] is threading.current_thread()
+        assert guardrail.threads[1].name.startswith("StingerOffload")
+        assert result["details"]["heavy"]["blocked"] is False
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        pipeline = create_pipeline_from_config(offload_config(min_length=100))
+        pipeline.input_pipeline = [ThreadRecordingGuardrail("heavy", busy=0.3)]
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            for _ in range(20):
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        await asyncio.gather(pipeline.check_input_async("long text " * 20), ticker())
+
+        assert max(gaps) < 0.15, f"event loop stalled for {max(gaps):.2f}s"
+
+    def test_sync_checks_run_inline(self):
+        pipeline = create_pipeline_from_config(offload_config(min_length=0))
+        guardrail = ThreadRecordingGuardrail("heavy")
+        pipeline.input_pipeline = [guardrail]
+
+        pipeline.check_input("long text " * 20)
+
+        assert guardrail.threads == [threading.current_thread()]
+
+    @pytest.mark.asyncio
+    async def test_process_workers_build_guardrails_from_config(self):
+        pipeline = create_pipeline_from_config(
+            offload_config(backend="process", max_workers=1, min_length=100)
+        )
+        try:
+            text = "filler text " * 20 + "top secret"
+            result = await pipeline.check_input_async(text)
+            assert result["blocked"] is True
+            assert result["details"]["secrets"]["timing"]["cpu_ms"] > 0
+
+            # Runtime changes reach the worker copies of the guardrail
+            pipeline.update_guardrail_config("secrets", {"keywords": ["classified"]})
+            assert (await pipeline.check_input_async(text))["blocked"] is False
+        finally:
+            pipeline.disable_offload()
+
+    def test_enable_and_disable_offload(self):
+        pipeline = create_pipeline_from_config(base_config())
+
+        pipeline.enable_offload("thread", max_workers=2, min_length=50)
+        assert pipeline.offloader.max_workers == 2
+
+        pipeline.disable_offload()
+        assert pipeline.offloader is None
+
+
+class ContentRecordingGuardrail(LocalGuardrail):
+    """Local guardrail that records the content object it is given."""
+
+    def __init__(self, name: str):
+        super().__init__(name, 0)
+        self.contents = []
+
+    async def analyze(self, content, conversation=None):
+        self.contents.append(content)
+        return await super().analyze(content, conversation)
+
+
+@pytest.mark.ci
+class TestNormalization:
+    """Normalized views of the content are computed once per request and shared."""
+
+    @pytest.mark.parametrize("execution", ["sequential", "parallel"])
+    def test_guardrails_share_normalized_content(self, execution):
+        pipeline = create_pipeline_from_config(base_config(execution=execution))
+        first, second = ContentRecordingGuardrail("first"), ContentRecordingGuardrail("second")
+        pipeline.input_pipeline = [first, second]
+
+        pipeline.check_input("Hello  WORLD")
+
+        assert first.contents[0] is second.contents[0]
+        assert first.contents[0] == "Hello  WORLD"
+        assert first.contents[0].canonical == "hello world"
+
+    def test_batch_items_are_normalized(self):
+        pipeline = create_pipeline_from_config(base_config())
+        guardrail = ContentRecordingGuardrail("recorder")
+        pipeline.input_pipeline = [guardrail]
+
+        pipeline.check_input_batch(["one", "two"])
+
+        assert [type(content) for content in guardrail.contents] == [NormalizedContent] * 2
+
+    def test_evasions_are_caught_consistently(self):
+        pipeline = create_pipeline_from_config(offload_config())
+        pipeline.disable_offload()
+
+        # Plain, Cyrillic look-alikes, a zero-width space, fullwidth letters
+        for text in [
+            "TOP SECRET",
+            "t\u043ep \u0455ecret",
+            "top sec\u200bret",
+            "\uff54\uff4f\uff50  \uff53\uff45\uff43\uff52\uff45\uff54",
+        ]:
+            assert pipeline.check_input(text)["blocked"] is True, text
+        assert pipeline.check_input("top of the secretary's list")["blocked"] is False
+
+    def test_normalized_views(self):
+        # Fullwidth F, Cyrillic i and a zero-width space
+        content = normalized("\uff26ree  \u0456Phone\u200b!")
+
+        assert normalized(content) is content
+        assert content.lowered == "\uff46ree  \u0456phone\u200b!"
+        assert content.folded == "free  \u0456phone\u200b!"
+        assert content.collapsed == "free \u0456phone\u200b!"
+        assert content.canonical == "free iphone!"
+        assert canonicalize("Free\tIPHONE") == "free iphone"
+
+
+class FakeModelProvider:
+    """Model provider answering with a callable and recording the prompts it gets."""
+
+    max_tokens = 500
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.prompts = []
+
+    async def generate_response(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.respond(prompt)
+
+    def get_model_name(self):
+        return "fake-model"
+
+
+def ai_guardrails(provider):
+    """AI PII, toxicity and code generation guardrails answered by a provider."""
+    from src.stinger.guardrails.ai_code_generation_guardrail import AICodeGenerationGuardrail
+    from src.stinger.guardrails.ai_pii_detection_guardrail import AIPIIDetectionGuardrail
+    from src.stinger.guardrails.ai_toxicity_detection_guardrail import (
+        AIToxicityDetectionGuardrail,
+    )
+
+    guardrails = [
+        AIPIIDetectionGuardrail("ai_pii", {}),
+        AIToxicityDetectionGuardrail("ai_toxicity", {}),
+        AICodeGenerationGuardrail("ai_code", {}),
+    ]
+    for guardrail in guardrails:
+        guardrail.model_provider = provider
+    return guardrails
+
+
+FUSED_RESPONSE = {
+    "pii_detection": {"detected": True, "pii_types": ["ssn"], "confidence": 0.95},
+    "toxicity_detection": {"detected": False, "toxicity_types": [], "confidence": 0.1},
+    "code_generation": {"detected": False, "code_types": [], "confidence": 0.0},
+}
+
+
+@pytest.mark.ci
+class TestAIFusion:
+    """One model call for all AI guardrails of a check."""
+
+    def test_fusion_off_by_default(self):
+        pipeline = create_pipeline_from_config(base_config())
+        assert pipeline.ai_fusion == {"input": False, "output": False}
+
+    @pytest.mark.asyncio
+    async def test_fused_call_matches_separate_calls(self, mock_openai_key):
+        content = "My SSN is 123-45-6789"
+
+        def respond(prompt):
+            if "several independent checks" in prompt:
+                return json.dumps(FUSED_RESPONSE)
+            # Answer a guardrail's own prompt by the categories field it asks for
+            for response in FUSED_RESPONSE.values():
+                field = next(key for key in response if key.endswith("_types"))
+                if f'"{field}"' in prompt:
+                    return json.dumps(response)
+            raise AssertionError("unexpected prompt")
+
+        fused_provider = FakeModelProvider(respond)
+        fused = create_pipeline_from_config(base_config(ai_fusion=True))
+        fused.input_pipeline = ai_guardrails(fused_provider)
+        separate_provider = FakeModelProvider(respond)
+        separate = create_pipeline_from_config(base_config())
+        separate.input_pipeline = ai_guardrails(separate_provider)
+
+        fused_result = await fused.check_input_async(content)
+        separate_result = await separate.check_input_async(content)
+
+        assert len(fused_provider.prompts) == 1
+        assert fused_provider.prompts[0].count(content) == 1
+        assert len(separate_provider.prompts) == 3
+        assert fused_result["blocked"] is True
+        assert without_timing(fused_result) == without_timing(separate_result)
+
+    @pytest.mark.asyncio
+    async def test_missing_part_falls_back_to_own_call(self, mock_openai_key):
+        from src.stinger.guardrails.ai_toxicity_detection_guardrail import (
+            AIToxicityDetectionGuardrail,
+        )
+
+        partial = {k: v for k, v in FUSED_RESPONSE.items() if k != "toxicity_detection"}
+
+        def respond(prompt):
+            if "several independent checks" in prompt:
+                return json.dumps(partial)
+            return json.dumps(FUSED_RESPONSE["toxicity_detection"])
+
+        provider = FakeModelProvider(respond)
+        pipeline = create_pipeline_from_config(base_config(ai_fusion=True, execution="parallel"))
+        pipeline.input_pipeline = ai_guardrails(provider)
+
+        result = await pipeline.check_input_async("hello")
+
+        assert len(provider.prompts) == 2
+        assert provider.prompts[1] == AIToxicityDetectionGuardrail.TOXICITY_PROMPT.format(
+            content="hello"
+        )
+        assert result["details"]["ai_toxicity"]["blocked"] is False
+        assert result["details"]["ai_pii"]["blocked"] is True
+
+    @pytest.mark.asyncio
+    async def test_unparseable_response_falls_back_for_all(self, mock_openai_key):
+        def respond(prompt):
+            if "several independent checks" in prompt:
+                return "not json"
+            return json.dumps(FUSED_RESPONSE["code_generation"])
+
+        provider = FakeModelProvider(respond)
+        pipeline = create_pipeline_from_config(base_config(ai_fusion=True))
+        pipeline.input_pipeline = ai_guardrails(provider)
+
+        result = await pipeline.check_input_async("hello")
+
+        assert len(provider.prompts) == 4
+        assert result["blocked"] is False
+        assert all("error" not in detail for detail in result["details"].values())
+
+    @pytest.mark.asyncio
+    async def test_second_guardrail_of_a_type_makes_own_call(self, mock_openai_key):
+        from src.stinger.guardrails.ai_toxicity_detection_guardrail import (
+            AIToxicityDetectionGuardrail,
+        )
+
+        strict_prompt = 'Strict review, answer with "toxicity_types": {content}'
+        strict_response = {"detected": True, "toxicity_types": ["insult"], "confidence": 0.9}
+
+        def respond(prompt):
+            if "several independent checks" in prompt:
+                return json.dumps(FUSED_RESPONSE)
+            assert prompt == strict_prompt.format(content="hello")
+            return json.dumps(strict_response)
+
+        provider = FakeModelProvider(respond)
+        strict = AIToxicityDetectionGuardrail("strict_toxicity", {})
+        strict.model_provider = provider
+        strict.get_analysis_prompt = lambda: strict_prompt
+        pipeline = create_pipeline_from_config(base_config(ai_fusion=True))
+        pipeline.input_pipeline = ai_guardrails(provider) + [strict]
+
+        result = await pipeline.check_input_async("hello")
+
+        assert len(provider.prompts) == 2
+        assert result["details"]["ai_toxicity"]["blocked"] is False
+        assert result["details"]["strict_toxicity"]["blocked"] is True
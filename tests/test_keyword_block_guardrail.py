@@ -278,3 +278,19 @@ class TestKeywordBlockFilter:
 if __name__ == "__main__":
     # Run tests if executed directly
     pytest.main([__file__, "-v"])
+
+
+@pytest.mark.ci
+@pytest.mark.asyncio
+async def test_word_boundary_matching():
+    """Test that word_boundary only blocks the keyword as a whole word."""
+    guardrail_instance = KeywordBlockGuardrail({"keyword": "Secret", "word_boundary": True})
+
+    result = await guardrail_instance.analyze("The SECRET is out")
+    assert result.blocked == True
+    result = await guardrail_instance.analyze("Ask the secretary")
+    assert result.blocked == False
+
+    assert guardrail_instance.update_config({"word_boundary": False})
+    result = await guardrail_instance.analyze("Ask the secretary")
+    assert result.blocked == True
@@ -6,9 +6,15 @@ Tests all functionality including inline keywords, file loading, and error handl
 
 import os
 import tempfile
+import time
 
 import pytest
 
+from src.stinger.core.keyword_file import (
+    CompiledKeywordMatcher,
+    compile_keyword_file,
+    compiled_path,
+)
 from src.stinger.guardrails.keyword_list import KeywordListGuardrail
 
 
@@ -105,3 +111,174 @@ async def test_multiple_matches():
     assert result.blocked == True
     assert "idiot" in result.reason
     assert "stupid" in result.reason
+
+
+@pytest.mark.ci
+@pytest.mark.asyncio
+async def test_large_keyword_list_matches_in_list_order():
+    keywords = [f"term{i:05d}x" for i in range(5000)] + ["idiot", "stupid"]
+    config = {
+        "name": "test_filter",
+        "type": "keyword_list",
+        "enabled": True,
+        "keywords": keywords,
+        "on_error": "block",
+    }
+    guardrail_obj = KeywordListGuardrail(config)
+    result = await guardrail_obj.analyze("STUPID idiot, see TERM04999X and term00007x")
+    assert result.blocked == True
+    assert result.details["matched_keywords"] == ["term00007x", "term04999x", "idiot", "stupid"]
+    result = await guardrail_obj.analyze("term0500 is not a full keyword")
+    assert result.blocked == False
+
+
+@pytest.mark.ci
+@pytest.mark.asyncio
+async def test_word_boundary_matching():
+    config = {
+        "name": "test_filter",
+        "type": "keyword_list",
+        "enabled": True,
+        "keywords": ["ass", "c++"],
+        "word_boundary": True,
+        "on_error": "block",
+    }
+    guardrail_obj = KeywordListGuardrail(config)
+    result = await guardrail_obj.analyze("Please assess the class assignment")
+    assert result.blocked == False
+    result = await guardrail_obj.analyze("What an ass! I write C++.")
+    assert result.blocked == True
+    assert result.details["matched_keywords"] == ["ass", "c++"]
+
+    assert guardrail_obj.update_config({"word_boundary": False})
+    result = await guardrail_obj.analyze("Please assess the class assignment")
+    assert result.blocked == True
+
+
+@pytest.mark.ci
+def test_identical_keyword_lists_share_matcher():
+    config = {
+        "name": "test_filter",
+        "type": "keyword_list",
+        "enabled": True,
+        "keywords": ["idiot", "stupid"],
+        "on_error": "block",
+    }
+    first = KeywordListGuardrail(config)
+    second = KeywordListGuardrail({**config, "name": "other_filter"})
+    assert first.matcher is second.matcher
+    other = KeywordListGuardrail({**config, "keywords": ["idiot"]})
+    assert other.matcher is not first.matcher
+
+
+@pytest.mark.ci
+@pytest.mark.asyncio
+async def test_compiled_keyword_file(tmp_path):
+    keywords_file = tmp_path / "blocked.txt"
+    keywords_file.write_text("# blocked\nIdiot\nshut up\nterm0001\n")
+    compile_keyword_file(keywords_file)
+    config = {
+        "name": "test_filter",
+        "type": "keyword_list",
+        "keywords_file": "blocked.txt",
+        "keywords": ["useless", "idiot"],
+        "word_boundary": True,
+        "_config_dir": str(tmp_path),
+    }
+    guardrail_obj = KeywordListGuardrail(config)
+    assert isinstance(guardrail_obj.matcher, CompiledKeywordMatcher)
+    assert list(guardrail_obj.keywords) == ["idiot", "shut up", "term0001", "useless"]
+
+    result = await guardrail_obj.analyze("USELESS idiot, SHUT  UP")
+    assert result.blocked == True
+    assert result.details["matched_keywords"] == ["idiot", "shut up", "useless"]
+    assert result.details["total_keywords"] == 4
+    assert (await guardrail_obj.analyze("see term00012")).blocked == False
+    assert guardrail_obj.get_config()["keywords"] == list(guardrail_obj.keywords)
+
+    assert guardrail_obj.update_config({"word_boundary": False})
+    assert (await guardrail_obj.analyze("see term00012")).blocked == True
+
+
+@pytest.mark.ci
+@pytest.mark.asyncio
+async def test_stale_compiled_keyword_file_is_not_used(tmp_path):
+    keywords_file = tmp_path / "blocked.txt"
+    keywords_file.write_text("first\n")
+    compiled = compile_keyword_file(keywords_file)
+    assert compiled == compiled_path(keywords_file)
+    compiled_bytes = compiled.read_bytes()
+
+    # Edited after compiling: the text file is read and the stale file left alone
+    keywords_file.write_text("second\n")
+    config = {
+        "name": "test_filter",
+        "type": "keyword_list",
+        "keywords_file": str(keywords_file),
+        "reload_interval": 0.01,
+    }
+    guardrail_obj = KeywordListGuardrail(config)
+    assert not isinstance(guardrail_obj.matcher, CompiledKeywordMatcher)
+    assert (await guardrail_obj.analyze("the second one")).blocked == True
+    assert (await guardrail_obj.analyze("the first one")).blocked == False
+    assert compiled.read_bytes() == compiled_bytes
+
+    # Compiled again and edited back while running: reloaded from the compiled file
+    keywords_file.write_text("first\n")
+    stat = keywords_file.stat()
+    os.utime(keywords_file, (stat.st_atime, stat.st_mtime + 5))
+    time.sleep(0.02)
+    assert (await guardrail_obj.analyze("the first one")).blocked == True
+    assert (await guardrail_obj.analyze("the second one")).blocked == False
+    assert isinstance(guardrail_obj.matcher, CompiledKeywordMatcher)
+
+
+@pytest.mark.ci
+@pytest.mark.asyncio
+async def test_corrupt_compiled_keyword_file_falls_back_to_text(tmp_path):
+    keywords_file = tmp_path / "kw.txt"
+    keywords_file.write_text("badword\nevil\n")
+    compiled_path(keywords_file).write_bytes(b"not a compiled keyword file")
+
+    guardrail_obj = KeywordListGuardrail(
+        {"name": "test_filter", "keywords_file": str(keywords_file), "keywords": ["inline"]}
+    )
+    assert not isinstance(guardrail_obj.matcher, CompiledKeywordMatcher)
+    assert guardrail_obj.keywords == ["badword", "evil", "inline"]
+    assert (await guardrail_obj.analyze("this is evil")).blocked == True
+
+
+@pytest.mark.ci
+def test_compiled_keyword_file_for_other_case_sensitivity_is_not_used(tmp_path):
+    keywords_file = tmp_path / "blocked.txt"
+    keywords_file.write_text("Idiot\n")
+    compile_keyword_file(keywords_file)
+    guardrail_obj = KeywordListGuardrail(
+        {"name": "test_filter", "keywords_file": str(keywords_file), "case_sensitive": True}
+    )
+    assert not isinstance(guardrail_obj.matcher, CompiledKeywordMatcher)
+    assert guardrail_obj.keywords == ["Idiot"]
+
+
+@pytest.mark.ci
+@pytest.mark.parametrize("word_boundary", [False, True])
+def test_compiled_matcher_matches_like_keyword_matcher(tmp_path, word_boundary):
+    from src.stinger.core.keyword_file import CompiledKeywords, compile_keywords
+    from src.stinger.core.keyword_matcher import KeywordMatcher
+
+    keywords = ["ass", "c++", "café", "he", "she", "hers", "ünïcode", "a b", "_x"]
+    keywords += [f"term{i:04d}" for i in range(100)]
+    compile_keywords(keywords, tmp_path / "list.kwc")
+    compiled = CompiledKeywordMatcher(
+        CompiledKeywords(tmp_path / "list.kwc"), word_boundary=word_boundary
+    )
+    expected = KeywordMatcher(keywords, word_boundary=word_boundary)
+    texts = [
+        "ushers assess C++, CAFÉ and Ünïcode",
+        "a  b_x term0042 term00421 éhe",
+        "sh\u200be said: hers!",
+        "",
+    ]
+    for text in texts:
+        assert compiled.find_all(text) == expected.find_all(text)
+        assert compiled.search(text) == expected.search(text)
@@ -455,6 +455,29 @@ class TestRegexFilter:
             assert result.blocked == True
             assert "Matched patterns:" in result.reason
 
+    @pytest.mark.ci
+    @pytest.mark.asyncio
+    async def test_large_pattern_set_reports_every_match(self):
+        """Test that a large pattern set reports the same matches as separate searches."""
+        patterns = [rf"token{i:03d}\b" for i in range(80)] + [
+            r"\d{3}-\d{2}-\d{4}",
+            r"(a)\1",
+            r"(?P<word>secret)",
+            r"(?P<word>key)",
+        ]
+        config = {"patterns": patterns, "action": "block", "on_error": "allow"}
+        guardrail_instance = RegexGuardrail(config)
+
+        content = "token079 then token003, SSN 123-45-6789, aa secret key"
+        result = await guardrail_instance.analyze(content)
+        expected = [p for p in patterns if re.search(p, content, re.IGNORECASE)]
+        assert result.blocked == True
+        assert result.details["matched_patterns"] == expected
+
+        result = await guardrail_instance.analyze("nothing to see here, token1000")
+        assert result.blocked == False
+        assert result.details["matched_patterns"] == []
+
 
 if __name__ == "__main__":
     # Run tests if executed directly
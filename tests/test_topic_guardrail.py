@@ -395,6 +395,23 @@ class TestTopicFilterEdgeCases:
         result = await guardrail_obj.analyze("This contains valid_pattern")
         assert result.blocked == True
 
+    @pytest.mark.asyncio
+    async def test_invalid_regex_pattern_reports_matching_topic(self):
+        """Skipping an invalid pattern does not shift which topic is reported."""
+        config = {
+            "name": "invalid_regex_report_test",
+            "mode": "both",
+            "use_regex": True,
+            "allow_topics": [r"\bscience\b"],
+            "deny_topics": ["[invalid", r"valid_\w+"],
+        }
+
+        guardrail_obj = TopicGuardrail(config)
+
+        result = await guardrail_obj.analyze("science and valid_pattern")
+        assert result.details["allow_matches"] == [r"\bscience\b"]
+        assert result.details["deny_matches"] == [r"valid_\w+"]
+
     @pytest.mark.ci
     @pytest.mark.asyncio
     async def test_empty_topic_lists(self):
@@ -492,6 +509,35 @@ class TestTopicFilterPerformance:
         # Should complete quickly
         assert end_time - start_time < 1.0  # Less than 1 second
 
+    @pytest.mark.asyncio
+    async def test_large_topic_lists(self):
+        """Thousands of topics on both lists are matched in one scan."""
+        config = {
+            "name": "large_lists_test",
+            "mode": "both",
+            "allow_topics": [f"course {i:04d}" for i in range(5000)],
+            "deny_topics": [f"dosage {i}mg" for i in range(5000)],
+        }
+
+        guardrail_obj = TopicGuardrail(config)
+        content = "Lecture notes for Course 4999, week three. " * 250
+
+        import time
+
+        start_time = time.perf_counter()
+        result = await guardrail_obj.analyze(content)
+        duration = time.perf_counter() - start_time
+
+        assert result.blocked is False
+        assert result.details["allow_matches"] == ["course 4999"]
+
+        result = await guardrail_obj.analyze(content + "Take dosage 250mg daily.")
+        assert result.blocked is True
+        assert result.details["deny_matches"] == ["dosage 250mg"]
+
+        # About 10 KB of content against 10,000 topics
+        assert duration < 0.5, f"Topic matching took too long: {duration}s"
+
     @pytest.mark.performance
     @pytest.mark.asyncio
     async def test_complex_regex_performance(self):
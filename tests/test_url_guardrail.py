@@ -11,6 +11,8 @@ Tests cover:
 """
 
 import asyncio
+import os
+import time
 
 import pytest
 
@@ -347,6 +349,101 @@ class TestURLFilter:
         result = await guardrail_instance.analyze(content)
         assert result.blocked is True
 
+    @pytest.mark.ci
+    @pytest.mark.asyncio
+    async def test_suffix_matching_respects_labels(self):
+        """Entries match their subdomains, not domains that merely end with the same text."""
+        config = {"blocked_domains": ["Evil.com", "*.bad.org"], "on_error": "allow"}
+        guardrail_instance = URLGuardrail(config)
+
+        assert (await guardrail_instance.analyze("https://a.b.evil.com")).blocked is True
+        assert (await guardrail_instance.analyze("https://bad.org/x")).blocked is True
+        assert (await guardrail_instance.analyze("https://notevil.com")).blocked is False
+        assert (await guardrail_instance.analyze("https://evil.com.example.net")).blocked is False
+
+    @pytest.mark.ci
+    @pytest.mark.asyncio
+    async def test_domains_file_loading(self, tmp_path):
+        """Domains are loaded from files relative to the config directory."""
+        (tmp_path / "blocklist.txt").write_text(
+            "# threat intel feed\n\nphish.example\n0.0.0.0 malware.test\n"
+        )
+        config = {
+            "blocked_domains": ["evil.com"],
+            "blocked_domains_file": "blocklist.txt",
+            "_config_dir": str(tmp_path),
+            "on_error": "allow",
+        }
+        guardrail_instance = URLGuardrail(config)
+
+        assert len(guardrail_instance.blocked_index) == 3
+        for url in ["https://phish.example", "http://cdn.malware.test/x", "https://evil.com"]:
+            assert (await guardrail_instance.analyze(f"Visit {url}")).blocked is True
+        assert (await guardrail_instance.analyze("Visit https://example.com")).blocked is False
+
+    @pytest.mark.ci
+    @pytest.mark.asyncio
+    async def test_missing_domains_file_uses_inline_domains(self, tmp_path):
+        """A missing file leaves the inline domains in effect."""
+        config = {
+            "blocked_domains": ["evil.com"],
+            "blocked_domains_file": "missing.txt",
+            "_config_dir": str(tmp_path),
+            "on_error": "allow",
+        }
+        guardrail_instance = URLGuardrail(config)
+
+        assert (await guardrail_instance.analyze("https://evil.com")).blocked is True
+        assert (await guardrail_instance.analyze("https://example.com")).blocked is False
+
+    @pytest.mark.ci
+    @pytest.mark.asyncio
+    async def test_domains_file_hot_reload(self, tmp_path):
+        """Changed domain files are picked up without rebuilding the guardrail."""
+        blocklist = tmp_path / "blocklist.txt"
+        blocklist.write_text("first.example\n")
+        config = {
+            "blocked_domains_file": str(blocklist),
+            "reload_interval": 0.01,
+            "on_error": "allow",
+        }
+        guardrail_instance = URLGuardrail(config)
+        assert (await guardrail_instance.analyze("https://second.example")).blocked is False
+
+        blocklist.write_text("second.example\n")
+        stat = blocklist.stat()
+        os.utime(blocklist, (stat.st_atime, stat.st_mtime + 5))
+        time.sleep(0.02)
+
+        assert (await guardrail_instance.analyze("https://second.example")).blocked is True
+        assert (await guardrail_instance.analyze("https://first.example")).blocked is False
+
+        # An unreadable update keeps the loaded list
+        blocklist.write_bytes(b"\xff\xfe")
+        os.utime(blocklist, (stat.st_atime, stat.st_mtime + 10))
+        time.sleep(0.02)
+        assert (await guardrail_instance.analyze("https://second.example")).blocked is True
+
+    @pytest.mark.performance
+    @pytest.mark.asyncio
+    async def test_large_blocklist_lookup(self):
+        """Lookups stay fast with hundreds of thousands of blocked domains."""
+        config = {
+            "blocked_domains": [f"threat{i}.example" for i in range(200_000)],
+            "on_error": "allow",
+        }
+        guardrail_instance = URLGuardrail(config)
+        content = " ".join(f"https://cdn.site{i}.com/page" for i in range(100))
+        content += " https://a.b.threat199999.example/x"
+
+        start_time = time.perf_counter()
+        result = await guardrail_instance.analyze(content)
+        duration = time.perf_counter() - start_time
+
+        assert result.blocked is True
+        assert result.details["blocked_urls"] == ["https://a.b.threat199999.example/x"]
+        assert duration < 0.05, f"Lookup took too long: {duration}s"
+
     @pytest.mark.performance
     @pytest.mark.asyncio
     async def test_concurrent_filtering(self):
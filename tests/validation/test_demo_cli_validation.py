@@ -36,7 +36,7 @@ class TestCLIDemoBehavior:
             assert (
                 "credit card" in output.lower()
                 or "pii" in output.lower()
-                or "1234-5678-9012-3456" in output
+                or "4111-1111-1111-1111" in output
             ), "Demo should show credit card detection"
 
         except FileNotFoundError:
@@ -11,6 +11,11 @@ from unittest.mock import patch
 
 import pytest
 
+from src.stinger.core.regex_matcher import (
+    ProcessRegexMatcher,
+    ThreadRegexMatcher,
+    get_regex_search_stats,
+)
 from src.stinger.core.regex_security import (
     RegexSecurityConfig,
     RegexSecurityValidator,
@@ -151,6 +156,68 @@ class TestRegexSecurityValidator:
         except SecurityError as e:
             assert "timeout" in str(e).lower()
 
+    @pytest.mark.ci
+    def test_thread_backend_reuses_bounded_workers(self):
+        """Test that searches share a bounded pool and slow searches are tracked."""
+        matcher = ThreadRegexMatcher(max_workers=2)
+        pattern = re.compile(r"\d+")
+        try:
+            for _ in range(50):
+                assert matcher.search(pattern, "abc 123", 1000).group() == "123"
+            assert 1 <= len(matcher._executor._threads) <= 2
+        finally:
+            matcher.shutdown()
+
+        # re holds the GIL, so a slow search is caught as it finishes
+        validator = RegexSecurityValidator(RegexSecurityConfig(MAX_EXECUTION_TIME_MS=1))
+        before = get_regex_search_stats()
+        try:
+            assert validator.safe_search(re.compile(r"(a+)+b"), "a" * 18) is None
+        except SecurityError as e:
+            assert "timeout" in str(e).lower()
+        after = get_regex_search_stats()
+        assert (after["timeouts"] + after["deadline_misses"]) == (
+            before["timeouts"] + before["deadline_misses"] + 1
+        )
+
+    @pytest.mark.ci
+    def test_process_backend_kills_runaway_searches(self):
+        """Test that the process backend kills a worker that overruns its deadline."""
+        matcher = ProcessRegexMatcher(max_workers=1)
+        killed = get_regex_search_stats()["workers_killed"]
+        try:
+            with pytest.raises(TimeoutError):
+                matcher.search(re.compile(r"(a+)+b"), "a" * 40, 200)
+            assert get_regex_search_stats()["workers_killed"] == killed + 1
+
+            pattern = re.compile(r"(?<=x)\d+", re.IGNORECASE)
+            match = matcher.search(pattern, "X1 x22", 5000)
+            assert match.span() == pattern.search("X1 x22").span()
+            assert matcher.search(pattern, "no digits", 5000) is None
+        finally:
+            matcher.shutdown()
+
+    @pytest.mark.ci
+    def test_linear_time_backend(self):
+        """Test that patterns RE2 supports are searched without backtracking."""
+        pytest.importorskip("re2")
+        validator = RegexSecurityValidator(
+            RegexSecurityConfig(MAX_EXECUTION_TIME_MS=100, LINEAR_TIME=True)
+        )
+        before = get_regex_search_stats()["linear_time_searches"]
+
+        # Would take minutes with backtracking
+        assert validator.safe_search(re.compile(r"(a+)+b"), "a" * 40) is None
+
+        pattern = re.compile(r"pass(word)?\s*[:=]", re.IGNORECASE)
+        match = validator.safe_search(pattern, "my PASSWORD = x")
+        assert match.group(1) == "WORD"
+        assert get_regex_search_stats()["linear_time_searches"] == before + 2
+
+        # Backreferences and $ are left to re
+        assert validator.safe_search(re.compile(r"(a)\1$"), "xaa").span() == (1, 3)
+        assert get_regex_search_stats()["linear_time_searches"] == before + 2
+
     @pytest.mark.ci
     def test_convenience_functions(self):
         """Test the module-level convenience functions."""